@@ -0,0 +1,642 @@
+"""
+Manutenção dos agregados materializados (placar por grupo, estatísticas de
+carreira dos jogadores, contadores desnormalizados e versão do grupo).
+
+As views chamam estas funções dentro da mesma transação da escrita que
+alterou as participações, de modo que o placar nunca fica defasado.
+Cada atualização recalcula apenas as chaves (grupo, jogador) afetadas.
+As estatísticas de carreira recebem só o delta das participações que a
+escrita alterou (ver `player_stats_changed`).
+"""
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, Exists, ExpressionWrapper, F, Max, Min, OuterRef, Q,
+    Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least, TruncMonth
+from django.utils import timezone
+
+from .jobs import enqueue
+from .models import (
+    Game, GamePost, GameParticipation, Group, GroupLeaderboardEntry, GroupMembership,
+    PlayerMonthlyStats, PlayerStats,
+)
+
+ZERO = Value(Decimal("0.00"))
+
+BATCH_SIZE = 2000
+
+LEADERBOARD_FIELDS = [
+    "net_result",
+    "games_played",
+    "total_buy_in",
+    "total_rebuy",
+    "best_night",
+    "worst_night",
+    "updated_at",
+]
+
+
+def net_expression():
+    """Resultado líquido de uma participação: final_balance - buy_in - rebuy."""
+    return ExpressionWrapper(
+        F("final_balance") - F("game__buy_in") - Coalesce(F("rebuy"), ZERO),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def leaderboard_rows(participations):
+    """Agrupa um queryset de participações por (grupo, jogador)."""
+    net = net_expression()
+    return (
+        participations
+        .values("game__group_id", "player_id")
+        .annotate(
+            games_played=Count("id"),
+            total_buy_in=Sum("game__buy_in"),
+            total_rebuy=Sum(Coalesce(F("rebuy"), ZERO)),
+            net_result=Sum(net),
+            best_night=Max(net),
+            worst_night=Min(net),
+        )
+        .order_by()
+    )
+
+
+def _upsert_leaderboard(rows):
+    now = timezone.now()
+    entries = [
+        GroupLeaderboardEntry(
+            group_id=row["game__group_id"],
+            player_id=row["player_id"],
+            net_result=row["net_result"],
+            games_played=row["games_played"],
+            total_buy_in=row["total_buy_in"],
+            total_rebuy=row["total_rebuy"],
+            best_night=row["best_night"],
+            worst_night=row["worst_night"],
+            updated_at=now,
+        )
+        for row in rows
+    ]
+    if entries:
+        GroupLeaderboardEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=["group", "player"],
+            update_fields=LEADERBOARD_FIELDS,
+        )
+    return entries
+
+
+def refresh_leaderboard(group_id, player_ids):
+    """
+    Recalcula as linhas do placar de `group_id` para os jogadores informados.
+    Jogadores sem participações restantes no grupo têm a linha removida.
+    """
+    player_ids = {int(pid) for pid in player_ids if pid is not None}
+    if not group_id or not player_ids:
+        return
+
+    rows = leaderboard_rows(
+        GameParticipation.objects.filter(
+            game__group_id=group_id, player_id__in=player_ids
+        )
+    )
+    entries = _upsert_leaderboard(rows)
+
+    stale = player_ids - {entry.player_id for entry in entries}
+    if stale:
+        GroupLeaderboardEntry.objects.filter(
+            group_id=group_id, player_id__in=stale
+        ).delete()
+
+
+def rebuild_leaderboard(group_id=None):
+    """Reconstrói o placar inteiro (ou de um grupo) a partir das participações."""
+    participations = GameParticipation.objects.all()
+    entries = GroupLeaderboardEntry.objects.all()
+    if group_id is not None:
+        participations = participations.filter(game__group_id=group_id)
+        entries = entries.filter(group_id=group_id)
+
+    entries.delete()
+    return len(_upsert_leaderboard(leaderboard_rows(participations)))
+
+
+# Posição de uma partida na carreira do jogador (ordem cronológica).
+CAREER_ORDER = ("game__date", "game__created_at", "game_id")
+
+STAT_FIELDS = ("player_id", *CAREER_ORDER, "game__buy_in", "rebuy", "final_balance")
+
+SUM_FIELDS = ("games_played", "wins", "total_buy_in", "total_rebuy", "net_result")
+
+PLAYER_STATS_FIELDS = [
+    *SUM_FIELDS,
+    "best_night",
+    "worst_night",
+    "longest_win_streak",
+    "current_win_streak",
+    "first_game_on",
+    "last_game_on",
+    "updated_at",
+]
+
+
+def _net(buy_in, rebuy, final_balance):
+    return final_balance - buy_in - (rebuy if rebuy is not None else 0)
+
+
+def stat_rows(participations):
+    """
+    Linhas (STAT_FIELDS) das participações, para `participations_changed`.
+    Tire uma antes e outra depois da escrita, só das participações afetadas.
+    """
+    return list(participations.order_by().values_list(*STAT_FIELDS, named=True))
+
+
+def player_rows(participations):
+    """Participações ordenadas por jogador e, dentro dele, cronologicamente."""
+    return (
+        participations
+        .order_by("player_id", *CAREER_ORDER)
+        .values_list(*STAT_FIELDS)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+
+
+def fold_player_stats(rows):
+    """
+    Percorre as linhas de `player_rows` uma única vez e monta os objetos
+    PlayerStats e PlayerMonthlyStats (ainda não salvos) de cada jogador.
+    """
+    stats, monthly = [], []
+    current = month = None
+
+    for player_id, date, _, _, buy_in, rebuy, final_balance in rows:
+        net = _net(buy_in, rebuy, final_balance)
+        won = net > 0
+
+        if current is None or current.player_id != player_id:
+            current = PlayerStats(
+                player_id=player_id,
+                first_game_on=date,
+                best_night=net,
+                worst_night=net,
+            )
+            stats.append(current)
+            month = None
+
+        current.games_played += 1
+        current.wins += won
+        current.total_buy_in += buy_in
+        current.total_rebuy += rebuy or 0
+        current.net_result += net
+        current.best_night = max(current.best_night, net)
+        current.worst_night = min(current.worst_night, net)
+        current.current_win_streak = current.current_win_streak + 1 if won else 0
+        current.longest_win_streak = max(current.longest_win_streak, current.current_win_streak)
+        current.last_game_on = date
+
+        month_start = date.replace(day=1)
+        if month is None or month.month != month_start:
+            month = PlayerMonthlyStats(player_id=player_id, month=month_start)
+            monthly.append(month)
+
+        month.games_played += 1
+        month.wins += won
+        month.total_buy_in += buy_in
+        month.total_rebuy += rebuy or 0
+        month.net_result += net
+
+    return stats, monthly
+
+
+def _store_player_stats(stats, monthly, player_ids=None):
+    """
+    Grava o resultado de `fold_player_stats` com upserts (seguros com
+    escritas concorrentes no mesmo jogador) e remove as linhas de jogadores
+    e meses que ficaram sem participações.
+    """
+    PlayerStats.objects.bulk_create(
+        stats,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["player"],
+        update_fields=PLAYER_STATS_FIELDS,
+    )
+    PlayerMonthlyStats.objects.bulk_create(
+        monthly,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["player", "month"],
+        update_fields=SUM_FIELDS,
+    )
+
+    stats_qs = PlayerStats.objects.all()
+    monthly_qs = PlayerMonthlyStats.objects.all()
+    if player_ids is not None:
+        stats_qs = stats_qs.filter(player_id__in=player_ids)
+        monthly_qs = monthly_qs.filter(player_id__in=player_ids)
+
+    stats_qs.filter(
+        ~Exists(GameParticipation.objects.filter(player_id=OuterRef("player_id")))
+    ).delete()
+    monthly_qs.filter(
+        ~Exists(
+            GameParticipation.objects
+            .filter(player_id=OuterRef("player_id"))
+            .annotate(month=TruncMonth("game__date"))
+            .filter(month=OuterRef("month"))
+        )
+    ).delete()
+    return len(stats)
+
+
+def rebuild_player_stats(player_ids=None):
+    """
+    Reconstrói as estatísticas de carreira (de todos ou de alguns jogadores)
+    percorrendo o histórico inteiro. Usado por manutenção e pela fila de
+    jobs; as escritas do dia a dia usam `player_stats_changed`.
+    """
+    participations = GameParticipation.objects.all()
+    with transaction.atomic():
+        if player_ids is not None:
+            participations = participations.filter(player_id__in=player_ids)
+            # Escritas concorrentes esperam a reconstrução e aplicam o delta
+            # delas sobre o valor novo.
+            list(PlayerStats.objects.select_for_update().filter(player_id__in=player_ids).values_list("pk"))
+
+        stats, monthly = fold_player_stats(player_rows(participations))
+        return _store_player_stats(stats, monthly, player_ids)
+
+
+def _add_sums(model, keys, deltas, **extra):
+    """Soma `deltas` (na ordem de SUM_FIELDS) à linha `keys` com um UPDATE atômico."""
+    fields = {field: F(field) + value for field, value in zip(SUM_FIELDS, deltas) if value}
+    if fields or extra:
+        model.objects.filter(**keys).update(**fields, **extra)
+
+
+def _extremes_patch(added):
+    """
+    Campos de PlayerStats que as participações `added` atualizam sem reler o
+    histórico. `games_played` no When é o valor anterior ao UPDATE: numa
+    linha nova os extremos vêm só das partidas adicionadas.
+    """
+    nets = [_net(row.game__buy_in, row.rebuy, row.final_balance) for row in added]
+    dates = [row.game__date for row in added]
+
+    def patch(field, value, keep):
+        return Case(
+            When(games_played=0, then=Value(value)),
+            default=keep(Coalesce(F(field), Value(value)), Value(value)),
+        )
+
+    return {
+        "best_night": patch("best_night", max(nets), Greatest),
+        "worst_night": patch("worst_night", min(nets), Least),
+        "first_game_on": patch("first_game_on", min(dates), Least),
+        "last_game_on": patch("last_game_on", max(dates), Greatest),
+    }
+
+
+def _refresh_extremes(player_ids):
+    """Recalcula no banco melhor/pior noite e primeira/última partida."""
+    net = net_expression()
+    rows = (
+        GameParticipation.objects
+        .filter(player_id__in=player_ids)
+        .values("player_id")
+        .annotate(
+            best=Max(net), worst=Min(net), first=Min("game__date"), last=Max("game__date"),
+        )
+        .order_by()
+    )
+    for row in rows:
+        PlayerStats.objects.filter(player_id=row["player_id"]).update(
+            best_night=row["best"],
+            worst_night=row["worst"],
+            first_game_on=row["first"],
+            last_game_on=row["last"],
+        )
+
+
+def _position(row):
+    return (row.game__date, row.game__created_at, row.game_id)
+
+
+def _after(date, created_at, game_id):
+    """Participações em partidas posteriores à posição informada."""
+    return (
+        Q(game__date__gt=date)
+        | Q(game__date=date, game__created_at__gt=created_at)
+        | Q(game__date=date, game__created_at=created_at, game_id__gt=game_id)
+    )
+
+
+def current_win_streak(player_id):
+    """
+    Vitórias seguidas nas partidas mais recentes do jogador. Lê o histórico
+    de trás para frente, em páginas crescentes, só até a última derrota.
+    """
+    rows = (
+        GameParticipation.objects
+        .filter(player_id=player_id)
+        .order_by(*(f"-{field}" for field in CAREER_ORDER))
+        .values_list("game__buy_in", "rebuy", "final_balance")
+    )
+    streak, offset, size = 0, 0, 16
+    while True:
+        page = list(rows[offset:offset + size])
+        for row in page:
+            if _net(*row) <= 0:
+                return streak
+            streak += 1
+        if len(page) < size:
+            return streak
+        offset, size = offset + size, size * 2
+
+
+def _streak_changes(removed, added):
+    """
+    (posição, venceu) que saíram e que entraram. Edições que não mudam
+    vitória/derrota nem a data da partida se anulam.
+    """
+    def outcomes(rows):
+        return Counter(
+            (_position(row), _net(row.game__buy_in, row.rebuy, row.final_balance) > 0)
+            for row in rows
+        )
+
+    before, after = outcomes(removed), outcomes(added)
+    return before - after, after - before
+
+
+def _refresh_streaks(player_id, removed, added):
+    """
+    Sequências de vitórias depois de uma escrita. A atual sai da cauda do
+    histórico (`current_win_streak`). A mais longa só cresce quando as
+    mudanças estão no fim da carreira e nenhuma vitória saiu (o caso de
+    registrar a partida da noite); nos demais casos ela pode encolher ou
+    depender de partidas antigas, e a reconstrução completa do jogador vai
+    para a fila de jobs, fora da request. Sem worker (JOBS_WORKER=0) ela é
+    feita aqui mesmo, na transação da escrita.
+    """
+    lost, gained = _streak_changes(removed, added)
+    if not lost and not gained:
+        return
+
+    streak = current_win_streak(player_id)
+    PlayerStats.objects.filter(player_id=player_id).update(
+        current_win_streak=streak,
+        longest_win_streak=Greatest(F("longest_win_streak"), Value(streak)),
+    )
+
+    positions = [position for position, _ in (*lost, *gained)]
+    earliest = min(positions)
+    at_tail = not (
+        GameParticipation.objects
+        .filter(player_id=player_id)
+        .exclude(game_id__in={game_id for _, _, game_id in positions})
+        .filter(_after(*earliest))
+        .exists()
+    )
+    if not at_tail or any(won for _, won in lost):
+        if not settings.JOBS_WORKER:
+            rebuild_player_stats([player_id])
+            return
+        enqueue(
+            "rebuild_aggregates",
+            dedup_key=f"player-stats:{player_id}",
+            player_ids=[player_id],
+        )
+
+
+def player_stats_changed(removed=(), added=()):
+    """
+    Atualiza PlayerStats e PlayerMonthlyStats com a diferença entre as
+    participações antes (`removed`) e depois (`added`) de uma escrita, ambas
+    de `stat_rows`. Os totais recebem deltas com F(); o custo depende das
+    linhas alteradas, não do histórico do jogador.
+    """
+    removed, added = Counter(removed), Counter(added)
+    removed, added = list((removed - added).elements()), list((added - removed).elements())
+    if not removed and not added:
+        return
+
+    by_player = defaultdict(lambda: ([], []))
+    totals = defaultdict(lambda: [0] * len(SUM_FIELDS))
+    monthly = defaultdict(lambda: [0] * len(SUM_FIELDS))
+    for sign, rows in ((-1, removed), (1, added)):
+        for row in rows:
+            by_player[row.player_id][sign > 0].append(row)
+            net = _net(row.game__buy_in, row.rebuy, row.final_balance)
+            deltas = (1, int(net > 0), row.game__buy_in, row.rebuy or 0, net)
+            month = (row.player_id, row.game__date.replace(day=1))
+            for target in (totals[row.player_id], monthly[month]):
+                for index, value in enumerate(deltas):
+                    target[index] += sign * value
+
+    # INSERT ... ON CONFLICT DO NOTHING e depois UPDATE com F(): duas
+    # transações no mesmo jogador se enfileiram no lock da linha.
+    PlayerStats.objects.bulk_create(
+        [PlayerStats(player_id=player_id) for player_id in totals], ignore_conflicts=True,
+    )
+    PlayerMonthlyStats.objects.bulk_create(
+        [PlayerMonthlyStats(player_id=player_id, month=month) for player_id, month in monthly],
+        ignore_conflicts=True,
+    )
+
+    now = timezone.now()
+    for player_id, deltas in totals.items():
+        gone, new = by_player[player_id]
+        extra = _extremes_patch(new) if new else {}
+        _add_sums(PlayerStats, {"player_id": player_id}, deltas, updated_at=now, **extra)
+    for (player_id, month), deltas in monthly.items():
+        _add_sums(PlayerMonthlyStats, {"player_id": player_id, "month": month}, deltas)
+
+    player_ids = list(totals)
+    PlayerStats.objects.filter(player_id__in=player_ids, games_played=0).delete()
+    PlayerMonthlyStats.objects.filter(player_id__in=player_ids, games_played=0).delete()
+
+    # Uma participação removida que era um extremo obriga a reler o máximo
+    # e o mínimo (no banco, sem trazer linhas para a aplicação).
+    current = PlayerStats.objects.in_bulk(player_ids)
+    stale = []
+    for player_id, (gone, _) in by_player.items():
+        stats = current.get(player_id)
+        if stats is None or not gone:
+            continue
+        if any(
+            not stats.worst_night < _net(row.game__buy_in, row.rebuy, row.final_balance) < stats.best_night
+            or not stats.first_game_on < row.game__date < stats.last_game_on
+            for row in gone
+        ):
+            stale.append(player_id)
+    if stale:
+        _refresh_extremes(stale)
+
+    for player_id, (gone, new) in by_player.items():
+        if player_id in current:
+            _refresh_streaks(player_id, gone, new)
+
+
+def participations_changed(group_id, player_ids, removed=(), added=()):
+    """
+    Ponto único chamado pelas views após qualquer escrita que altere
+    participações de `player_ids` em partidas do grupo `group_id`.
+    `removed`/`added` são as linhas (`stat_rows`) das participações afetadas
+    antes e depois da escrita; sem elas a carreira dos jogadores não muda
+    (ex.: partida trocada de grupo).
+    """
+    refresh_leaderboard(group_id, player_ids)
+    player_stats_changed(removed, added)
+    touch_group(group_id)
+
+
+def changed():
+    """Campos que marcam uma escrita no grupo: nova versão e horário da mudança."""
+    return {"version": F("version") + 1, "changed_at": timezone.now()}
+
+
+def touch_group(*group_ids):
+    """Incrementa a versão dos grupos, invalidando as respostas em cache."""
+    group_ids = {group_id for group_id in group_ids if group_id}
+    if group_ids:
+        Group.objects.filter(pk__in=group_ids).update(**changed())
+
+
+def adjust_member_count(group_id, delta):
+    """Soma `delta` ao contador de membros do grupo, atomicamente no banco."""
+    if group_id and delta:
+        Group.objects.filter(pk=group_id).update(
+            member_count=F("member_count") + delta,
+            **changed(),
+        )
+
+
+def record_post(post):
+    """Atualiza os contadores do grupo após a criação de um GamePost."""
+    Group.objects.filter(pk=post.group_id).update(
+        post_count=F("post_count") + 1,
+        last_post_at=Case(
+            When(last_post_at__gte=post.posted_at, then=F("last_post_at")),
+            default=Value(post.posted_at),
+        ),
+        **changed(),
+    )
+
+
+def refresh_post_stats(group_ids):
+    """Recalcula post_count/last_post_at dos grupos após remoção de posts."""
+    for group_id in set(group_ids):
+        stats = GamePost.objects.filter(group_id=group_id).aggregate(
+            count=Count("id"),
+            last=Max("posted_at"),
+        )
+        Group.objects.filter(pk=group_id).update(
+            post_count=stats["count"],
+            last_post_at=stats["last"],
+            **changed(),
+        )
+
+
+def adjust_game_count(group_id, delta=0):
+    """
+    Soma `delta` ao contador de partidas do grupo e recalcula last_game_at
+    no mesmo UPDATE (a data mais recente pode ter sumido ou mudado).
+    """
+    if group_id:
+        Group.objects.filter(pk=group_id).update(
+            game_count=F("game_count") + delta,
+            last_game_at=_per_group(Game, Max("date")),
+            **changed(),
+        )
+
+
+def _money(expression):
+    return ExpressionWrapper(expression, output_field=DecimalField(max_digits=12, decimal_places=2))
+
+
+def adjust_game_totals(game_id, participants=0, rebuy=0):
+    """
+    Atualiza participant_count e pot_total de uma partida: `participants`
+    participações a mais (ou a menos), cada uma com o buy-in da partida, e
+    `rebuy` somado aos rebuys.
+    """
+    Game.objects.filter(pk=game_id).update(
+        participant_count=F("participant_count") + participants,
+        pot_total=_money(F("pot_total") + F("buy_in") * participants + Value(Decimal(rebuy or 0))),
+    )
+
+
+def buy_in_changed(game_id, previous_buy_in):
+    """Corrige pot_total depois que o buy-in da partida foi alterado."""
+    Game.objects.filter(pk=game_id).update(
+        pot_total=_money(F("pot_total") + (F("buy_in") - Value(previous_buy_in)) * F("participant_count")),
+    )
+
+
+def _stake():
+    """O que uma participação pôs na mesa: buy-in da partida + rebuy."""
+    return _money(F("game__buy_in") + Coalesce(F("rebuy"), ZERO))
+
+
+def recount_games(game_ids=None):
+    """Recalcula participant_count/pot_total a partir das participações."""
+    games = Game.objects.all()
+    if game_ids is not None:
+        games = games.filter(pk__in=game_ids)
+
+    def per_game(aggregate):
+        return Subquery(
+            GameParticipation.objects.filter(game_id=OuterRef("pk"))
+            .values("game_id")
+            .annotate(value=aggregate)
+            .values("value")[:1]
+        )
+
+    return games.update(
+        participant_count=Coalesce(per_game(Count("id")), 0),
+        pot_total=Coalesce(per_game(Sum(_stake())), ZERO),
+    )
+
+
+def _per_group(model, aggregate):
+    return Subquery(
+        model.objects.filter(group_id=OuterRef("pk"))
+        .values("group_id")
+        .annotate(value=aggregate)
+        .values("value")[:1]
+    )
+
+
+def recount_groups(group_ids=None):
+    """Recalcula todos os contadores desnormalizados a partir das tabelas base."""
+    groups = Group.objects.all()
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+
+    return groups.update(
+        member_count=Coalesce(_per_group(GroupMembership, Count("id")), 0),
+        post_count=Coalesce(_per_group(GamePost, Count("id")), 0),
+        last_post_at=_per_group(GamePost, Max("posted_at")),
+        game_count=Coalesce(_per_group(Game, Count("id")), 0),
+        last_game_at=_per_group(Game, Max("date")),
+        **changed(),
+    )
+
+
+def rebuild_all():
+    """Reconstrói todos os agregados e contadores (após cargas em massa)."""
+    return {
+        "leaderboard_entries": rebuild_leaderboard(),
+        "player_stats": rebuild_player_stats(),
+        "groups": recount_groups(),
+        "games": recount_games(),
+    }
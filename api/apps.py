@@ -0,0 +1,23 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_index(sender, using, **kwargs):
+    from django.db import connections
+
+    from . import search
+
+    search.install(connections[using])
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "api"
+
+    def ready(self):
+        # Migrations que recriam tabelas no SQLite descartam os triggers do
+        # índice FTS; reinstalar após cada migrate mantém a busca consistente.
+        post_migrate.connect(install_search_index, sender=self)
+
+        # Registra as tarefas da fila de jobs.
+        from . import tasks  # noqa: F401
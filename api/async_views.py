@@ -0,0 +1,228 @@
+"""
+Variantes assíncronas dos endpoints de leitura mais acessados: lista e
+detalhe de grupos, lista de partidas e placar do grupo.
+
+São montadas na frente do router (ver api/urls.py) quando
+ASYNC_READ_VIEWS está ligado, o padrão no entry point ASGI. Só o GET vai
+para a view assíncrona; os demais métodos das mesmas URLs continuam nos
+viewsets. As queries usam o ORM assíncrono (aget/aiterator), enquanto a
+montagem dos querysets, a paginação e os serializers são os mesmos das
+views síncronas, então o payload é idêntico.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import Http404
+from django.urls import re_path
+from rest_framework import status
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from .authentication import AsyncJWTAuthentication
+from .conditional import (
+    add_conditional_headers,
+    game_list_marker,
+    group_detail_marker,
+    group_list_marker,
+    not_modified,
+)
+from .memberships import memberships
+from .models import Group, GroupLeaderboardEntry
+from .pagination import GameCursorPagination, GroupSectionPagination
+from .search import aprepare as prepare_search
+from .serializers import (
+    GROUP_DETAIL_CACHE_KEY,
+    GroupDetailSerializer,
+    LeaderboardEntrySerializer,
+    sparse_fieldset,
+)
+from .views import GameViewSet, GroupViewSet
+
+
+def renderers():
+    # A API navegável precisa da view; aqui só os formatos de dados.
+    return [
+        renderer() for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+        if not issubclass(renderer, BrowsableAPIRenderer)
+    ]
+
+
+def finalize(response, request):
+    """
+    Deixa a Response pronta para o handler do Django renderizar no formato
+    negociado pelo Accept (JSON ou MessagePack), como o APIView faria.
+    """
+    available = renderers()
+    try:
+        renderer, media_type = DefaultContentNegotiation().select_renderer(request, available)
+    except APIException:
+        renderer, media_type = available[0], available[0].media_type
+    response.accepted_renderer = renderer
+    response.accepted_media_type = media_type
+    response.renderer_context = {"request": request}
+    return response
+
+
+def async_api_view(view):
+    """
+    Autentica a request (JWT) e converte exceções nas mesmas respostas de
+    erro que o APIView geraria.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        authenticator = AsyncJWTAuthentication()
+        # APIClient.force_authenticate (testes) marca a request como o DRF espera.
+        forced_user = getattr(request, "_force_auth_user", None)
+        forced_token = getattr(request, "_force_auth_token", None)
+        request = Request(request)
+        try:
+            if forced_user is not None:
+                request.user, request.auth = forced_user, forced_token
+            else:
+                request.user, request.auth = await authenticator.aauthenticate(request)
+            response = await view(request, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+                exc.status_code = status.HTTP_401_UNAUTHORIZED
+            response = exception_handler(exc, {"request": request})
+            if response.status_code == status.HTTP_401_UNAUTHORIZED:
+                response["WWW-Authenticate"] = authenticator.authenticate_header(request)
+        return finalize(response, request)
+
+    return wrapper
+
+
+def conditional(marker_func):
+    """GET condicional (ver api/conditional.py): 304 antes de rodar a view."""
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            marker = await sync_to_async(marker_func)(request, **kwargs)
+            response = not_modified(request, marker)
+            if response is None:
+                response = add_conditional_headers(await view(request, *args, **kwargs), marker)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def not_found(model):
+    return Http404(f"No {model._meta.object_name} matches the given query.")
+
+
+def viewset(cls, request, action):
+    return cls(request=request, action=action, format_kwarg=None, args=(), kwargs={})
+
+
+@async_api_view
+@conditional(group_list_marker)
+async def group_list(request):
+    await prepare_search()
+    view = viewset(GroupViewSet, request, "list")
+    base_qs = view.list_queryset(request)
+    section = view.requested_section(request)
+
+    payload = {}
+    for name in [section] if section is not None else view.list_sections:
+        paginator = GroupSectionPagination()
+        groups = await paginator.apaginate_queryset(
+            base_qs.filter(view.list_sections[name]), request, view=view
+        )
+        payload[name] = view.section_payload(request, paginator, groups, name)
+
+    return Response(payload[section] if section is not None else payload)
+
+
+@async_api_view
+@conditional(group_detail_marker)
+async def group_detail(request, slug):
+    try:
+        group = await Group.objects.select_related("created_by").aget(slug=slug)
+    except Group.DoesNotExist:
+        raise not_found(Group)
+
+    # A parte compartilhada quase sempre está no cache; na falta, é montada
+    # pelo serializer numa thread (várias queries com prefetch).
+    key = GROUP_DETAIL_CACHE_KEY.format(group_id=group.id, version=group.version)
+    shared = await cache.aget(key)
+    if shared is None:
+        serializer = GroupDetailSerializer(
+            group, context={"request": request}, **sparse_fieldset(request)
+        )
+        shared = await sync_to_async(serializer.get_shared_representation)(group)
+
+    await memberships(request).aload()
+    serializer = GroupDetailSerializer(
+        group, context={"request": request, "shared": shared}, **sparse_fieldset(request)
+    )
+    return Response(serializer.data)
+
+
+@async_api_view
+@conditional(game_list_marker)
+async def game_list(request):
+    await prepare_search()
+    view = viewset(GameViewSet, request, "list")
+    paginator = GameCursorPagination()
+    games = await paginator.apaginate_queryset(view.get_queryset(), request, view=view)
+    serializer = view.get_serializer(games, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+@async_api_view
+async def group_leaderboard(request, slug):
+    entries = [
+        entry
+        async for entry in GroupLeaderboardEntry.objects
+        .filter(group__slug=slug)
+        .select_related("player")
+        .order_by("-net_result", "player_id")
+        .aiterator()
+    ]
+
+    if not entries and not await Group.objects.filter(slug=slug).aexists():
+        raise not_found(Group)
+
+    return Response(LeaderboardEntrySerializer(entries, many=True).data)
+
+
+def read_only_async(async_view, sync_view):
+    """
+    GET vai para `async_view`; os outros métodos, para a view do router.
+    Os atributos da view do router (actions, initkwargs, csrf_exempt) são
+    copiados, então o nome da rota nas métricas continua o mesmo.
+    """
+    sync_call = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        if request.method == "GET":
+            return await async_view(request, *args, **kwargs)
+        return await sync_call(request, *args, **kwargs)
+
+    functools.update_wrapper(view, sync_view)
+    return view
+
+
+ASYNC_READ_ROUTES = [
+    (r"^groups/$", "groups-list", group_list),
+    (r"^groups/(?P<slug>[^/.]+)/$", "groups-detail", group_detail),
+    (r"^groups/(?P<slug>[^/.]+)/leaderboard/$", "groups-leaderboard", group_leaderboard),
+    (r"^games/$", "games-list", game_list),
+]
+
+
+def async_urlpatterns(router):
+    """Rotas que sobrepõem as do `router` nos endpoints acima."""
+    routes = {pattern.name: pattern.callback for pattern in router.urls}
+    return [
+        re_path(regex, read_only_async(async_view, routes[name]), name=name)
+        for regex, name, async_view in ASYNC_READ_ROUTES
+    ]
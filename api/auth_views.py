@@ -3,8 +3,11 @@ from rest_framework import serializers, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from .authentication import ClaimsRefreshToken, full_user, revoke_token
+
 User = get_user_model()
 
 
@@ -46,7 +49,7 @@ class LoginView(APIView):
         if not user:
             return Response({"detail": "Credenciais inválidas"}, status=400)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
 
         return Response({
             "access": str(refresh.access_token),
@@ -64,19 +67,22 @@ class LogoutView(APIView):
 
     def post(self, request):
         try:
-            refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
-            return Response({"detail": "Logout realizado com sucesso"})
-        except Exception:
+            token = RefreshToken(request.data["refresh"])
+        except (KeyError, TypeError, TokenError):
             return Response({"detail": "Token inválido"}, status=400)
 
+        revoke_token(token)
+        # O access token usado nesta request também deixa de valer.
+        if request.auth is not None:
+            revoke_token(request.auth)
+        return Response({"detail": "Logout realizado com sucesso"})
+
 
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
+        user = full_user(request.user)
         return Response({
             "id": user.id,
             "username": user.username,
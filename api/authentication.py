@@ -0,0 +1,226 @@
+"""
+Autenticação JWT.
+
+No modo stateless (JWT_STATELESS, padrão) o request.user é um ClaimsUser
+montado só com as claims do access token (id, username, is_staff), sem
+consultar a tabela de usuários. As views usam apenas `request.user.id`;
+quem precisa do registro completo chama `full_user()`, que pode usar um
+cache com TTL (AUTH_USER_CACHE_TIMEOUT).
+
+Tokens revogados no logout são recusados pelos dois modos através de um
+índice em memória dos jti, recarregado do banco a cada
+JWT_REVOCATION_REFRESH segundos.
+"""
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import RevokedToken
+
+USER_CACHE_KEY = "auth-user:{user_id}"
+
+
+class ClaimsUser(TokenUser):
+    """Usuário sem registro no banco, lido das claims do access token."""
+
+    @cached_property
+    def id(self):
+        # O simplejwt grava a claim como string (str(user.pk)); as views
+        # comparam com os *_id inteiros dos models.
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    def __str__(self):
+        return self.username or super().__str__()
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token (e o access derivado) com as claims usadas pelo ClaimsUser."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["username"] = user.get_username()
+        token["is_staff"] = user.is_staff
+        return token
+
+
+def full_user(user):
+    """
+    Registro completo do usuário autenticado. Com AUTH_USER_CACHE_TIMEOUT > 0
+    o objeto fica no cache por esse tempo.
+    """
+    User = get_user_model()
+    if isinstance(user, User):
+        return user
+
+    timeout = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 0)
+    key = USER_CACHE_KEY.format(user_id=user.id)
+    if timeout:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    instance = User.objects.get(pk=user.id)
+    if timeout:
+        cache.set(key, instance, timeout)
+    return instance
+
+
+def invalidate_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id=user_id))
+
+
+class RevocationIndex:
+    """
+    Conjunto em memória dos jti revogados e ainda não expirados.
+
+    Uma revogação feita neste processo vale na hora; as feitas por outros
+    workers passam a valer na próxima recarga, em até `refresh_interval`
+    segundos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jtis = frozenset()
+        self._loaded_at = None
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, "JWT_REVOCATION_REFRESH", 30)
+
+    def is_stale(self):
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.refresh_interval
+        )
+
+    def refresh(self):
+        with self._lock:
+            if not self.is_stale():
+                return
+            self._jtis = frozenset(
+                RevokedToken.objects
+                .filter(expires_at__gt=timezone.now())
+                .values_list("jti", flat=True)
+            )
+            self._loaded_at = time.monotonic()
+
+    def contains(self, jti):
+        if self.is_stale():
+            self.refresh()
+        return jti in self._jtis
+
+    async def acontains(self, jti):
+        if self.is_stale():
+            await sync_to_async(self.refresh)()
+        return jti in self._jtis
+
+    def add(self, jti):
+        with self._lock:
+            self._jtis = self._jtis | {jti}
+
+    def clear(self):
+        with self._lock:
+            self._jtis = frozenset()
+            self._loaded_at = None
+
+
+revocations = RevocationIndex()
+
+
+def revoke_token(token):
+    """Revoga um token (refresh ou access) até a data de expiração dele."""
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token["exp"], tz=dt_timezone.utc)
+    RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+    revocations.add(jti)
+
+
+class RevocationMixin:
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if revocations.contains(token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_("Token is blacklisted"))
+        return token
+
+
+class DatabaseJWTAuthentication(RevocationMixin, JWTAuthentication):
+    """request.user é o User do banco (uma query por request)."""
+
+
+class StatelessJWTAuthentication(RevocationMixin, JWTStatelessUserAuthentication):
+    """request.user é um ClaimsUser; nenhuma query por request."""
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return ClaimsUser(validated_token)
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    Mesma validação dos backends acima para as views de api/async_views.py,
+    com a busca do usuário (no modo não stateless) pelo ORM assíncrono.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        raw_token = self.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            raise NotAuthenticated()
+
+        validated_token = self.get_validated_token(raw_token)
+        if await revocations.acontains(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_("Token is blacklisted"))
+
+        if settings.JWT_STATELESS:
+            return StatelessJWTAuthentication().get_user(validated_token), validated_token
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,163 @@
+"""
+GET condicional (ETag / Last-Modified) para os endpoints mais consultados.
+
+Toda escrita que afeta um grupo incrementa `Group.version` e atualiza
+`Group.changed_at` (ver api/aggregates.py). Esses dois campos servem de
+marcador de mudança: cada endpoint tem uma função que lê o marcador com
+uma query barata (uma linha ou um MAX/COUNT indexado) e, se o cliente já
+tem a versão atual, a resposta é 304 sem montar queryset nem serializer.
+
+O ETag inclui o usuário, o caminho com a query string e o Accept, pois o
+payload depende de quem pede e do formato negociado. Como o valor vem do
+marcador e não do corpo, o ETag é fraco (W/"...").
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Q
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import Game, Group, GroupRequest
+
+
+@dataclass(frozen=True)
+class ChangeMarker:
+    etag: str
+    last_modified: datetime | None
+
+    @property
+    def timestamp(self):
+        if self.last_modified is None:
+            return None
+        return int(self.last_modified.timestamp())
+
+
+def make_marker(request, *parts, last_modified=None):
+    key = ":".join(str(part) for part in (
+        request.user.id,
+        request.get_full_path(),
+        request.META.get("HTTP_ACCEPT", ""),
+        *parts,
+    ))
+    digest = hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+    return ChangeMarker(etag=f'W/"{digest}"', last_modified=last_modified)
+
+
+def _groups_marker(request, groups):
+    state = groups.order_by().aggregate(last=Max("changed_at"), count=Count("id"))
+    return make_marker(request, state["count"], state["last"], last_modified=state["last"])
+
+
+def _first_row(model, fields, *conditions, **lookup):
+    """Primeira linha de `fields` que casa com o filtro, ou None (inclusive pk malformado)."""
+    try:
+        return model.objects.filter(*conditions, **lookup).values_list(*fields).first()
+    except (ValueError, TypeError, ValidationError):
+        # Ex.: /api/games/abc/. Sem marcador, a view segue e devolve o 404 de sempre.
+        return None
+
+
+def _group_row_marker(request, row):
+    if row is None:
+        return None
+    version, changed_at = row
+    return make_marker(request, version, changed_at, last_modified=changed_at)
+
+
+def group_list_marker(request, **kwargs):
+    return _groups_marker(request, Group.objects.all())
+
+
+def group_detail_marker(request, slug, **kwargs):
+    row = _first_row(Group, ("version", "changed_at"), slug=slug)
+    return _group_row_marker(request, row)
+
+
+def game_list_marker(request, **kwargs):
+    # A lista só mostra partidas dos grupos do usuário; entrar ou sair de um
+    # grupo também muda a versão dele.
+    return _groups_marker(request, Group.objects.filter(memberships__user_id=request.user.id))
+
+
+def game_detail_marker(request, pk, **kwargs):
+    # Só partidas de grupos do usuário: para os demais não há marcador e a
+    # view responde com as permissões de sempre, sem 304 que revele a partida.
+    row = _first_row(
+        Game, ("group__version", "group__changed_at"),
+        pk=pk, group__memberships__user_id=request.user.id,
+    )
+    return _group_row_marker(request, row)
+
+
+def group_request_list_marker(request, **kwargs):
+    return _groups_marker(request, Group.objects.all())
+
+
+def group_request_detail_marker(request, pk, **kwargs):
+    # Idem: só o autor do pedido e os membros do grupo recebem 304.
+    row = _first_row(
+        GroupRequest, ("group__version", "group__changed_at"),
+        Q(requested_by_id=request.user.id) | Q(group__memberships__user_id=request.user.id),
+        pk=pk,
+    )
+    return _group_row_marker(request, row)
+
+
+def not_modified(request, marker):
+    """Resposta 304 se o cliente já tem a versão do marcador, senão None."""
+    if marker is None:
+        return None
+    response = get_conditional_response(
+        request, etag=marker.etag, last_modified=marker.timestamp
+    )
+    if response is not None:
+        add_conditional_headers(response, marker)
+    return response
+
+
+def add_conditional_headers(response, marker):
+    if marker is None or response.status_code not in (200, 304):
+        return response
+    response["ETag"] = marker.etag
+    if marker.last_modified is not None:
+        response["Last-Modified"] = http_date(marker.timestamp)
+    # O navegador pode guardar a resposta, mas revalida a cada uso.
+    response["Cache-Control"] = "private, no-cache"
+    patch_vary_headers(response, ["Accept", "Authorization"])
+    return response
+
+
+class _NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    GET condicional para viewsets. `conditional_markers` mapeia a ação para
+    a função que lê o marcador (recebe a request e os kwargs da URL). O 304
+    sai logo depois da autenticação, antes do handler da ação.
+    """
+    conditional_markers = {}
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.change_marker = None
+        marker_func = self.conditional_markers.get(self.action)
+        if marker_func is not None and request.method in ("GET", "HEAD"):
+            self.change_marker = marker_func(request, **kwargs)
+            response = not_modified(request, self.change_marker)
+            if response is not None:
+                raise _NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        return add_conditional_headers(response, getattr(self, "change_marker", None))
@@ -0,0 +1,155 @@
+"""
+Remoção de grupos e partidas sem o Collector do Django.
+
+`group.delete()` carrega em memória todas as linhas dependentes (partidas,
+participações, posts, convites, pedidos) para resolver o CASCADE em
+Python. Aqui cada tabela dependente é apagada com DELETEs diretos, das
+folhas para a raiz, em lotes de GROUP_DELETE_BATCH_SIZE chaves; só as
+chaves primárias de um lote passam pela aplicação. O índice de busca é
+mantido pelos triggers do banco (ver api/search.py).
+
+Com um worker (JOBS_WORKER=1), grupos muito grandes são removidos pela
+fila de jobs: cada lote
+commita sozinho e a linha do grupo é a última a sair, então uma remoção
+interrompida pode ser retomada chamando `delete_group` de novo.
+"""
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+
+from .aggregates import (
+    adjust_game_count,
+    participations_changed,
+    rebuild_player_stats,
+    refresh_post_stats,
+    stat_rows,
+)
+from .jobs import enqueue
+from .memberships import invalidate_memberships
+from .models import (
+    Game, GameParticipation, GamePost, Group, GroupInvite, GroupLeaderboardEntry,
+    GroupMembership, GroupRequest,
+)
+
+
+def raw_delete(queryset):
+    """DELETE direto do queryset, sem sinais nem cascata em Python."""
+    return queryset._raw_delete(queryset.db)
+
+
+def _batch(atomic):
+    """Transação de cada lote: a externa (atomic) ou uma própria, que commita."""
+    return nullcontext() if atomic else transaction.atomic(durable=True)
+
+
+def delete_in_batches(queryset, batch_size, atomic=True):
+    """
+    Apaga as linhas do queryset em lotes de `batch_size` chaves. Com
+    `atomic=False` cada lote roda (e commita) na sua própria transação.
+    """
+    model = queryset.model
+    keys = queryset.order_by().values_list("pk", flat=True)
+    total = 0
+
+    while True:
+        with _batch(atomic):
+            batch = list(keys[:batch_size])
+            if not batch:
+                return total
+            total += raw_delete(model.objects.filter(pk__in=batch))
+
+
+def group_dependents(group_id):
+    """Querysets das tabelas que dependem do grupo, na ordem de remoção."""
+    return [
+        GroupMembership.objects.filter(group_id=group_id),
+        GroupRequest.objects.filter(group_id=group_id),
+        GroupInvite.objects.filter(group_id=group_id),
+        GroupLeaderboardEntry.objects.filter(group_id=group_id),
+        GameParticipation.objects.filter(game__group_id=group_id),
+        GamePost.objects.filter(game__group_id=group_id),
+        GamePost.objects.filter(group_id=group_id),
+        Game.objects.filter(group_id=group_id),
+    ]
+
+
+def should_delete_in_background(group, requested=False):
+    """
+    Remoção pela fila para grupos grandes ou quando pedida (`requested`).
+    Sem worker (JOBS_WORKER=0) ela é sempre feita na request, em lotes.
+    """
+    if not settings.JOBS_WORKER:
+        return False
+    return requested or group.game_count >= settings.GROUP_DELETE_BACKGROUND_THRESHOLD
+
+
+def delete_group(group_id, batch_size=None, atomic=True, request=None):
+    """
+    Remove o grupo e tudo que depende dele. Devolve {tabela: linhas removidas}.
+
+    Com `atomic=True` deve ser chamada dentro de transaction.atomic() e a
+    remoção é tudo ou nada; com `atomic=False` cada lote commita sozinho.
+    """
+    batch_size = batch_size or settings.GROUP_DELETE_BATCH_SIZE
+
+    member_ids = list(
+        GroupMembership.objects.filter(group_id=group_id).values_list("user_id", flat=True)
+    )
+    player_ids = list(
+        GameParticipation.objects
+        .filter(game__group_id=group_id)
+        .order_by()
+        .values_list("player_id", flat=True)
+        .distinct()
+    )
+    # Partidas do grupo também postadas em outros grupos.
+    post_group_ids = list(
+        GamePost.objects
+        .filter(game__group_id=group_id)
+        .exclude(group_id=group_id)
+        .order_by()
+        .values_list("group_id", flat=True)
+        .distinct()
+    )
+
+    deleted = {}
+    for queryset in group_dependents(group_id):
+        label = queryset.model._meta.label
+        deleted[label] = deleted.get(label, 0) + delete_in_batches(queryset, batch_size, atomic)
+
+    # A carreira dos jogadores é refeita em lotes de `batch_size` jogadores,
+    # para não trazer o histórico de todos para a memória de uma vez.
+    for start in range(0, len(player_ids), batch_size):
+        with _batch(atomic):
+            rebuild_player_stats(player_ids[start:start + batch_size])
+
+    with _batch(atomic):
+        deleted[Group._meta.label] = raw_delete(Group.objects.filter(pk=group_id))
+        refresh_post_stats(post_group_ids)
+        invalidate_memberships(member_ids, request=request)
+
+    return deleted
+
+
+def schedule_group_deletion(group_id):
+    """Enfileira `delete_group` (tarefa "delete_group") para depois do commit."""
+    enqueue("delete_group", dedup_key=f"delete-group:{group_id}", group_id=group_id)
+
+
+def delete_game(game):
+    """
+    Remove a partida, suas participações e posts com DELETEs diretos e
+    atualiza os agregados afetados. Chamar dentro de transaction.atomic().
+    """
+    removed = stat_rows(GameParticipation.objects.filter(game_id=game.id))
+    player_ids = [row.player_id for row in removed]
+    post_group_ids = list(game.posts.values_list("group_id", flat=True))
+
+    raw_delete(GameParticipation.objects.filter(game_id=game.id))
+    raw_delete(GamePost.objects.filter(game_id=game.id))
+    raw_delete(Game.objects.filter(pk=game.id))
+
+    participations_changed(game.group_id, player_ids, removed=removed)
+    adjust_game_count(game.group_id, -1)
+    refresh_post_stats(post_group_ids)
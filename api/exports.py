@@ -0,0 +1,131 @@
+"""
+Exportação do histórico completo de um grupo em streaming.
+
+As linhas saem direto de um cursor (`values_list().iterator()`), então a
+memória usada é constante e o primeiro byte é enviado antes da consulta.
+
+Sob ASGI o Django consome um iterador síncrono inteiro em uma thread
+(`sync_to_async(list)`) antes de enviar o corpo, então lá a exportação
+usa a versão assíncrona, que envia um lote de linhas por vez.
+"""
+import csv
+import json
+from decimal import Decimal
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import GameParticipation
+
+CHUNK_SIZE = 2000
+
+ZERO = Decimal("0.00")
+
+COLUMNS = [
+    "game_id",
+    "date",
+    "title",
+    "location",
+    "buy_in",
+    "player_id",
+    "player",
+    "rebuy",
+    "final_balance",
+    "net",
+]
+
+
+def export_queryset(group):
+    return (
+        GameParticipation.objects
+        .filter(game__group=group)
+        .order_by("game__date", "game__created_at", "game_id", "id")
+        .values_list(
+            "game_id",
+            "game__date",
+            "game__title",
+            "game__location",
+            "game__buy_in",
+            "player_id",
+            "player__username",
+            "rebuy",
+            "final_balance",
+        )
+    )
+
+
+def export_row(row):
+    """Linha de COLUMNS: rebuy ausente vira zero e o resultado líquido é somado."""
+    buy_in, rebuy, final_balance = row[4], row[7], row[8]
+    if rebuy is None:
+        rebuy = ZERO
+    return (*row[:7], rebuy, final_balance, final_balance - buy_in - rebuy)
+
+
+def export_rows(group):
+    for row in export_queryset(group).iterator(chunk_size=CHUNK_SIZE):
+        yield export_row(row)
+
+
+async def aexport_rows(group):
+    # O gerador só começa a consultar no primeiro next(), já dentro da
+    # thread do sync_to_async; cada lote de CHUNK_SIZE linhas vem do mesmo
+    # cursor. (O aiterator() de values_list executa a consulta no loop.)
+    rows = export_rows(group)
+    next_chunk = sync_to_async(lambda: list(islice(rows, CHUNK_SIZE)))
+    while True:
+        chunk = await next_chunk()
+        for row in chunk:
+            yield row
+        if len(chunk) < CHUNK_SIZE:
+            return
+
+
+class _Echo:
+    """Buffer falso: csv.writer devolve a linha formatada em vez de gravá-la."""
+
+    def write(self, value):
+        return value
+
+
+def csv_format():
+    """(cabeçalho, função que formata uma linha) do CSV."""
+    writer = csv.writer(_Echo())
+    return writer.writerow(COLUMNS), writer.writerow
+
+
+def ndjson_format():
+    def line(row):
+        return json.dumps(dict(zip(COLUMNS, row)), cls=DjangoJSONEncoder) + "\n"
+
+    return None, line
+
+
+def stream(group, line_format):
+    header, line = line_format()
+    if header is not None:
+        yield header
+    for row in export_rows(group):
+        yield line(row)
+
+
+async def astream(group, line_format):
+    header, line = line_format()
+    if header is not None:
+        yield header
+    async for row in aexport_rows(group):
+        yield line(row)
+
+
+STREAMS = {
+    "csv": ("text/csv", csv_format),
+    "ndjson": ("application/x-ndjson", ndjson_format),
+}
+
+
+def export_stream(group, export_format, asynchronous=False):
+    """(content type, iterador do corpo); `asynchronous` sob ASGI."""
+    content_type, line_format = STREAMS[export_format]
+    content = astream if asynchronous else stream
+    return content_type, content(group, line_format)
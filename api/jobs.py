@@ -0,0 +1,177 @@
+"""
+Fila de tarefas em segundo plano guardada no banco (tabela Job).
+
+As tarefas são funções registradas com `@task("nome")` (ver api/tasks.py)
+e enfileiradas com `enqueue("nome", ...)`. O INSERT acontece no commit
+da transação atual, então o worker nunca vê um job de uma escrita que
+foi desfeita. Um `dedup_key` evita duplicatas: enquanto houver um job
+na fila com a mesma chave, os novos pedidos são ignorados.
+
+O worker (`manage.py run_jobs`) reivindica um job por vez com um UPDATE
+condicional (status QUEUED -> RUNNING), o que funciona igual no SQLite e
+no PostgreSQL com vários workers. Falhas são repetidas até
+`max_attempts`, com espera exponencial entre as tentativas.
+
+Sem worker (JOBS_WORKER=0, o padrão) nada vai para a tabela: a tarefa
+roda no próprio processo logo depois do commit, para que nenhum trabalho
+fique parado numa fila que ninguém consome.
+"""
+import logging
+import time
+import traceback
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_DELAY = 30
+
+TASKS = {}
+
+
+def task(name):
+    """Registra a função como tarefa `name`."""
+    def register(func):
+        TASKS[name] = func
+        return func
+    return register
+
+
+def _insert(name, payload, dedup_key, max_attempts, run_after):
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                payload=payload,
+                dedup_key=dedup_key,
+                max_attempts=max_attempts,
+                run_after=run_after,
+            )
+    except IntegrityError:
+        if dedup_key is None:
+            raise
+        # Já há um job na fila com a mesma chave; ele fará o trabalho.
+        return None
+
+
+def enqueue(name, dedup_key=None, max_attempts=3, delay=0, **payload):
+    """
+    Enfileira a tarefa `name` com `payload` (precisa ser serializável em
+    JSON) depois do commit da transação atual.
+    """
+    if name not in TASKS:
+        raise KeyError(f"Tarefa desconhecida: {name}")
+
+    if not settings.JOBS_WORKER:
+        # Uma falha é logada e não derruba a request, que já commitou.
+        transaction.on_commit(lambda: TASKS[name](**payload), robust=True)
+        return
+
+    run_after = timezone.now() + timezone.timedelta(seconds=delay)
+    transaction.on_commit(
+        lambda: _insert(name, payload, dedup_key, max_attempts, run_after)
+    )
+
+
+def claim():
+    """Reivindica o próximo job pronto para rodar, ou None se a fila está vazia."""
+    while True:
+        now = timezone.now()
+        job = (
+            Job.objects
+            .filter(status=Job.Status.QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+
+        claimed = Job.objects.filter(pk=job.pk, status=Job.Status.QUEUED).update(
+            status=Job.Status.RUNNING,
+            attempts=job.attempts + 1,
+            started_at=now,
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+        # Outro worker pegou o mesmo job; tenta o próximo.
+
+
+def _finish(job, **fields):
+    Job.objects.filter(pk=job.pk).update(finished_at=timezone.now(), **fields)
+
+
+def _retry(job, error):
+    delay = RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+    try:
+        with transaction.atomic():
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.Status.QUEUED,
+                run_after=timezone.now() + timezone.timedelta(seconds=delay),
+                last_error=error,
+            )
+    except IntegrityError:
+        # Um job novo com a mesma chave entrou na fila enquanto este rodava.
+        _finish(job, status=Job.Status.FAILED, last_error=error)
+
+
+def run_job(job):
+    """Executa um job já reivindicado e registra o resultado."""
+    func = TASKS.get(job.name)
+    try:
+        if func is None:
+            raise KeyError(f"Tarefa desconhecida: {job.name}")
+        func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception("Job %s (%s) falhou na tentativa %s", job.pk, job.name, job.attempts)
+        if func is not None and job.attempts < job.max_attempts:
+            _retry(job, error)
+        else:
+            _finish(job, status=Job.Status.FAILED, last_error=error)
+        return False
+
+    _finish(job, status=Job.Status.DONE, last_error="")
+    return True
+
+
+def requeue_stale(seconds):
+    """
+    Devolve à fila os jobs RUNNING há mais de `seconds` segundos (worker que
+    morreu no meio). Devolve quantos voltaram.
+    """
+    cutoff = timezone.now() - timezone.timedelta(seconds=seconds)
+    requeued = 0
+    for job in Job.objects.filter(status=Job.Status.RUNNING, started_at__lt=cutoff):
+        try:
+            with transaction.atomic():
+                requeued += Job.objects.filter(pk=job.pk, status=Job.Status.RUNNING).update(
+                    status=Job.Status.QUEUED,
+                )
+        except IntegrityError:
+            _finish(job, status=Job.Status.FAILED, last_error="Substituído por outro job na fila.")
+    return requeued
+
+
+def work(burst=False, poll_interval=1.0, max_jobs=None):
+    """
+    Processa jobs até a fila esvaziar (`burst`) ou indefinidamente,
+    consultando a fila a cada `poll_interval` segundos quando vazia.
+    Devolve o número de jobs executados.
+    """
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        close_old_connections()
+        job = claim()
+        if job is None:
+            if burst:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        processed += 1
+    return processed
@@ -0,0 +1,368 @@
+import json
+import subprocess
+from dataclasses import dataclass
+from statistics import mean
+from time import perf_counter
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.middleware import QueryTimer, percentiles, route_for
+from api.models import (
+    User, Group, GroupMembership, GroupRequest, Game, GameParticipation, PasswordResetToken,
+)
+from api.urls import router
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    path: str
+    actor: str = "owner"
+    data: Optional[object] = None
+    setup: Optional[Callable] = None
+    headers: Optional[dict] = None
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR, text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def router_routes():
+    """Todas as rotas `<basename>-<action>` registradas no router da API."""
+    routes = set()
+    for pattern in router.urls:
+        actions = getattr(pattern.callback, "actions", None)
+        basename = getattr(pattern.callback, "initkwargs", {}).get("basename")
+        if actions and basename:
+            routes.update(f"{basename}-{a.replace('_', '-')}" for a in actions.values())
+    return routes
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa todas as rotas de api/urls.py pelo test client contra o banco "
+        "atual (ver seed_poker_data) e reporta latência (p50/p95/p99) e queries. "
+        "Escritas rodam em savepoints desfeitos ao fim de cada iteração."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument("--group", help="Slug do grupo alvo (padrão: o com mais partidas).")
+        parser.add_argument("--only", nargs="*", help="Roda só os casos com esses nomes.")
+        parser.add_argument("--output", help="Grava o resultado em JSON nesse arquivo.")
+        parser.add_argument("--compare", help="JSON de uma execução anterior para comparar.")
+        parser.add_argument(
+            "--max-regression", type=float,
+            help="Falha se o p50 de algum caso piorar mais que essa porcentagem.",
+        )
+
+    def handle(self, *args, **options):
+        ctx = self.build_context(options["group"])
+        cases = self.build_cases(ctx)
+        if options["only"]:
+            cases = [case for case in cases if case.name in options["only"]]
+
+        # Erros 500 entram no relatório como status em vez de abortar a execução.
+        clients = {"anonymous": APIClient(raise_request_exception=False)}
+        for actor in ("owner", "member", "outsider", "staff"):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(ctx[actor])
+            clients[actor] = client
+
+        results = {}
+        covered = set()
+        with transaction.atomic():
+            for case in cases:
+                results[case.name] = self.run_case(case, clients, ctx, options)
+                covered.add(results[case.name]["route"])
+            transaction.set_rollback(True)
+
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "timestamp": timezone.now().isoformat(),
+                "vendor": connection.vendor,
+                "iterations": options["iterations"],
+                "group": ctx["group"].slug,
+                "dataset": {
+                    "users": User.objects.count(),
+                    "groups": Group.objects.count(),
+                    "games": Game.objects.count(),
+                    "participations": GameParticipation.objects.count(),
+                },
+            },
+            "results": results,
+        }
+
+        self.print_report(report)
+        uncovered = sorted(router_routes() - covered)
+        if uncovered and not options["only"]:
+            self.stdout.write(self.style.WARNING(f"Rotas sem caso: {', '.join(uncovered)}"))
+
+        if options["output"]:
+            with open(options["output"], "w") as fp:
+                json.dump(report, fp, indent=2)
+            self.stdout.write(f"Resultado gravado em {options['output']}")
+
+        if options["compare"]:
+            self.compare(report, options["compare"], options["max_regression"])
+
+    # ------------------------------------------------------------------
+    # Dados
+    # ------------------------------------------------------------------
+
+    def build_context(self, slug):
+        groups = Group.objects.select_related("created_by")
+        group = groups.filter(slug=slug).first() if slug else groups.order_by("-post_count").first()
+        if group is None:
+            raise CommandError("Nenhum grupo encontrado. Rode seed_poker_data antes.")
+
+        owner = group.created_by
+        member = (
+            User.objects
+            .filter(group_memberships__group=group)
+            .exclude(pk=owner.pk)
+            .first()
+        )
+        outsider = (
+            User.objects
+            .exclude(group_memberships__group=group)
+            .exclude(group_requests__group=group)
+            .first()
+        )
+        game = (
+            Game.objects
+            .filter(group=group, participations__player=member)
+            .order_by("-date", "-created_at")
+            .first()
+        )
+        if member is None or outsider is None or game is None:
+            raise CommandError(
+                f"O grupo '{group.slug}' precisa de outro membro, de um não membro e de "
+                "uma partida com participações."
+            )
+
+        staff = User.objects.filter(is_staff=True).first() or User(
+            username="benchmark-staff", email="benchmark-staff@example.com", is_staff=True
+        )
+
+        return {
+            "group": group,
+            "owner": owner,
+            "member": member,
+            "outsider": outsider,
+            "staff": staff,
+            "game": game,
+            "participation": game.participations.filter(player=member).first(),
+            "request": GroupRequest.objects.filter(group=group).first(),
+        }
+
+    def build_cases(self, ctx):
+        slug = ctx["group"].slug
+        game = ctx["game"].id
+        member = ctx["member"].id
+        participation = ctx["participation"].id
+        players = list(
+            GroupMembership.objects.filter(group=ctx["group"])
+            .values_list("user_id", flat=True)[:10]
+        )
+
+        def join_request(ctx):
+            request, _ = GroupRequest.objects.get_or_create(
+                group=ctx["group"], requested_by=ctx["outsider"]
+            )
+            return {"request": request.pk}
+
+        def reset_token(ctx):
+            PasswordResetToken.objects.filter(user=ctx["owner"]).delete()
+            PasswordResetToken.objects.create(user=ctx["owner"], token="benchmark-token")
+
+        def refresh_token(ctx):
+            return {"refresh": str(RefreshToken.for_user(ctx["owner"]))}
+
+        def current_etag(path):
+            def setup(ctx):
+                client = APIClient()
+                client.force_authenticate(ctx["owner"])
+                return {"etag": client.get(path)["ETag"]}
+            return setup
+
+        def not_modified(name, path):
+            return Case(name, "get", path, setup=current_etag(path), headers={"If-None-Match": "{etag}"})
+
+        return [
+            Case("groups-list", "get", "/api/groups/"),
+            Case("groups-list-search", "get", "/api/groups/?search=mesa"),
+            Case("groups-list-section", "get", "/api/groups/?section=otherGroups"),
+            Case("groups-create", "post", "/api/groups/", data={"name": "Benchmark", "description": "x"}),
+            not_modified("groups-list-304", "/api/groups/"),
+            Case("groups-retrieve", "get", f"/api/groups/{slug}/"),
+            not_modified("groups-retrieve-304", f"/api/groups/{slug}/"),
+            Case("groups-retrieve-light", "get", f"/api/groups/{slug}/?expand="),
+            Case("groups-partial-update", "patch", f"/api/groups/{slug}/", data={"description": "bench"}),
+            Case("groups-destroy", "delete", f"/api/groups/{slug}/"),
+            Case("groups-leaderboard", "get", f"/api/groups/{slug}/leaderboard/"),
+            Case("groups-bankroll", "get", f"/api/groups/{slug}/bankroll/"),
+            Case("groups-bankroll-points", "get", f"/api/groups/{slug}/bankroll/?points=100"),
+            Case("groups-settlement", "get", f"/api/groups/{slug}/settlement/?date_from=2025-01-01&date_to=2025-12-31"),
+            Case("groups-export-csv", "get", f"/api/groups/{slug}/export/?format=csv"),
+            Case("groups-export-ndjson", "get", f"/api/groups/{slug}/export/?format=ndjson"),
+            Case("groups-join-request", "post", f"/api/groups/{slug}/join_request/", actor="outsider"),
+            Case("groups-promote", "post", f"/api/groups/{slug}/promote/{member}/"),
+            Case("groups-demote", "post", f"/api/groups/{slug}/demote/{member}/"),
+            Case("groups-remove-member", "post", f"/api/groups/{slug}/remove/{member}/"),
+            Case("groups-leave", "post", f"/api/groups/{slug}/leave/", actor="member"),
+            Case("groups-leave-owner", "post", f"/api/groups/{slug}/leave/"),
+            Case("group-requests-list", "get", "/api/group-requests/"),
+            not_modified("group-requests-list-304", "/api/group-requests/"),
+            Case("group-requests-create", "post", "/api/group-requests/",
+                 actor="outsider", data={"group": ctx["group"].id}),
+            Case("group-requests-retrieve", "get", "/api/group-requests/{request}/", setup=join_request),
+            Case("group-requests-partial-update", "patch", "/api/group-requests/{request}/",
+                 data={}, setup=join_request),
+            Case("group-requests-accept", "post", "/api/group-requests/{request}/accept/", setup=join_request),
+            Case("group-requests-destroy", "delete", "/api/group-requests/{request}/", setup=join_request),
+            Case("games-list", "get", "/api/games/"),
+            not_modified("games-list-304", "/api/games/"),
+            Case("games-list-sparse", "get", "/api/games/?fields=id,title,date,buy_in,participations_count"),
+            Case("games-list-filtered", "get",
+                 f"/api/games/?group={ctx['group'].id}&player={member}&date_from=2000-01-01"),
+            Case("games-create", "post", "/api/games/",
+                 data={"title": "Bench", "buy_in": "20", "group_id": ctx["group"].id}),
+            Case("games-retrieve", "get", f"/api/games/{game}/"),
+            not_modified("games-retrieve-304", f"/api/games/{game}/"),
+            Case("games-partial-update", "patch", f"/api/games/{game}/",
+                 data={"buy_in": "30", "group_id": ctx["group"].id}),
+            Case("games-destroy", "delete", f"/api/games/{game}/"),
+            Case("games-delete", "delete", f"/api/games/{game}/delete/"),
+            Case("games-settlement", "get", f"/api/games/{game}/settlement/"),
+            Case("games-add-participation", "post", f"/api/games/{game}/add_participation/",
+                 data={"player_id": member, "final_balance": "10", "rebuy": "0"}),
+            Case("games-remove-participation", "post", f"/api/games/{game}/remove_participation/",
+                 data={"player_id": member}),
+            Case("games-bulk-participations", "post", f"/api/games/{game}/participations/bulk/",
+                 data=[{"player_id": p, "final_balance": "10"} for p in players]),
+            Case("participations-list", "get", "/api/participations/"),
+            Case("participations-create", "post", "/api/participations/",
+                 data={"player_id": member, "final_balance": "10"}),
+            Case("participations-retrieve", "get", f"/api/participations/{participation}/"),
+            Case("participations-partial-update", "patch", f"/api/participations/{participation}/",
+                 actor="member", data={"final_balance": "12"}),
+            Case("participations-destroy", "delete", f"/api/participations/{participation}/",
+                 actor="member"),
+            Case("players-stats", "get", f"/api/players/{member}/stats/"),
+            Case("auth-signup", "post", "/api/auth/signup/", actor="anonymous",
+                 data={"username": "bench-signup", "email": "bench-signup@example.com", "password": "x"}),
+            Case("auth-login", "post", "/api/auth/login/", actor="anonymous",
+                 data={"username": ctx["owner"].username, "password": "benchmark"}),
+            Case("auth-logout", "post", "/api/auth/logout/", data={"refresh": "{refresh}"},
+                 setup=refresh_token),
+            Case("auth-me", "get", "/api/auth/me/"),
+            Case("password-reset", "post", "/api/password_reset/", actor="anonymous",
+                 data={"email": ctx["owner"].email}),
+            Case("password-reset-confirm", "post", "/api/password_reset/confirm/", actor="anonymous",
+                 data={"token": "benchmark-token", "password": "benchmark"}, setup=reset_token),
+            Case("stats-requests", "get", "/api/stats/requests/", actor="staff"),
+        ]
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def run_case(self, case, clients, ctx, options):
+        client = clients[case.actor]
+        timings, query_counts, statuses = [], [], set()
+        route = None
+
+        for iteration in range(options["warmup"] + options["iterations"]):
+            with transaction.atomic():
+                values = (case.setup(ctx) if case.setup else None) or {}
+
+                path = case.path.format(**values)
+                data = case.data
+                if isinstance(data, dict):
+                    data = {k: v.format(**values) if isinstance(v, str) else v for k, v in data.items()}
+                headers = {k: v.format(**values) for k, v in (case.headers or {}).items()}
+
+                queries = QueryTimer()
+                with connection.execute_wrapper(queries):
+                    started = perf_counter()
+                    response = getattr(client, case.method)(path, data, format="json", headers=headers)
+                    if response.streaming:
+                        for _ in response.streaming_content:
+                            pass
+                    elapsed = (perf_counter() - started) * 1000
+
+                transaction.set_rollback(True)
+
+            if route is None:
+                route = route_for(resolve(path.split("?")[0]), case.method)
+            if iteration >= options["warmup"]:
+                timings.append(round(elapsed, 3))
+                query_counts.append(queries.count)
+                statuses.add(response.status_code)
+
+        return {
+            "route": route,
+            "method": case.method.upper(),
+            "path": path,
+            "status": sorted(statuses),
+            "wall_ms": {**percentiles(timings), "mean": round(mean(timings), 3)},
+            "queries": {"min": min(query_counts), "max": max(query_counts)},
+        }
+
+    # ------------------------------------------------------------------
+    # Relatórios
+    # ------------------------------------------------------------------
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{'caso':<32} {'status':<10} {'p50':>9} {'p95':>9} {'p99':>9} {'queries':>9}"
+        )
+        for name, result in report["results"].items():
+            wall = result["wall_ms"]
+            queries = result["queries"]
+            query_label = str(queries["max"]) if queries["min"] == queries["max"] \
+                else f"{queries['min']}-{queries['max']}"
+            self.stdout.write(
+                f"{name:<32} {','.join(map(str, result['status'])):<10} "
+                f"{wall['p50']:>9.2f} {wall['p95']:>9.2f} {wall['p99']:>9.2f} {query_label:>9}"
+            )
+
+    def compare(self, report, path, max_regression):
+        with open(path) as fp:
+            baseline = json.load(fp)
+
+        self.stdout.write(
+            f"\nComparação com {baseline['meta'].get('revision') or path}:\n"
+            f"{'caso':<32} {'p50 antes':>10} {'p50 agora':>10} {'Δ%':>8} {'queries':>12}"
+        )
+        regressions = []
+        for name, result in report["results"].items():
+            before = baseline["results"].get(name)
+            if before is None:
+                continue
+            old, new = before["wall_ms"]["p50"], result["wall_ms"]["p50"]
+            delta = (new - old) / old * 100 if old else 0.0
+            queries = f"{before['queries']['max']} -> {result['queries']['max']}"
+            self.stdout.write(f"{name:<32} {old:>10.2f} {new:>10.2f} {delta:>+8.1f} {queries:>12}")
+            if max_regression is not None and delta > max_regression:
+                regressions.append(name)
+
+        if regressions:
+            raise CommandError(f"Regressão acima de {max_regression}% em: {', '.join(regressions)}")
@@ -0,0 +1,92 @@
+from decimal import Decimal
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Game
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from api.serializers import DecimalField, GameSerializer
+
+
+def timed(func, iterations):
+    """Mediana em ms de `iterations` execuções e o último resultado."""
+    samples = []
+    for _ in range(iterations):
+        start = perf_counter()
+        result = func()
+        samples.append((perf_counter() - start) * 1000)
+    return median(samples), result
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o custo de serialização de uma lista grande de partidas (como "
+        "em /api/games/) com o JSONRenderer do DRF, o FastJSONRenderer "
+        "(orjson) e o MessagePackRenderer, e o DecimalField do DRF contra o "
+        "de api/serializers.py. Reporta mediana em ms e tamanho em bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--games", type=int, default=1000, help="Quantas partidas serializar.")
+        parser.add_argument("--iterations", type=int, default=10)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        games = list(GameSerializer.setup_eager_loading(Game.objects.order_by("-date", "-id"))[
+            :options["games"]
+        ])
+        if not games:
+            raise CommandError("Nenhuma partida no banco. Rode seed_poker_data antes.")
+        self.stdout.write(
+            f"{len(games)} partidas, mediana de {iterations} execuções "
+            f"(orjson: {'sim' if orjson else 'não'}, msgpack: {'sim' if msgpack else 'não'})."
+        )
+
+        request = Request(APIRequestFactory().get("/api/games/"))
+        request.user = games[0].created_by
+        context = {"request": request}
+        ms, data = timed(lambda: GameSerializer(games, many=True, context=context).data, iterations)
+        self.report("serializer", ms)
+
+        renderers = [("json (DRF)", JSONRenderer()), ("json (rápido)", FastJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(("msgpack", MessagePackRenderer()))
+        baseline = None
+        for label, renderer in renderers:
+            ms, body = timed(lambda: renderer.render(data), iterations)
+            baseline = baseline or ms
+            self.report(label, ms, baseline, size=len(body))
+
+        self.stdout.write("")
+        values = [game.buy_in for game in games] + [game.pot_total for game in games]
+        values += [
+            value for game in games for p in game.participations.all()
+            for value in (p.rebuy, p.final_balance)
+        ]
+        drf_field = serializers.DecimalField(max_digits=12, decimal_places=2)
+        fast_field = DecimalField(max_digits=12, decimal_places=2)
+        mismatches = sum(
+            drf_field.to_representation(value) != fast_field.to_representation(value)
+            for value in values if isinstance(value, Decimal)
+        )
+        if mismatches:
+            raise CommandError(f"{mismatches} valores Decimal saíram diferentes nos dois campos.")
+
+        baseline = None
+        for label, field in [("Decimal (DRF)", drf_field), ("Decimal (rápido)", fast_field)]:
+            ms, _ = timed(lambda: [field.to_representation(value) for value in values], iterations)
+            baseline = baseline or ms
+            self.report(f"{label} x{len(values)}", ms, baseline)
+
+    def report(self, label, ms, baseline=None, size=None):
+        line = f"{label:<24} {ms:9.2f} ms"
+        if baseline:
+            line += f"  ({(baseline - ms) / baseline:+.0%} de tempo economizado)"
+        if size is not None:
+            line += f"  {size} bytes"
+        self.stdout.write(line)
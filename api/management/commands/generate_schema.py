@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from pokerdex_back.schema import write
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera o schema OpenAPI (swagger.json e swagger.yaml) em "
+        "OPENAPI_SCHEMA_DIR. Rode a cada deploy: os processos servem os "
+        "arquivos da memória e não regeneram o schema (ver pokerdex_back/schema.py)."
+    )
+
+    def handle(self, *args, **options):
+        for path in write():
+            self.stdout.write(f"{path} ({path.stat().st_size} bytes)")
+        self.stdout.write(self.style.SUCCESS("Schema OpenAPI gerado."))
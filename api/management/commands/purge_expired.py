@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.tasks import purge_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove tokens de redefinição de senha, convites de grupo e revogações "
+        "de JWT vencidos, em lotes curtos para não segurar locks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Linhas removidas por transação.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(batch_size=options["batch_size"])
+        for table, count in deleted.items():
+            self.stdout.write(f"{table}: {count} removidos.")
+        self.stdout.write(self.style.SUCCESS(f"Total: {sum(deleted.values())} linhas removidas."))
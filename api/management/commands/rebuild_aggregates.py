@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.aggregates import (
+    rebuild_leaderboard, rebuild_player_stats, recount_games, recount_groups,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstrói os agregados materializados (placar dos grupos, estatísticas "
+        "de carreira e contadores dos grupos e partidas) a partir das tabelas base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only", choices=["leaderboard", "players", "groups", "games"], action="append",
+            help="Reconstrói apenas os agregados informados (pode repetir).",
+        )
+        parser.add_argument(
+            "--player", type=int, action="append", dest="players",
+            help="Limita as estatísticas de carreira a estes jogadores (pode repetir).",
+        )
+
+    def handle(self, *args, **options):
+        only = set(options["only"] or ["leaderboard", "players", "groups", "games"])
+
+        with transaction.atomic():
+            if "leaderboard" in only:
+                count = rebuild_leaderboard()
+                self.stdout.write(f"Placar: {count} linhas.")
+            if "players" in only:
+                count = rebuild_player_stats(options["players"])
+                self.stdout.write(f"Estatísticas de carreira: {count} jogadores.")
+            if "groups" in only:
+                count = recount_groups()
+                self.stdout.write(f"Contadores: {count} grupos.")
+            if "games" in only:
+                count = recount_games()
+                self.stdout.write(f"Contadores: {count} partidas.")
+
+        self.stdout.write(self.style.SUCCESS("Agregados reconstruídos."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.aggregates import recount_games, recount_groups
+from api.models import Game
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula os contadores desnormalizados de grupos (membros, posts, "
+        "partidas) e de partidas (participantes, total da mesa) a partir das "
+        "tabelas base. Use para reparar contadores fora de sincronia."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--group", type=int, action="append", dest="groups",
+            help="Recalcula apenas este grupo e suas partidas (pode repetir).",
+        )
+
+    def handle(self, *args, **options):
+        group_ids = options["groups"]
+        game_ids = None
+        if group_ids is not None:
+            game_ids = Game.objects.filter(group_id__in=group_ids).values("id")
+
+        with transaction.atomic():
+            games = recount_games(game_ids)
+            groups = recount_groups(group_ids)
+
+        self.stdout.write(f"Partidas: {games}. Grupos: {groups}.")
+        self.stdout.write(self.style.SUCCESS("Contadores recalculados."))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from api.jobs import requeue_stale, work
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker da fila de jobs: executa as tarefas enfileiradas (rebuild de "
+        "agregados, remoção de grupos, limpeza de tokens vencidos)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst", action="store_true",
+            help="Sai quando a fila esvaziar, em vez de continuar esperando.",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0,
+            help="Segundos entre consultas à fila quando ela está vazia.",
+        )
+        parser.add_argument(
+            "--max-jobs", type=int,
+            help="Sai depois de executar este número de jobs.",
+        )
+        parser.add_argument(
+            "--stale-after", type=int, default=3600,
+            help="Devolve à fila jobs em execução há mais de N segundos (0 desliga).",
+        )
+
+    def handle(self, *args, **options):
+        if options["stale_after"]:
+            requeued = requeue_stale(options["stale_after"])
+            if requeued:
+                self.stdout.write(f"{requeued} jobs interrompidos voltaram para a fila.")
+
+        processed = work(
+            burst=options["burst"],
+            poll_interval=options["poll_interval"],
+            max_jobs=options["max_jobs"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{processed} jobs executados."))
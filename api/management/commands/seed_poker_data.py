@@ -0,0 +1,216 @@
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from api.aggregates import rebuild_all
+from api.models import (
+    User, Group, GroupMembership, GroupRequest,
+    Game, GamePost, GameParticipation,
+)
+
+CENTS = Decimal("0.01")
+BUY_INS = [Decimal("10"), Decimal("20"), Decimal("50"), Decimal("100")]
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera um conjunto sintético e reprodutível de usuários, grupos (com "
+        "tamanhos assimétricos), partidas e participações para benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument("--groups", type=int, default=30)
+        parser.add_argument("--years", type=int, default=3)
+        parser.add_argument(
+            "--games-per-month", type=float, default=4,
+            help="Média de partidas por mês em um grupo de atividade típica.",
+        )
+        parser.add_argument("--min-players", type=int, default=4)
+        parser.add_argument("--max-players", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--end-date", type=datetime.date.fromisoformat, default=datetime.date(2025, 12, 31),
+            help="Data da partida mais recente (fixa para manter o resultado reprodutível).",
+        )
+        parser.add_argument(
+            "--prefix", default="bench",
+            help="Prefixo de usernames e nomes de grupo, para não colidir com dados reais.",
+        )
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(
+                f"Já existem dados com o prefixo '{options['prefix']}'. Use outro --prefix."
+            )
+        if options["users"] < options["min_players"]:
+            raise CommandError("--users precisa ser maior que --min-players.")
+
+        self.rng = random.Random(options["seed"])
+        self.options = options
+
+        with transaction.atomic():
+            users = self.create_users()
+            groups, members = self.create_groups(users)
+            self.create_requests(groups, members, users)
+            games = self.create_games(groups, members)
+            participations = self.create_participations(games, members)
+            rebuilt = rebuild_all()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(users)} usuários, {len(groups)} grupos, "
+            f"{sum(len(m) for m in members.values())} membros, {len(games)} partidas, "
+            f"{participations} participações. Agregados: {rebuilt}."
+        ))
+
+    def create_users(self):
+        prefix = self.options["prefix"]
+        password = make_password("benchmark")
+        users = [
+            User(
+                username=f"{prefix}_player{i:05d}",
+                email=f"{prefix}_player{i:05d}@example.com",
+                password=password,
+            )
+            for i in range(self.options["users"])
+        ]
+        return User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+    def group_size(self):
+        # Pareto: a maioria dos grupos é pequena, alguns são enormes.
+        size = int(self.options["min_players"] * self.rng.paretovariate(1.16))
+        return max(self.options["min_players"], min(size, len(self.users)))
+
+    def create_groups(self, users):
+        self.users = users
+        prefix = self.options["prefix"]
+        now = timezone.now()
+
+        sizes = [self.group_size() for _ in range(self.options["groups"])]
+        picked = [self.rng.sample(users, size) for size in sizes]
+
+        groups = Group.objects.bulk_create([
+            Group(
+                name=f"{prefix} Mesa {i:04d}",
+                slug=slugify(f"{prefix} Mesa {i:04d}"),
+                description=self.rng.choice([
+                    "Texas hold'em às sextas",
+                    "Pôquer entre amigos",
+                    "Torneio mensal da firma",
+                    "",
+                ]),
+                created_by=group_members[0],
+                created_at=now,
+            )
+            for i, group_members in enumerate(picked)
+        ], batch_size=BATCH_SIZE)
+
+        members = {}
+        memberships = []
+        for group, group_members in zip(groups, picked):
+            members[group.id] = group_members
+            for position, user in enumerate(group_members):
+                if position == 0:
+                    role = GroupMembership.Role.OWNER
+                elif self.rng.random() < 0.1:
+                    role = GroupMembership.Role.ADMIN
+                else:
+                    role = GroupMembership.Role.MEMBER
+                memberships.append(GroupMembership(user=user, group=group, role=role))
+        GroupMembership.objects.bulk_create(memberships, batch_size=BATCH_SIZE)
+
+        return groups, members
+
+    def create_requests(self, groups, members, users):
+        requests = []
+        for group in groups:
+            member_ids = {user.id for user in members[group.id]}
+            for user in self.rng.sample(users, min(3, len(users))):
+                if user.id not in member_ids:
+                    requests.append(GroupRequest(group=group, requested_by=user))
+        GroupRequest.objects.bulk_create(requests, batch_size=BATCH_SIZE)
+
+    def create_games(self, groups, members):
+        end = self.options["end_date"]
+        days = 365 * self.options["years"]
+        months = 12 * self.options["years"]
+
+        games = []
+        for group in groups:
+            activity = self.rng.uniform(0.3, 1.5)
+            for _ in range(int(self.options["games_per_month"] * months * activity)):
+                date = end - datetime.timedelta(days=self.rng.randrange(days))
+                created_at = timezone.make_aware(
+                    datetime.datetime.combine(date, datetime.time(20, self.rng.randrange(60)))
+                )
+                games.append(Game(
+                    title=f"Noite {date:%d/%m/%Y}",
+                    date=date,
+                    location=self.rng.choice(["Casa do Zé", "Clube", "Bar do Léo", ""]),
+                    buy_in=self.rng.choice(BUY_INS),
+                    created_by=self.rng.choice(members[group.id]),
+                    created_at=created_at,
+                    group=group,
+                ))
+
+        games = Game.objects.bulk_create(games, batch_size=BATCH_SIZE)
+        GamePost.objects.bulk_create(
+            [
+                GamePost(game=game, group_id=game.group_id, posted_by_id=game.created_by_id,
+                         posted_at=game.created_at)
+                for game in games
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        return games
+
+    def create_participations(self, games, members):
+        total = 0
+        batch = []
+        for game in games:
+            group_members = members[game.group_id]
+            size = self.rng.randint(self.options["min_players"], self.options["max_players"])
+            players = self.rng.sample(group_members, min(size, len(group_members)))
+            batch.extend(self.play(game, players))
+
+            if len(batch) >= BATCH_SIZE:
+                total += len(GameParticipation.objects.bulk_create(batch))
+                batch = []
+
+        total += len(GameParticipation.objects.bulk_create(batch))
+        return total
+
+    def play(self, game, players):
+        """Distribui o pote entre os jogadores (soma zero, stacks >= 0)."""
+        rebuys = [
+            Decimal("0") if self.rng.random() < 0.6
+            else game.buy_in * self.rng.randint(1, 3) / 2
+            for _ in players
+        ]
+        pot = game.buy_in * len(players) + sum(rebuys)
+
+        weights = [self.rng.gammavariate(0.6, 1.0) for _ in players]
+        scale = sum(weights)
+        balances = [(pot * Decimal(w / scale)).quantize(CENTS) for w in weights]
+        balances[-1] += pot - sum(balances)
+        if balances[-1] < 0:
+            balances[0] += balances[-1]
+            balances[-1] = Decimal("0.00")
+
+        return [
+            GameParticipation(
+                game=game,
+                player=player,
+                rebuy=rebuy.quantize(CENTS),
+                final_balance=balance,
+                created_at=game.created_at,
+            )
+            for player, rebuy, balance in zip(players, rebuys, balances)
+        ]
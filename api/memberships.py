@@ -0,0 +1,106 @@
+"""
+Resolução de papéis do usuário autenticado nos grupos.
+
+O mapa {group_id: role} do usuário é carregado uma única vez por request
+e compartilhado por permissões, serializers e views. Opcionalmente o mapa
+também fica no cache do Django por MEMBERSHIP_CACHE_TIMEOUT segundos;
+toda view que altera memberships chama `invalidate_memberships`.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import GroupMembership
+
+CACHE_KEY = "memberships:{user_id}"
+
+
+def cache_timeout():
+    return getattr(settings, "MEMBERSHIP_CACHE_TIMEOUT", 0)
+
+
+class MembershipResolver:
+    def __init__(self, user):
+        self.user = user
+        self._roles = None
+
+    @property
+    def roles(self):
+        if self._roles is None:
+            self._roles = self._load()
+        return self._roles
+
+    def _query(self):
+        return GroupMembership.objects.filter(user_id=self.user.id).values_list("group_id", "role")
+
+    def _load(self):
+        if not self.user.is_authenticated:
+            return {}
+
+        timeout = cache_timeout()
+        key = CACHE_KEY.format(user_id=self.user.id)
+        if timeout:
+            roles = cache.get(key)
+            if roles is not None:
+                return roles
+
+        roles = dict(self._query())
+
+        if timeout:
+            cache.set(key, roles, timeout)
+        return roles
+
+    async def aload(self):
+        """
+        Carrega o mapa com o ORM assíncrono. Views async chamam isto antes
+        de usar permissões/serializers, que depois só leem `roles`.
+        """
+        if self._roles is not None or not self.user.is_authenticated:
+            return self.roles
+
+        timeout = cache_timeout()
+        key = CACHE_KEY.format(user_id=self.user.id)
+        roles = await cache.aget(key) if timeout else None
+        if roles is None:
+            roles = {group_id: role async for group_id, role in self._query()}
+            if timeout:
+                await cache.aset(key, roles, timeout)
+
+        self._roles = roles
+        return roles
+
+    def reset(self):
+        self._roles = None
+
+    def role(self, group_id):
+        return self.roles.get(group_id)
+
+    def is_member(self, group_id):
+        return group_id in self.roles
+
+    def has_role(self, group_id, *roles):
+        return self.role(group_id) in roles
+
+
+def memberships(request):
+    """Resolver do usuário da request, criado no primeiro acesso."""
+    resolver = getattr(request, "_memberships", None)
+    if resolver is None:
+        resolver = MembershipResolver(request.user)
+        request._memberships = resolver
+    return resolver
+
+
+def invalidate_memberships(user_ids, request=None):
+    """
+    Descarta o mapa em cache dos usuários afetados após o commit da
+    transação atual (e o mapa da própria request, se informada).
+    """
+    if request is not None:
+        memberships(request).reset()
+
+    if not cache_timeout():
+        return
+
+    keys = [CACHE_KEY.format(user_id=user_id) for user_id in set(user_ids)]
+    transaction.on_commit(lambda: cache.delete_many(keys))
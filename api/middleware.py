@@ -0,0 +1,207 @@
+"""
+Instrumentação opcional por rota: número de queries, tempo de SQL, tempo
+dos serializers, tempo do renderer e tempo total de cada request.
+
+"serialize" é o tempo gasto em `to_representation` dos serializers de
+api/serializers.py (montar `serializer.data`); "render" é só o tempo do
+renderer (JSON/msgpack) transformando esses dados em bytes. Queries
+disparadas durante a serialização também entram em "db".
+
+Ative com REQUEST_STATS=1 (ver settings). As amostras ficam em memória,
+por processo, numa janela deslizante por rota; o resumo com p50/p95/p99
+sai em GET /api/stats/requests/ (só staff).
+"""
+import functools
+import logging
+import threading
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("wall", "db", "serialize", "render", "queries")
+
+
+class RouteStats:
+    def __init__(self, window):
+        self.count = 0
+        self.over_budget = 0
+        self.samples = {metric: deque(maxlen=window) for metric in METRICS}
+
+    def add(self, sample, over_budget):
+        self.count += 1
+        self.over_budget += over_budget
+        for metric in METRICS:
+            self.samples[metric].append(sample[metric])
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "over_budget": self.over_budget,
+            **{
+                metric: percentiles(self.samples[metric])
+                for metric in METRICS
+            },
+        }
+
+
+def percentiles(values, points=(50, 95, 99)):
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        f"p{point}": ordered[min(len(ordered) - 1, (len(ordered) * point - 1) // 100)]
+        for point in points
+    }
+
+
+class StatsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, sample, over_budget):
+        window = getattr(settings, "REQUEST_STATS_WINDOW", 1000)
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = RouteStats(window)
+            stats.add(sample, over_budget)
+
+    def summary(self):
+        with self._lock:
+            return {route: stats.summary() for route, stats in sorted(self._routes.items())}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+registry = StatsRegistry()
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.elapsed += perf_counter() - started
+
+
+class SerializeTimer:
+    def __init__(self):
+        self.elapsed = 0.0
+        self.active = False
+
+
+_serialize_timer = ContextVar("serialize_timer", default=None)
+
+
+def timed_serialization(to_representation):
+    """
+    Soma o tempo de `to_representation` ao request instrumentado. Só o
+    serializer mais externo conta: os aninhados já estão dentro dele.
+    """
+    @functools.wraps(to_representation)
+    def wrapper(self, instance):
+        timer = _serialize_timer.get()
+        if timer is None or timer.active:
+            return to_representation(self, instance)
+        timer.active = True
+        started = perf_counter()
+        try:
+            return to_representation(self, instance)
+        finally:
+            timer.active = False
+            timer.elapsed += perf_counter() - started
+
+    return wrapper
+
+
+def route_name(request):
+    """
+    Nome da rota resolvida. Para viewsets do DRF usa `<basename>-<action>`,
+    separando por exemplo `games-list` de `games-create` na mesma URL.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return route_for(match, request.method)
+
+
+def route_for(match, method):
+    actions = getattr(match.func, "actions", None) or {}
+    basename = getattr(match.func, "initkwargs", {}).get("basename")
+    action = actions.get(method.lower())
+    if basename and action:
+        return f"{basename}-{action.replace('_', '-')}"
+    return match.view_name
+
+
+class RequestStatsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        serialize_timer = SerializeTimer()
+        request._stats_render_time = 0.0
+
+        token = _serialize_timer.set(serialize_timer)
+        started = perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            _serialize_timer.reset(token)
+        wall = perf_counter() - started
+
+        sample = {
+            "wall": round(wall * 1000, 2),
+            "db": round(timer.elapsed * 1000, 2),
+            "serialize": round(serialize_timer.elapsed * 1000, 2),
+            "render": round(request._stats_render_time * 1000, 2),
+            "queries": timer.count,
+        }
+
+        route = route_name(request)
+        budget = getattr(settings, "QUERY_BUDGET", 0)
+        over_budget = bool(budget) and timer.count > budget
+        if over_budget:
+            logger.warning(
+                "Query budget exceeded on %s: %d queries (budget %d) for %s %s",
+                route, timer.count, budget, request.method, request.path,
+            )
+
+        registry.record(route, sample, over_budget)
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={sample["db"]};desc="{timer.count} queries"',
+            f'serialize;dur={sample["serialize"]}',
+            f'render;dur={sample["render"]}',
+            f'total;dur={sample["wall"]}',
+        ])
+        return response
+
+    def process_template_response(self, request, response):
+        # Só o renderer: os dados do Response já foram serializados na view.
+        started = perf_counter()
+
+        def rendered(response):
+            request._stats_render_time = perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
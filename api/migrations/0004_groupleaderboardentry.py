@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:47
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, Min, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_leaderboard(apps, schema_editor):
+    GameParticipation = apps.get_model("api", "GameParticipation")
+    GroupLeaderboardEntry = apps.get_model("api", "GroupLeaderboardEntry")
+
+    zero = Value(Decimal("0.00"))
+    net = ExpressionWrapper(
+        F("final_balance") - F("game__buy_in") - Coalesce(F("rebuy"), zero),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    rows = (
+        GameParticipation.objects
+        .values("game__group_id", "player_id")
+        .annotate(
+            games_played=Count("id"),
+            total_buy_in=Sum("game__buy_in"),
+            total_rebuy=Sum(Coalesce(F("rebuy"), zero)),
+            net_result=Sum(net),
+            best_night=Max(net),
+            worst_night=Min(net),
+        )
+        .order_by()
+    )
+    GroupLeaderboardEntry.objects.bulk_create([
+        GroupLeaderboardEntry(
+            group_id=row["game__group_id"],
+            player_id=row["player_id"],
+            net_result=row["net_result"],
+            games_played=row["games_played"],
+            total_buy_in=row["total_buy_in"],
+            total_rebuy=row["total_rebuy"],
+            best_night=row["best_night"],
+            worst_night=row["worst_night"],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_passwordresettoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupLeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('net_result', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('games_played', models.PositiveIntegerField(default=0)),
+                ('total_buy_in', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_rebuy', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('best_night', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('worst_night', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='api.group')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-net_result'],
+                'indexes': [models.Index(fields=['group', '-net_result'], name='api_grouple_group_i_9f34ec_idx')],
+                'unique_together': {('group', 'player')},
+            },
+        ),
+        migrations.RunPython(backfill_leaderboard, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_groupleaderboardentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-date', '-created_at', '-id'], name='api_game_date_ade7ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['group', '-date', '-created_at', '-id'], name='api_game_group_i_1f93e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameparticipation',
+            index=models.Index(fields=['player', 'game'], name='api_gamepar_player__d28cd5_idx'),
+        ),
+    ]
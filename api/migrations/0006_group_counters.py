@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:49
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Group = apps.get_model("api", "Group")
+    GroupMembership = apps.get_model("api", "GroupMembership")
+    GamePost = apps.get_model("api", "GamePost")
+
+    def per_group(model, aggregate):
+        return Subquery(
+            model.objects.filter(group_id=OuterRef("pk"))
+            .values("group_id")
+            .annotate(value=aggregate)
+            .values("value")[:1]
+        )
+
+    Group.objects.update(
+        member_count=Coalesce(per_group(GroupMembership, Count("id")), 0),
+        post_count=Coalesce(per_group(GamePost, Count("id")), 0),
+        last_post_at=per_group(GamePost, Max("posted_at")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_game_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='last_post_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
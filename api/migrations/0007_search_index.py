@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:02
+
+from django.db import migrations
+
+from api import search
+
+
+def install_search_index(apps, schema_editor):
+    search.install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_group_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+    ]
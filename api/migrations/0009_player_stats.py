@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_player_stats(apps, schema_editor):
+    GameParticipation = apps.get_model("api", "GameParticipation")
+    PlayerStats = apps.get_model("api", "PlayerStats")
+    PlayerMonthlyStats = apps.get_model("api", "PlayerMonthlyStats")
+
+    rows = (
+        GameParticipation.objects
+        .order_by("player_id", "game__date", "game__created_at", "game_id")
+        .values_list("player_id", "game__date", "game__buy_in", "rebuy", "final_balance")
+        .iterator(chunk_size=2000)
+    )
+
+    stats, monthly = [], []
+    current = month = None
+    for player_id, date, buy_in, rebuy, final_balance in rows:
+        rebuy = rebuy or 0
+        net = final_balance - buy_in - rebuy
+        won = net > 0
+
+        if current is None or current.player_id != player_id:
+            current = PlayerStats(
+                player_id=player_id, first_game_on=date, best_night=net, worst_night=net,
+            )
+            stats.append(current)
+            month = None
+
+        current.games_played += 1
+        current.wins += won
+        current.total_buy_in += buy_in
+        current.total_rebuy += rebuy
+        current.net_result += net
+        current.best_night = max(current.best_night, net)
+        current.worst_night = min(current.worst_night, net)
+        current.current_win_streak = current.current_win_streak + 1 if won else 0
+        current.longest_win_streak = max(current.longest_win_streak, current.current_win_streak)
+        current.last_game_on = date
+
+        if month is None or month.month != date.replace(day=1):
+            month = PlayerMonthlyStats(player_id=player_id, month=date.replace(day=1))
+            monthly.append(month)
+        month.games_played += 1
+        month.wins += won
+        month.total_buy_in += buy_in
+        month.total_rebuy += rebuy
+        month.net_result += net
+
+    PlayerStats.objects.bulk_create(stats, batch_size=2000)
+    PlayerMonthlyStats.objects.bulk_create(monthly, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_group_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerStats',
+            fields=[
+                ('player', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('games_played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('total_buy_in', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_rebuy', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('net_result', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('best_night', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('worst_night', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('longest_win_streak', models.PositiveIntegerField(default=0)),
+                ('current_win_streak', models.PositiveIntegerField(default=0)),
+                ('first_game_on', models.DateField(blank=True, null=True)),
+                ('last_game_on', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlayerMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('games_played', models.PositiveIntegerField(default=0)),
+                ('wins', models.PositiveIntegerField(default=0)),
+                ('total_buy_in', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_rebuy', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('net_result', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['player', 'month'],
+                'unique_together': {('player', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_player_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:20
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Group = apps.get_model("api", "Group")
+    Game = apps.get_model("api", "Game")
+    GameParticipation = apps.get_model("api", "GameParticipation")
+
+    def per_row(model, key, aggregate):
+        return Subquery(
+            model.objects.filter(**{key: OuterRef("pk")})
+            .values(key)
+            .annotate(value=aggregate)
+            .values("value")[:1]
+        )
+
+    zero = Value(Decimal("0.00"))
+    stake = ExpressionWrapper(
+        F("game__buy_in") + Coalesce(F("rebuy"), zero),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    Game.objects.update(
+        participant_count=Coalesce(per_row(GameParticipation, "game_id", Count("id")), 0),
+        pot_total=Coalesce(per_row(GameParticipation, "game_id", Sum(stake)), zero),
+    )
+    Group.objects.update(
+        game_count=Coalesce(per_row(Game, "group_id", Count("id")), 0),
+        last_game_at=per_row(Game, "group_id", Max("date")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_revoked_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='participant_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='pot_total',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='game_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='last_game_at',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_game_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('dedup_key', models.CharField(blank=True, max_length=200, null=True)),
+                ('status', models.CharField(choices=[('QUEUED', 'Na fila'), ('RUNNING', 'Executando'), ('DONE', 'Concluído'), ('FAILED', 'Falhou')], default='QUEUED', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3)),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'run_after', 'id'], name='api_job_status_44c3ec_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'QUEUED')), fields=('dedup_key',), name='job_unique_queued_dedup_key')],
+            },
+        ),
+    ]
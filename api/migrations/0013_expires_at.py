@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:28
+
+from datetime import timedelta
+
+import api.models
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_expiry(apps, schema_editor):
+    PasswordResetToken = apps.get_model("api", "PasswordResetToken")
+    GroupInvite = apps.get_model("api", "GroupInvite")
+
+    PasswordResetToken.objects.update(expires_at=F("created_at") + timedelta(hours=1))
+    GroupInvite.objects.update(expires_at=F("created_at") + timedelta(days=7))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='groupinvite',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=api.models.group_invite_expiry),
+        ),
+        migrations.AddField(
+            model_name='passwordresettoken',
+            name='expires_at',
+            field=models.DateTimeField(db_index=True, default=api.models.password_reset_expiry),
+        ),
+        migrations.RunPython(backfill_expiry, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_expires_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='changed_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+    ]
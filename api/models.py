@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator
@@ -9,13 +11,42 @@ from django.utils.text import slugify
 class User(AbstractUser):
     email = models.EmailField(unique=True)
 
+def password_reset_expiry():
+    return timezone.now() + PasswordResetToken.LIFETIME
+
+
+class ExpiringQuerySet(models.QuerySet):
+    def valid(self):
+        return self.filter(expires_at__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires_at__lte=timezone.now())
+
+
 class PasswordResetToken(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     token = models.CharField(max_length=64, unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(default=password_reset_expiry, db_index=True)
+
+    LIFETIME = timezone.timedelta(hours=1)
+
+    objects = ExpiringQuerySet.as_manager()
 
     def is_valid(self):
-        return self.created_at >= timezone.now() - timezone.timedelta(hours=1)
+        return self.expires_at > timezone.now()
+
+class RevokedToken(models.Model):
+    """
+    JWT revogado no logout (pelo jti), guardado até expirar.
+    A verificação por request usa o índice em memória de api/authentication.py.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.jti
 
 class Group(models.Model):
     """
@@ -32,6 +63,19 @@ class Group(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
 
+    # Contadores desnormalizados, mantidos em api/aggregates.py.
+    member_count = models.PositiveIntegerField(default=0)
+    post_count = models.PositiveIntegerField(default=0)
+    last_post_at = models.DateTimeField(null=True, blank=True)
+    game_count = models.PositiveIntegerField(default=0)
+    # Data da partida mais recente do grupo.
+    last_game_at = models.DateField(null=True, blank=True)
+    # Incrementada por qualquer escrita que afete o grupo (partidas,
+    # participações, membros, pedidos); versiona o cache do detalhe e,
+    # junto com changed_at, os ETags/Last-Modified (api/conditional.py).
+    version = models.PositiveBigIntegerField(default=1)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
     class Meta:
         ordering = ["name"]
 
@@ -88,6 +132,15 @@ class GroupMembership(models.Model):
         return f"{self.user} @ {self.group} ({self.role})"
 
 
+def group_invite_expiry():
+    return timezone.now() + GroupInvite.LIFETIME
+
+
+class GroupInviteQuerySet(ExpiringQuerySet):
+    def valid(self):
+        return super().valid().filter(accepted_at__isnull=True, revoked_at__isnull=True)
+
+
 class GroupInvite(models.Model):
     """
     Convite para participar de um grupo.
@@ -115,6 +168,13 @@ class GroupInvite(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     accepted_at = models.DateTimeField(null=True, blank=True)
     revoked_at = models.DateTimeField(null=True, blank=True)
+    # Depois desta data o convite não vale mais, aceito ou não, e pode ser
+    # removido pela limpeza (manage.py purge_expired).
+    expires_at = models.DateTimeField(default=group_invite_expiry, db_index=True)
+
+    LIFETIME = timezone.timedelta(days=7)
+
+    objects = GroupInviteQuerySet.as_manager()
 
     class Meta:
         indexes = [
@@ -182,8 +242,17 @@ class Game(models.Model):
         related_name="games"
     )
 
+    # Contadores desnormalizados, mantidos em api/aggregates.py.
+    participant_count = models.PositiveIntegerField(default=0)
+    # Total comprado na mesa: buy-in de cada participante mais os rebuys.
+    pot_total = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal("0.00"))
+
     class Meta:
         ordering = ["-date", "-created_at"]
+        indexes = [
+            models.Index(fields=["-date", "-created_at", "-id"]),
+            models.Index(fields=["group", "-date", "-created_at", "-id"]),
+        ]
 
     def __str__(self):
         label = self.title or f"Partida em {self.date.strftime('%d/%m/%Y')}"
@@ -258,7 +327,156 @@ class GameParticipation(models.Model):
         indexes = [
             models.Index(fields=["game"]),
             models.Index(fields=["player"]),
+            models.Index(fields=["player", "game"]),
         ]
 
     def __str__(self):
         return f"{self.player} in {self.game} -> {self.final_balance}"
+
+
+class GroupLeaderboardEntry(models.Model):
+    """
+    Agregado materializado do desempenho de um jogador dentro de um grupo.
+    Mantido em api/aggregates.py a cada escrita de participação ou partida.
+    'net_result' = soma de (final_balance - buy_in - rebuy) nas partidas do grupo.
+    """
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries"
+    )
+    player = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_entries"
+    )
+    net_result = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    games_played = models.PositiveIntegerField(default=0)
+    total_buy_in = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_rebuy = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    best_night = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    worst_night = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("group", "player")
+        ordering = ["-net_result"]
+        indexes = [
+            models.Index(fields=["group", "-net_result"]),
+        ]
+
+    def __str__(self):
+        return f"{self.player} @ {self.group}: {self.net_result}"
+
+
+class PlayerStats(models.Model):
+    """
+    Agregado materializado da carreira de um jogador, somando todos os grupos.
+    Atualizado em api/aggregates.py a cada escrita nas participações do jogador
+    (deltas; ver `player_stats_changed`).
+    Uma partida é vitória quando o resultado líquido é positivo.
+    """
+    player = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats"
+    )
+    games_played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    total_buy_in = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_rebuy = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net_result = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    best_night = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    worst_night = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    longest_win_streak = models.PositiveIntegerField(default=0)
+    current_win_streak = models.PositiveIntegerField(default=0)
+    first_game_on = models.DateField(null=True, blank=True)
+    last_game_on = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.player}: {self.net_result}"
+
+    @property
+    def roi(self):
+        invested = self.total_buy_in + self.total_rebuy
+        if not invested:
+            return None
+        return round(Decimal(self.net_result) / invested, 4)
+
+    @property
+    def win_rate(self):
+        if not self.games_played:
+            return None
+        return round(Decimal(self.wins) / self.games_played, 4)
+
+    @property
+    def average_rebuy(self):
+        if not self.games_played:
+            return None
+        return round(Decimal(self.total_rebuy) / self.games_played, 2)
+
+
+class PlayerMonthlyStats(models.Model):
+    """
+    Rollup mensal da carreira de um jogador. 'month' é o primeiro dia do mês.
+    """
+    player = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="monthly_stats"
+    )
+    month = models.DateField()
+    games_played = models.PositiveIntegerField(default=0)
+    wins = models.PositiveIntegerField(default=0)
+    total_buy_in = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_rebuy = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net_result = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ("player", "month")
+        ordering = ["player", "month"]
+
+    def __str__(self):
+        return f"{self.player} {self.month:%Y-%m}: {self.net_result}"
+
+
+class Job(models.Model):
+    """
+    Tarefa em segundo plano (ver api/jobs.py). Enquanto está na fila, no
+    máximo um job por `dedup_key` existe; enfileirar de novo não duplica.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Na fila"
+        RUNNING = "RUNNING", "Executando"
+        DONE = "DONE", "Concluído"
+        FAILED = "FAILED", "Falhou"
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    dedup_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after", "id"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=models.Q(status="QUEUED"),
+                name="job_unique_queued_dedup_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
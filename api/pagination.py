@@ -0,0 +1,151 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Datas com precisão total: o DjangoJSONEncoder corta os microssegundos e
+    o cursor pularia as linhas criadas no mesmo milissegundo.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre uma ordenação composta e única.
+    O cursor guarda os valores da última linha entregue, então cada página
+    é um range scan no índice correspondente, sem OFFSET.
+    Querysets anotados com `search_rank` (ver api/search.py) são ordenados
+    primeiro pela relevância.
+    """
+    ordering = ("-id",)
+    cursor_query_param = "cursor"
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Variante para views assíncronas (ver api/async_views.py)."""
+        queryset = self.page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset.aiterator(chunk_size=self.page_size + 1)])
+
+    def page_queryset(self, queryset, request):
+        """Queryset da página atual, com uma linha extra para saber se há próxima."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_ordering(self, queryset):
+        ordering = type(self).ordering
+        if "search_rank" in queryset.query.annotations:
+            return ("-search_rank", *ordering)
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        values = [getattr(last, name.lstrip("-")) for name in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def after(self, position):
+        """Monta o predicado `(a, b, c) > cursor` respeitando a direção de cada campo."""
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, position):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, cls=CursorEncoder).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.to_python(model, name.lstrip("-"), value)
+                for name, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound("Cursor inválido.")
+
+    def to_python(self, model, name, value):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
+
+
+class GameCursorPagination(KeysetPagination):
+    ordering = ("-date", "-created_at", "-id")
+
+
+class GroupSectionPagination(KeysetPagination):
+    ordering = ("name", "id")
+    page_size = 20
@@ -0,0 +1,33 @@
+"""
+Parsers dos corpos de request, pares dos renderers de api/renderers.py.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser com orjson; sem orjson, ou fora de UTF-8, usa o do DRF."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
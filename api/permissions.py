@@ -1,17 +1,15 @@
 from rest_framework.permissions import BasePermission
 from .models import Group, GroupMembership, Game, GameParticipation
+from .memberships import memberships
 
 
 class IsGroupMember(BasePermission):
     def has_object_permission(self, request, view, obj):
-        user = request.user
-
         if isinstance(obj, Group):
-            return GroupMembership.objects.filter(group=obj, user=user).exists()
+            return memberships(request).is_member(obj.id)
 
-        if hasattr(obj, "group"):
-            group = obj.group
-            return GroupMembership.objects.filter(group=group, user=user).exists()
+        if hasattr(obj, "group_id"):
+            return memberships(request).is_member(obj.group_id)
 
         return False
 
@@ -30,11 +28,7 @@ class IsGroupAdmin(BasePermission):
         if group.created_by_id == user.id:
             return True
 
-        return GroupMembership.objects.filter(
-            group=group,
-            user=user,
-            role=GroupMembership.Role.ADMIN,
-        ).exists()
+        return memberships(request).has_role(group.id, GroupMembership.Role.ADMIN)
 
 
 class IsGroupCreator(BasePermission):
@@ -0,0 +1,89 @@
+"""
+Renderers da API.
+
+FastJSONRenderer gera o mesmo JSON do JSONRenderer do DRF (compacto,
+UTF-8, \\u2028/\\u2029 escapados) usando orjson quando instalado.
+MessagePackRenderer é um formato binário mais compacto, escolhido pelo
+cliente via `Accept: application/msgpack`. Tipos que os dois não conhecem
+(datas, Decimal, textos lazy) passam pelo encoder do DRF, então o
+conteúdo é o mesmo nos três formatos.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependência opcional
+    msgpack = None
+
+LINE_SEPARATORS = (b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """Fallback para tipos fora do JSON puro, igual ao encoder do DRF."""
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer com orjson; com indentação pedida (ou sem orjson) usa o do DRF."""
+
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encode_default, option=self.options)
+        if LINE_SEPARATORS[0] in ret or LINE_SEPARATORS[1] in ret:
+            ret = ret.replace(LINE_SEPARATORS[0], b"\\u2028").replace(LINE_SEPARATORS[1], b"\\u2029")
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=encode_default, use_bin_type=True, datetime=False)
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Renderer usado só para a negociação de `?format=` em endpoints que
+    devolvem StreamingHttpResponse. Respostas de erro (dicts) saem em JSON.
+    """
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(self.charset)
+
+
+class CSVRenderer(StreamRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(StreamRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
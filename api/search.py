@@ -0,0 +1,249 @@
+"""
+Busca textual ranqueada sobre grupos e partidas.
+
+Uma única API (`search(queryset, term)`) com um backend por banco:
+
+- SQLite: tabela virtual FTS5 de conteúdo externo, sincronizada por
+  triggers de INSERT/UPDATE/DELETE na tabela do modelo. Rank via bm25().
+- PostgreSQL: coluna tsvector gerada (STORED) com índice GIN.
+  Rank via ts_rank().
+- Outros bancos (ou SQLite sem FTS5): icontains, sem rank.
+
+Em todos os casos o queryset devolvido é anotado com `search_rank`
+(maior = mais relevante) e os termos aceitam busca por prefixo.
+"""
+import re
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Game, Group
+
+# modelo -> campos indexados, em ordem decrescente de peso
+SEARCH_FIELDS = {
+    Group: ("name", "description"),
+    Game: ("title", "location"),
+}
+
+WEIGHTS = ("A", "B", "C", "D")
+BM25_WEIGHTS = (10.0, 1.0, 1.0, 1.0)
+
+TRIGGER_SUFFIXES = ("ai", "ad", "au")
+
+VECTOR_COLUMN = "search_vector"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(term):
+    return TOKEN_RE.findall(term or "")
+
+
+def fts_table(model):
+    return f"{model._meta.db_table}_fts"
+
+
+# ---------------------------------------------------------------------------
+# Instalação (migrations e post_migrate)
+# ---------------------------------------------------------------------------
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def _sqlite_statements(model, fields):
+    table = model._meta.db_table
+    fts = fts_table(model)
+    cols = ", ".join(fields)
+    new_cols = ", ".join(f"new.{f}" for f in fields)
+    old_cols = ", ".join(f"old.{f}" for f in fields)
+    delete_old = (
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});"
+    )
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});"
+
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def _sqlite_install(connection):
+    if not sqlite_has_fts5(connection):
+        return
+
+    with connection.cursor() as cursor:
+        for model, fields in SEARCH_FIELDS.items():
+            table = model._meta.db_table
+            fts = fts_table(model)
+            triggers = [f"{fts}_{suffix}" for suffix in TRIGGER_SUFFIXES]
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' "
+                "AND tbl_name = %s AND name IN (%s, %s, %s)",
+                [table, *triggers],
+            )
+            if cursor.fetchone()[0] == len(triggers):
+                continue
+
+            # Tabela recriada por uma migration (os triggers somem junto com a
+            # tabela antiga) ou instalação nova: recria triggers e reindexa.
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{', '.join(fields)}, content='{table}', content_rowid='id', "
+                f"tokenize='unicode61 remove_diacritics 2')"
+            )
+            for statement in _sqlite_statements(model, fields):
+                cursor.execute(statement)
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def _sqlite_uninstall(connection):
+    with connection.cursor() as cursor:
+        for model in SEARCH_FIELDS:
+            fts = fts_table(model)
+            for suffix in TRIGGER_SUFFIXES:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def _postgres_install(connection):
+    with connection.cursor() as cursor:
+        for model, fields in SEARCH_FIELDS.items():
+            table = model._meta.db_table
+            document = " || ".join(
+                f"setweight(to_tsvector('simple', coalesce({field}, '')), '{weight}')"
+                for field, weight in zip(fields, WEIGHTS)
+            )
+            cursor.execute(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {VECTOR_COLUMN} tsvector "
+                f"GENERATED ALWAYS AS ({document}) STORED"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_search_gin ON {table} USING GIN ({VECTOR_COLUMN})"
+            )
+
+
+def _postgres_uninstall(connection):
+    with connection.cursor() as cursor:
+        for model in SEARCH_FIELDS:
+            table = model._meta.db_table
+            cursor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+            cursor.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {VECTOR_COLUMN}")
+
+
+def install(connection):
+    """Cria (ou repara) as estruturas de busca no banco. Idempotente."""
+    if connection.vendor == "sqlite":
+        _sqlite_install(connection)
+    elif connection.vendor == "postgresql":
+        _postgres_install(connection)
+
+
+def uninstall(connection):
+    if connection.vendor == "sqlite":
+        _sqlite_uninstall(connection)
+    elif connection.vendor == "postgresql":
+        _postgres_uninstall(connection)
+
+
+# ---------------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------------
+
+def _sqlite_search(queryset, tokens):
+    model = queryset.model
+    table = model._meta.db_table
+    fts = fts_table(model)
+    match = " ".join(f'"{token}"*' for token in tokens)
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS[:len(SEARCH_FIELDS[model])])
+
+    return queryset.filter(
+        RawSQL(
+            f'"{table}"."id" IN (SELECT rowid FROM {fts} WHERE {fts} MATCH %s)',
+            [match],
+            output_field=BooleanField(),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"SELECT -bm25({fts}, {weights}) FROM {fts} "
+            f'WHERE {fts} MATCH %s AND {fts}.rowid = "{table}"."id"',
+            [match],
+            output_field=FloatField(),
+        )
+    )
+
+
+def _postgres_search(queryset, tokens):
+    table = queryset.model._meta.db_table
+    column = f'"{table}".{VECTOR_COLUMN}'
+    tsquery = " & ".join(f"{token}:*" for token in tokens)
+
+    return queryset.filter(
+        RawSQL(
+            f"{column} @@ to_tsquery('simple', %s)",
+            [tsquery],
+            output_field=BooleanField(),
+        )
+    ).annotate(
+        search_rank=RawSQL(
+            f"ts_rank({column}, to_tsquery('simple', %s))",
+            [tsquery],
+            output_field=FloatField(),
+        )
+    )
+
+
+def _fallback_search(queryset, tokens):
+    condition = Q()
+    for token in tokens:
+        token_condition = Q()
+        for field in SEARCH_FIELDS[queryset.model]:
+            token_condition |= Q(**{f"{field}__icontains": token})
+        condition &= token_condition
+
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
+
+
+_backends = {}
+
+
+def backend_for(connection):
+    if connection.alias not in _backends:
+        if connection.vendor == "postgresql":
+            backend = _postgres_search
+        elif connection.vendor == "sqlite" and sqlite_has_fts5(connection):
+            backend = _sqlite_search
+        else:
+            backend = _fallback_search
+        _backends[connection.alias] = backend
+    return _backends[connection.alias]
+
+
+async def aprepare(using="default"):
+    """
+    Resolve o backend de `using` fora do event loop: a detecção do FTS5
+    faz uma query. Chamado pelas views assíncronas antes de `search()`.
+    """
+    if using not in _backends:
+        await sync_to_async(lambda: backend_for(connections[using]))()
+
+
+def search(queryset, term):
+    """
+    Filtra `queryset` (de Group ou Game) pelos termos de `term` e anota
+    `search_rank`. Cada termo casa como prefixo; todos precisam casar.
+    """
+    tokens = tokenize(term)
+    if not tokens:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    backend = backend_for(connections[queryset.db])
+    return backend(queryset, tokens)
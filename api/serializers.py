@@ -1,6 +1,15 @@
+from decimal import Decimal
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import models
+from django.db.models import Prefetch, prefetch_related_objects
 
+from .memberships import memberships
+from .middleware import timed_serialization
 from .models import (
     Group,
     GroupMembership,
@@ -8,17 +17,115 @@ from .models import (
     Game,
     GamePost,
     GameParticipation,
+    GroupLeaderboardEntry,
+    PlayerMonthlyStats,
+    PlayerStats,
 )
 
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+
+class DecimalField(serializers.DecimalField):
+    """
+    Valores vindos do banco já têm as casas decimais do campo; nesse caso a
+    string sai direto, sem o quantize (e a cópia de contexto) do DRF.
+    """
+
+    def to_representation(self, value):
+        if (
+            isinstance(value, Decimal)
+            and value.is_finite()
+            and value.as_tuple().exponent == -(self.decimal_places or 0)
+            and getattr(self, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING)
+            and not self.localize
+        ):
+            return f"{value:f}"
+        return super().to_representation(value)
+
+
+class ModelSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.DecimalField: DecimalField,
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        # Mede a serialização para o RequestStatsMiddleware (métrica
+        # "serialize"), inclusive nas subclasses que sobrescrevem o método.
+        super().__init_subclass__(**kwargs)
+        if "to_representation" in cls.__dict__:
+            cls.to_representation = timed_serialization(cls.to_representation)
+
+    @timed_serialization
+    def to_representation(self, instance):
+        return super().to_representation(instance)
+
+
+def sparse_fieldset(request):
+    """
+    Lê ?fields= e ?expand= (nomes separados por vírgula) da request.
+    Parâmetro ausente vira None; só vale para leituras.
+    """
+    if request is None or request.method not in ("GET", "HEAD"):
+        return {"fields": None, "expand": None}
+
+    def names(param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(",") if name.strip()}
+
+    return {"fields": names("fields"), "expand": names("expand")}
+
+
+class SparseFieldsMixin:
+    """
+    Payload parcial. `fields` limita o payload aos campos listados.
+    `expand` decide quais relações pesadas (`expandable_fields`) entram:
+    quando informado, as não listadas nele (nem em `fields`) ficam de fora.
+    Sem nenhum dos dois, o payload é o completo.
+    """
+    expandable_fields = ()
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse = fields is not None or expand is not None
+        if not self.sparse:
+            return
+
+        unknown = (fields or set()) - set(self.fields)
+        unknown |= (expand or set()) - set(self.expandable_fields)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Campos desconhecidos: {', '.join(sorted(unknown))}."}
+            )
+
+        selected = self.selected_fields(fields, expand)
+        for name in list(self.fields):
+            if name not in selected:
+                self.fields.pop(name)
+
+    @classmethod
+    def selected_fields(cls, fields=None, expand=None):
+        """Nomes que entram no payload para esses parâmetros."""
+        return {
+            name for name in cls.Meta.fields
+            if (fields is None or name in fields)
+            and (
+                expand is None
+                or name not in cls.expandable_fields
+                or name in expand
+                or (fields is not None and name in fields)
+            )
+        }
+
+class UserSerializer(ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username"]
 
 
-class GroupMembershipSerializer(serializers.ModelSerializer):
+class GroupMembershipSerializer(ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -26,12 +133,14 @@ class GroupMembershipSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "role", "joined_at"]
 
 
-class GroupSerializer(serializers.ModelSerializer):
+class GroupSerializer(SparseFieldsMixin, ModelSerializer):
     created_by = UserSerializer(read_only=True)
 
     member_count = serializers.IntegerField(read_only=True)
     post_count = serializers.IntegerField(read_only=True)
-    last_post = serializers.DateTimeField(read_only=True)
+    last_post = serializers.DateTimeField(source="last_post_at", read_only=True)
+    game_count = serializers.IntegerField(read_only=True)
+    last_game = serializers.DateField(source="last_game_at", read_only=True)
 
     requested = serializers.BooleanField(read_only=True)
     class Meta:
@@ -46,16 +155,37 @@ class GroupSerializer(serializers.ModelSerializer):
             "member_count",
             "post_count",
             "last_post",
+            "game_count",
+            "last_game",
             "requested",
         ]
         read_only_fields = ["slug", "created_by", "created_at"]
 
+    def update(self, instance, validated_data):
+        # Salva só os campos editados para não sobrescrever os contadores
+        # desnormalizados, que são atualizados com F() em paralelo.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
     def get_requested(self, obj):
         user = self.context["request"].user
-        return GroupRequest.objects.filter(group=obj, requested_by=user).exists(
+        return GroupRequest.objects.filter(group=obj, requested_by_id=user.id).exists(
         )
     
-class GroupDetailSerializer(serializers.ModelSerializer):
+GROUP_DETAIL_CACHE_KEY = "group-detail:{group_id}:{version}"
+
+
+class GroupDetailSerializer(SparseFieldsMixin, ModelSerializer):
+    """
+    A parte do payload que não depende de quem pede fica em cache sob
+    (group_id, version); Group.version muda a cada escrita que afeta o grupo.
+    Só os campos em `viewer_fields` são calculados a cada request.
+    """
+    viewer_fields = ("is_member", "is_admin", "is_creator", "already_requested", "join_requests")
+    expandable_fields = ("memberships", "recent_posts", "recent_games", "join_requests")
+
     created_by = UserSerializer(read_only=True)
     memberships = GroupMembershipSerializer(many=True, read_only=True)
 
@@ -87,15 +217,64 @@ class GroupDetailSerializer(serializers.ModelSerializer):
             "join_requests",
         ]
 
-    def get_is_member(self, obj):
+    def to_representation(self, obj):
+        if "shared" in self.context:
+            self._shared = self.context["shared"]
+        else:
+            self._shared = self.get_shared_representation(obj)
         user = self.context["request"].user
-        return GroupMembership.objects.filter(group=obj, user=user).exists()
+
+        data = {}
+        for field in self._readable_fields:
+            name = field.field_name
+            if name in self.viewer_fields:
+                data[name] = field.to_representation(field.get_attribute(obj))
+            else:
+                data[name] = self._shared[name]
+
+        if "recent_games" in data:
+            data["recent_games"] = [
+                GameSerializer.with_viewer_flags(game, user)
+                for game in self._shared["recent_games"]
+            ]
+        return data
+
+    def get_shared_representation(self, obj):
+        key = GROUP_DETAIL_CACHE_KEY.format(group_id=obj.id, version=obj.version)
+        shared = cache.get(key)
+        if shared is not None:
+            return shared
+
+        # Payload parcial: monta só o que foi pedido e não grava no cache,
+        # que guarda sempre a versão completa.
+        names = set(self.fields)
+
+        if "memberships" in names:
+            prefetch_related_objects(
+                [obj],
+                Prefetch("memberships", queryset=GroupMembership.objects.select_related("user")),
+            )
+
+        shared = {}
+        for field in self._readable_fields:
+            if field.field_name not in self.viewer_fields:
+                shared[field.field_name] = field.to_representation(field.get_attribute(obj))
+
+        if names & {"join_requests", "already_requested"}:
+            requests = obj.join_requests.select_related("requested_by").order_by("-created_at")
+            shared["join_requests"] = GroupRequestSerializer(requests, many=True).data
+
+        if not self.sparse:
+            cache.set(key, shared, settings.GROUP_DETAIL_CACHE_TIMEOUT)
+        return shared
+
+    def get_is_member(self, obj):
+        return memberships(self.context["request"]).is_member(obj.id)
 
     def get_is_admin(self, obj):
-        user = self.context["request"].user
-        return GroupMembership.objects.filter(
-            group=obj, user=user, role=GroupMembership.Role.ADMIN
-        ).exists()
+        return memberships(self.context["request"]).has_role(
+            obj.id, GroupMembership.Role.ADMIN
+        )
 
     def get_is_creator(self, obj):
         user = self.context["request"].user
@@ -106,25 +285,26 @@ class GroupDetailSerializer(serializers.ModelSerializer):
         return GamePostSerializer(posts, many=True).data
 
     def get_recent_games(self, obj):
-        games = Game.objects.filter(posts__group=obj).distinct().order_by("-date")[:10]
+        games = GameSerializer.setup_eager_loading(
+            Game.objects.filter(posts__group=obj)
+        ).order_by("-date")[:10]
         return GameSerializer(games, many=True, context=self.context).data
 
     def get_already_requested(self, obj):
         user = self.context["request"].user
-        return GroupRequest.objects.filter(group=obj, requested_by=user).exists()
-    
+        return any(
+            request["requested_by"]["id"] == user.id
+            for request in self._shared["join_requests"]
+        )
+
     def get_join_requests(self, obj):
-        user = self.context["request"].user
-        if not GroupMembership.objects.filter(
-            group=obj,
-            user=user,
-            role__in=[GroupMembership.Role.ADMIN, GroupMembership.Role.OWNER],
-        ).exists():
+        if not memberships(self.context["request"]).has_role(
+            obj.id, GroupMembership.Role.ADMIN, GroupMembership.Role.OWNER
+        ):
             return []
-        requests = obj.join_requests.select_related("requested_by").order_by("-created_at")
-        return GroupRequestSerializer(requests, many=True).data
+        return self._shared["join_requests"]
 
-class GroupRequestSerializer(serializers.ModelSerializer):
+class GroupRequestSerializer(ModelSerializer):
     requested_by = UserSerializer(read_only=True)
 
     class Meta:
@@ -133,7 +313,7 @@ class GroupRequestSerializer(serializers.ModelSerializer):
         read_only_fields = ["requested_by", "created_at"]
 
 
-class GamePostSerializer(serializers.ModelSerializer):
+class GamePostSerializer(ModelSerializer):
     posted_by = UserSerializer(read_only=True)
 
     class Meta:
@@ -141,7 +321,7 @@ class GamePostSerializer(serializers.ModelSerializer):
         fields = ["id", "game", "group", "posted_by", "posted_at"]
 
 
-class GameParticipationSerializer(serializers.ModelSerializer):
+class GameParticipationSerializer(ModelSerializer):
     player = UserSerializer(read_only=True)
     player_id = serializers.IntegerField(write_only=True)
 
@@ -162,36 +342,90 @@ class GameParticipationSerializer(serializers.ModelSerializer):
 
 
 
-class GroupMiniSerializer(serializers.ModelSerializer):
+class ParticipationItemSerializer(ModelSerializer):
+    player_id = serializers.IntegerField()
+
+    class Meta:
+        model = GameParticipation
+        fields = ["player_id", "rebuy", "final_balance"]
+        extra_kwargs = {"rebuy": {"default": 0}}
+
+
+class ParticipationBulkSerializer(serializers.Serializer):
+    participations = ParticipationItemSerializer(many=True)
+    replace = serializers.BooleanField(default=False)
+
+    def validate_participations(self, value):
+        player_ids = [item["player_id"] for item in value]
+        if len(player_ids) != len(set(player_ids)):
+            raise serializers.ValidationError("Jogador repetido na lista.")
+        return value
+
+
+class GroupMiniSerializer(ModelSerializer):
     class Meta:
         model = Group
         fields = ["id", "name", "slug", "created_by"]
 
-class GameSerializer(serializers.ModelSerializer):
+class GameSerializer(SparseFieldsMixin, ModelSerializer):
     created_by = UserSerializer(read_only=True)
     group = GroupMiniSerializer(read_only=True)
     group_id = serializers.IntegerField(write_only=True, required=True)
 
     participations = GameParticipationSerializer(many=True, read_only=True)
-    participations_count = serializers.SerializerMethodField()
+    participations_count = serializers.IntegerField(source="participant_count", read_only=True)
+    pot_total = DecimalField(max_digits=12, decimal_places=2, read_only=True)
 
     is_game_creator = serializers.SerializerMethodField()
     is_group_creator = serializers.SerializerMethodField()
 
+    expandable_fields = ("participations",)
+
     class Meta:
         model = Game
         fields = [
             "id", "title", "date", "location", "buy_in",
             "created_by", "created_at",
             "group", "group_id",
-            "participations", "participations_count",
+            "participations", "participations_count", "pot_total",
             "is_game_creator", "is_group_creator",
         ]
         read_only_fields = ["created_by", "created_at"]
 
-    
-    def get_participations_count(self, obj):
-        return obj.participations.count()
+    @classmethod
+    def setup_eager_loading(cls, queryset, fields=None, expand=None):
+        """
+        Carrega tudo que o serializer lê em um número constante de queries,
+        independente da quantidade de partidas e participantes. Com
+        `fields`/`expand`, só as relações dos campos pedidos.
+        """
+        selected = cls.selected_fields(fields, expand)
+
+        related = []
+        if "created_by" in selected:
+            related.append("created_by")
+        if selected & {"group", "is_group_creator"}:
+            related.append("group")
+        if related:
+            queryset = queryset.select_related(*related)
+
+        if "participations" in selected:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "participations",
+                    queryset=GameParticipation.objects.select_related("player"),
+                )
+            )
+        return queryset
+
+    @staticmethod
+    def with_viewer_flags(data, user):
+        """Recalcula os campos que dependem do usuário num payload já serializado."""
+        return {
+            **data,
+            "is_game_creator": data["created_by"]["id"] == user.id,
+            "is_group_creator": data["group"]["created_by"] == user.id,
+        }
 
     def get_is_game_creator(self, obj):
         user = self.context["request"].user
@@ -200,3 +434,69 @@ class GameSerializer(serializers.ModelSerializer):
     def get_is_group_creator(self, obj):
         user = self.context["request"].user
         return obj.group.created_by_id == user.id
+
+
+class LeaderboardEntrySerializer(ModelSerializer):
+    player = UserSerializer(read_only=True)
+
+    class Meta:
+        model = GroupLeaderboardEntry
+        fields = [
+            "player",
+            "net_result",
+            "games_played",
+            "total_buy_in",
+            "total_rebuy",
+            "best_night",
+            "worst_night",
+            "updated_at",
+        ]
+
+
+class PlayerMonthlyStatsSerializer(ModelSerializer):
+    month = serializers.DateField(format="%Y-%m")
+
+    class Meta:
+        model = PlayerMonthlyStats
+        fields = [
+            "month",
+            "games_played",
+            "wins",
+            "total_buy_in",
+            "total_rebuy",
+            "net_result",
+        ]
+
+
+class PlayerStatsSerializer(ModelSerializer):
+    player = UserSerializer(read_only=True)
+    roi = DecimalField(max_digits=12, decimal_places=4, read_only=True)
+    win_rate = DecimalField(max_digits=5, decimal_places=4, read_only=True)
+    average_rebuy = DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    monthly = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PlayerStats
+        fields = [
+            "player",
+            "games_played",
+            "wins",
+            "win_rate",
+            "net_result",
+            "roi",
+            "total_buy_in",
+            "total_rebuy",
+            "average_rebuy",
+            "best_night",
+            "worst_night",
+            "longest_win_streak",
+            "current_win_streak",
+            "first_game_on",
+            "last_game_on",
+            "monthly",
+            "updated_at",
+        ]
+
+    def get_monthly(self, obj):
+        months = self.context.get("monthly", [])
+        return PlayerMonthlyStatsSerializer(months, many=True).data
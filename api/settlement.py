@@ -0,0 +1,163 @@
+"""
+Acerto de contas ("quem paga quem") a partir dos resultados líquidos.
+
+Os valores são convertidos para centavos inteiros. Com poucos jogadores
+com saldo (até EXACT_LIMIT) o número mínimo de transferências é encontrado
+de forma exata: particiona-se os jogadores no maior número possível de
+subconjuntos de soma zero (DP sobre bitmasks), e cada subconjunto de k
+jogadores se acerta com k - 1 transferências. Acima disso usa-se o guloso
+com heaps (maior devedor paga ao maior credor), que gera no máximo n - 1
+transferências.
+"""
+from decimal import Decimal
+from heapq import heapify, heappop, heappush
+
+from django.db.models import Sum
+
+from .aggregates import net_expression
+
+CENTS = Decimal("0.01")
+
+EXACT_LIMIT = 12
+
+
+def _to_cents(amount):
+    return int((Decimal(amount) / CENTS).to_integral_value())
+
+
+def _from_cents(cents):
+    return (Decimal(cents) * CENTS).quantize(CENTS)
+
+
+def _greedy(balances):
+    """Transferências (devedor, credor, centavos) para os saldos dados."""
+    creditors = [(-amount, player) for player, amount in balances.items() if amount > 0]
+    debtors = [(amount, player) for player, amount in balances.items() if amount < 0]
+    heapify(creditors)
+    heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        credit, creditor = heappop(creditors)
+        debt, debtor = heappop(debtors)
+        credit, debt = -credit, -debt
+
+        amount = min(credit, debt)
+        transfers.append((debtor, creditor, amount))
+
+        if credit > amount:
+            heappush(creditors, (amount - credit, creditor))
+        if debt > amount:
+            heappush(debtors, (amount - debt, debtor))
+
+    return transfers
+
+
+def _zero_sum_groups(balances):
+    """
+    Particiona os jogadores no maior número de grupos de soma zero.
+    Se o total não fecha em zero, o último grupo carrega a diferença.
+    """
+    players = list(balances)
+    amounts = [balances[player] for player in players]
+    size = 1 << len(players)
+
+    totals = [0] * size
+    best = [0] * size
+    for mask in range(1, size):
+        lowest = mask & -mask
+        totals[mask] = totals[mask ^ lowest] + amounts[lowest.bit_length() - 1]
+        best[mask] = max(
+            best[mask ^ (1 << index)]
+            for index in range(len(players))
+            if mask & (1 << index)
+        ) + (totals[mask] == 0)
+
+    # Refaz o caminho da DP; os prefixos de soma zero delimitam os grupos.
+    order = []
+    mask = size - 1
+    while mask:
+        closes = totals[mask] == 0
+        for index in range(len(players)):
+            bit = 1 << index
+            if mask & bit and best[mask ^ bit] + closes == best[mask]:
+                order.append(index)
+                mask ^= bit
+                break
+    order.reverse()
+
+    groups, current, running = [], [], 0
+    for index in order:
+        current.append(players[index])
+        running += amounts[index]
+        if running == 0:
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+    return groups
+
+
+def settle(balances):
+    """
+    Recebe {jogador: resultado líquido} e devolve um dict com as
+    transferências (devedor, credor, valor), o método usado e a diferença
+    não coberta (diferente de zero quando os resultados não fecham).
+    """
+    cents = {player: _to_cents(net) for player, net in balances.items()}
+    cents = {player: amount for player, amount in cents.items() if amount}
+
+    if len(cents) <= EXACT_LIMIT:
+        method = "exact"
+        groups = _zero_sum_groups(cents)
+    else:
+        method = "greedy"
+        groups = [list(cents)]
+
+    transfers = []
+    for group in groups:
+        transfers.extend(_greedy({player: cents[player] for player in group}))
+
+    return {
+        "method": method,
+        "transfers": [
+            (debtor, creditor, _from_cents(amount))
+            for debtor, creditor, amount in transfers
+        ],
+        "imbalance": _from_cents(sum(cents.values())),
+    }
+
+
+def player_balances(participations):
+    """
+    Soma o resultado líquido por jogador direto no banco, sem instanciar
+    partidas ou participações. Devolve {player_id: (username, net)}.
+    """
+    rows = (
+        participations
+        .values("player_id", "player__username")
+        .annotate(net=Sum(net_expression()))
+        .order_by("player__username")
+    )
+    return {row["player_id"]: (row["player__username"], row["net"]) for row in rows}
+
+
+def settlement_payload(participations):
+    balances = player_balances(participations)
+    result = settle({player: net for player, (_, net) in balances.items()})
+
+    def player(player_id):
+        return {"id": player_id, "username": balances[player_id][0]}
+
+    return {
+        "balances": [
+            {"player": player(player_id), "net": str(_from_cents(_to_cents(net)))}
+            for player_id, (_, net) in balances.items()
+        ],
+        "transfers": [
+            {"from": player(debtor), "to": player(creditor), "amount": str(amount)}
+            for debtor, creditor, amount in result["transfers"]
+        ],
+        "method": result["method"],
+        "imbalance": str(result["imbalance"]),
+    }
@@ -0,0 +1,54 @@
+"""
+Tarefas executadas pelo worker da fila (api/jobs.py).
+
+Os argumentos chegam do payload JSON do job, então são sempre ids e
+valores simples, nunca instâncias de modelos.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .aggregates import rebuild_all, rebuild_player_stats
+from .deletion import delete_group, delete_in_batches
+from .jobs import task
+from .models import GroupInvite, PasswordResetToken, RevokedToken
+
+
+@task("rebuild_aggregates")
+def rebuild_aggregates(player_ids=None):
+    """Reconstrói todos os agregados, ou só as estatísticas dos jogadores informados."""
+    with transaction.atomic():
+        if player_ids:
+            rebuild_player_stats(player_ids)
+        else:
+            rebuild_all()
+
+
+@task("delete_group")
+def delete_group_task(group_id):
+    # Cada lote commita sozinho; se o job falhar no meio, a nova tentativa
+    # continua de onde parou.
+    delete_group(group_id, atomic=False)
+
+
+def purge_expired(batch_size=1000):
+    """
+    Remove, em lotes que commitam separadamente, os tokens de senha e
+    convites vencidos e as revogações de JWT já expiradas. Devolve quantas
+    linhas saíram de cada tabela.
+    """
+    return {
+        "password_reset_tokens": delete_in_batches(
+            PasswordResetToken.objects.expired(), batch_size, atomic=False
+        ),
+        "group_invites": delete_in_batches(
+            GroupInvite.objects.expired(), batch_size, atomic=False
+        ),
+        "revoked_tokens": delete_in_batches(
+            RevokedToken.objects.filter(expires_at__lte=timezone.now()), batch_size, atomic=False
+        ),
+    }
+
+
+@task("purge_expired")
+def purge_expired_task():
+    purge_expired()
@@ -0,0 +1,36 @@
+from rest_framework.test import APIClient, APITestCase
+
+from api.models import Group, GroupMembership, User
+
+
+class PokerdexTestCase(APITestCase):
+    """Grupo "Mesa" criado pela API por `owner`, com `player` como segundo membro."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", "owner@example.com", "senha")
+        self.player = User.objects.create_user("player", "player@example.com", "senha")
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+        response = self.client.post("/api/groups/", {"name": "Mesa"}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        self.group = Group.objects.get(name="Mesa")
+        GroupMembership.objects.create(user=self.player, group=self.group)
+        Group.objects.filter(pk=self.group.pk).update(member_count=2)
+
+    def create_game(self, buy_in="50", date="2025-01-01", **extra):
+        response = self.client.post(
+            "/api/games/",
+            {"title": "Noite", "buy_in": buy_in, "group_id": self.group.id, "date": date, **extra},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()["id"]
+
+    def add_participation(self, game_id, player, final_balance, rebuy="0"):
+        response = self.client.post(
+            f"/api/games/{game_id}/add_participation/",
+            {"player_id": player.id, "final_balance": final_balance, "rebuy": rebuy},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
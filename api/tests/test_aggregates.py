@@ -0,0 +1,136 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.aggregates import (
+    PLAYER_STATS_FIELDS, fold_player_stats, player_rows, rebuild_player_stats,
+)
+from api.jobs import work
+from api.models import (
+    GameParticipation, Group, GroupLeaderboardEntry, Job, PlayerMonthlyStats, PlayerStats,
+)
+
+from .base import PokerdexTestCase
+
+
+class GameUpdateTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        self.game_id = self.create_game(buy_in="50")
+        self.add_participation(self.game_id, self.owner, final_balance="80")
+
+    def test_title_only_update_skips_aggregates(self):
+        version = Group.objects.get(pk=self.group.pk).version
+        with mock.patch("api.views.participations_changed") as changed:
+            response = self.client.patch(f"/api/games/{self.game_id}/", {"title": "Final"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        changed.assert_not_called()
+        # Respostas em cache do grupo ainda precisam ser invalidadas.
+        self.assertEqual(Group.objects.get(pk=self.group.pk).version, version + 1)
+
+    def test_buy_in_update_refreshes_aggregates(self):
+        response = self.client.patch(f"/api/games/{self.game_id}/", {"buy_in": "70"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        entry = GroupLeaderboardEntry.objects.get(group=self.group, player=self.owner)
+        self.assertEqual(entry.net_result, Decimal("10"))
+        self.assertEqual(PlayerStats.objects.get(player=self.owner).net_result, Decimal("10"))
+
+
+class PlayerStatsDeltaTests(PokerdexTestCase):
+    """As estatísticas mantidas por delta batem com a reconstrução completa."""
+
+    def assertMatchesHistory(self):
+        stats, monthly = fold_player_stats(player_rows(GameParticipation.objects.all()))
+        fields = [field for field in PLAYER_STATS_FIELDS if field != "updated_at"]
+        self.assertEqual(
+            {s.player_id: [getattr(s, field) for field in fields] for s in stats},
+            {
+                s.player_id: [getattr(s, field) for field in fields]
+                for s in PlayerStats.objects.all()
+            },
+        )
+        self.assertEqual(
+            sorted((m.player_id, m.month, m.games_played, m.wins, m.net_result) for m in monthly),
+            sorted(PlayerMonthlyStats.objects.values_list(
+                "player_id", "month", "games_played", "wins", "net_result"
+            )),
+        )
+
+    def queued_rebuilds(self):
+        return set(Job.objects.filter(name="rebuild_aggregates").values_list("dedup_key", flat=True))
+
+    def test_appending_games(self):
+        for day, balance in [(1, "80"), (2, "90"), (3, "10"), (4, "60")]:
+            game_id = self.create_game(date=f"2025-01-{day:02d}")
+            self.add_participation(game_id, self.owner, final_balance=balance)
+            self.add_participation(game_id, self.player, final_balance="40", rebuy="5")
+            self.assertMatchesHistory()
+
+        stats = PlayerStats.objects.get(player=self.owner)
+        self.assertEqual((stats.current_win_streak, stats.longest_win_streak), (1, 2))
+        self.assertEqual(self.queued_rebuilds(), set())
+
+    @override_settings(JOBS_WORKER=True)
+    def test_edits_and_removals(self):
+        games = []
+        for month, balance in [(1, "80"), (2, "20"), (3, "70"), (4, "90")]:
+            games.append(self.create_game(date=f"2025-{month:02d}-10"))
+            self.add_participation(games[-1], self.owner, final_balance=balance)
+
+        # Mesma vitória com outro rebuy: sequências intactas, nada na fila.
+        self.add_participation(games[3], self.owner, final_balance="95", rebuy="5")
+        self.assertMatchesHistory()
+
+        # Partida antiga vira vitória: as sequências se juntam no meio.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_participation(games[1], self.owner, final_balance="75")
+        self.assertMatchesHistory()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f"/api/games/{games[0]}/", {"buy_in": "100", "date": "2025-05-01"}, format="json")
+            self.client.post(
+                f"/api/games/{games[2]}/remove_participation/", {"player_id": self.owner.id}, format="json"
+            )
+            self.client.delete(f"/api/games/{games[3]}/delete/")
+        self.assertEqual(self.queued_rebuilds(), {f"player-stats:{self.owner.id}"})
+
+        # Com a fila processada o estado volta a bater com a reconstrução.
+        work(burst=True)
+        self.assertMatchesHistory()
+
+    @override_settings(JOBS_WORKER=False)
+    def test_edits_without_worker_rebuild_in_request(self):
+        games = []
+        for month, balance in [(1, "80"), (2, "90"), (3, "70")]:
+            games.append(self.create_game(date=f"2025-{month:02d}-10"))
+            self.add_participation(games[-1], self.owner, final_balance=balance)
+
+        # A vitória do meio vira derrota: a sequência mais longa encolhe já
+        # na resposta, sem job na fila.
+        self.add_participation(games[1], self.owner, final_balance="10")
+        stats = PlayerStats.objects.get(player=self.owner)
+        self.assertEqual((stats.current_win_streak, stats.longest_win_streak), (1, 1))
+        self.assertEqual(self.queued_rebuilds(), set())
+        self.assertMatchesHistory()
+
+    def test_write_cost_does_not_grow_with_history(self):
+        def append_game(day):
+            game_id = self.create_game(date=f"2025-03-{day:02d}")
+            with CaptureQueriesContext(connection) as queries:
+                self.add_participation(game_id, self.owner, final_balance="80" if day % 2 else "10")
+            return len(queries)
+
+        counts = [append_game(day) for day in range(1, 21)]
+        self.assertEqual(counts[3], counts[-1])
+        self.assertMatchesHistory()
+
+    def test_rebuild_upserts(self):
+        game_id = self.create_game()
+        self.add_participation(game_id, self.owner, final_balance="80")
+        rebuild_player_stats([self.owner.id])
+        rebuild_player_stats([self.owner.id])
+        self.assertEqual(PlayerStats.objects.filter(player=self.owner).count(), 1)
+        self.assertMatchesHistory()
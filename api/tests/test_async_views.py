@@ -0,0 +1,54 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory
+
+from api import async_views
+
+from .base import PokerdexTestCase
+
+
+class AsyncReadViewTests(PokerdexTestCase):
+    """As views assíncronas devolvem o mesmo payload das síncronas."""
+
+    def setUp(self):
+        super().setUp()
+        game_id = self.create_game(buy_in="50")
+        self.add_participation(game_id, self.owner, final_balance="80", rebuy="10")
+        self.add_participation(game_id, self.player, final_balance="20")
+
+    def call_async(self, view, path, user=None, **kwargs):
+        request = RequestFactory().get(path, kwargs.pop("params", None))
+        if user is not None:
+            request._force_auth_user = user
+        response = async_to_sync(view)(request, **kwargs)
+        response.render()
+        return response
+
+    def assertSamePayload(self, view, path, **kwargs):
+        expected = self.client.get(path, kwargs.get("params"))
+        self.assertEqual(expected.status_code, 200, expected.content)
+
+        response = self.call_async(view, path, user=self.owner, **kwargs)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(json.loads(response.content), expected.json())
+
+    def test_same_payload_as_sync_views(self):
+        slug = self.group.slug
+        self.assertSamePayload(async_views.group_list, "/api/groups/")
+        self.assertSamePayload(async_views.group_list, "/api/groups/", params={"search": "mes"})
+        self.assertSamePayload(async_views.group_detail, f"/api/groups/{slug}/", slug=slug)
+        self.assertSamePayload(async_views.game_list, "/api/games/")
+        self.assertSamePayload(
+            async_views.group_leaderboard, f"/api/groups/{slug}/leaderboard/", slug=slug,
+        )
+
+    def test_errors_match_sync_views(self):
+        response = self.call_async(
+            async_views.group_detail, "/api/groups/nope/", user=self.owner, slug="nope",
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = self.call_async(async_views.game_list, "/api/games/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response)
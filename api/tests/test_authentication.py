@@ -0,0 +1,96 @@
+from django.test import override_settings
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+
+from api.authentication import ClaimsUser, StatelessJWTAuthentication, revocations
+from api.models import Group, GroupMembership, RevokedToken, User
+
+
+@override_settings(JWT_STATELESS=True)
+class StatelessLoginTests(APITestCase):
+    """Fluxo real: login em /api/auth/login/ e Bearer token, sem force_authenticate."""
+
+    def setUp(self):
+        revocations.clear()
+        self.addCleanup(revocations.clear)
+        self.owner = User.objects.create_user("owner", "owner@example.com", "senha")
+        self.player = User.objects.create_user("player", "player@example.com", "senha")
+
+    def login(self, username):
+        response = self.client.post(
+            "/api/auth/login/", {"username": username, "password": "senha"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        tokens = response.json()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access']}")
+        return client, tokens
+
+    def authenticate(self, access):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {access}")
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def test_claims_user_id_is_an_int(self):
+        _, tokens = self.login("owner")
+        user, _ = self.authenticate(tokens["access"])
+
+        self.assertIsInstance(user, ClaimsUser)
+        self.assertEqual(user.id, self.owner.id)
+        self.assertEqual(user.pk, self.owner.pk)
+
+    def test_creator_checks_with_bearer_token(self):
+        client, _ = self.login("owner")
+        response = client.post("/api/groups/", {"name": "Mesa"}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        group = Group.objects.get(name="Mesa")
+        GroupMembership.objects.create(user=self.player, group=group)
+
+        response = client.patch(f"/api/groups/{group.slug}/", {"name": "Mesa 2"}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(client.get(f"/api/groups/{group.slug}/").json()["is_creator"])
+
+        response = client.post(
+            "/api/games/",
+            {"title": "Noite", "buy_in": "50", "group_id": group.id, "date": "2025-01-01"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        game_id = response.json()["id"]
+        response = client.post(
+            f"/api/games/{game_id}/add_participation/",
+            {"player_id": self.player.id, "final_balance": "20", "rebuy": "0"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        game = client.get(f"/api/games/{game_id}/").json()
+        self.assertTrue(game["is_game_creator"])
+        self.assertTrue(game["is_group_creator"])
+
+        # O dono sai: o grupo passa para o membro restante.
+        self.assertEqual(client.post(f"/api/groups/{group.slug}/leave/").status_code, 200)
+        group.refresh_from_db()
+        self.assertEqual(group.created_by_id, self.player.id)
+
+    def test_logout_revokes_tokens(self):
+        client, tokens = self.login("owner")
+        response = client.post("/api/auth/logout/", {"refresh": tokens["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(RevokedToken.objects.count(), 2)
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(tokens["access"])
+        self.assertEqual(client.get("/api/auth/me/").status_code, 401)
+
+        # Outro processo, com o índice vazio, recarrega as revogações do banco.
+        revocations.clear()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(tokens["access"])
+
+    def test_other_sessions_stay_valid_after_logout(self):
+        client, tokens = self.login("owner")
+        _, other = self.login("owner")
+        client.post("/api/auth/logout/", {"refresh": tokens["refresh"]}, format="json")
+
+        user, _ = self.authenticate(other["access"])
+        self.assertEqual(user.id, self.owner.id)
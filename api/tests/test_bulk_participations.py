@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from api.models import GameParticipation, GroupLeaderboardEntry, User
+
+from .base import PokerdexTestCase
+
+
+class BulkParticipationTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        self.game_id = self.create_game(buy_in="50")
+        self.path = f"/api/games/{self.game_id}/participations/bulk/"
+
+    def post(self, payload):
+        return self.client.post(self.path, payload, format="json")
+
+    def leaderboard(self):
+        return dict(
+            GroupLeaderboardEntry.objects
+            .filter(group=self.group)
+            .values_list("player_id", "net_result")
+        )
+
+    def test_upsert_and_replace(self):
+        response = self.post([
+            {"player_id": self.owner.id, "final_balance": "80"},
+            {"player_id": self.player.id, "final_balance": "20", "rebuy": "10"},
+        ])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["participations"]), 2)
+        self.assertEqual(
+            self.leaderboard(), {self.owner.id: Decimal("30"), self.player.id: Decimal("-40")},
+        )
+
+        response = self.post({
+            "participations": [{"player_id": self.owner.id, "final_balance": "90"}],
+            "replace": True,
+        })
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["removed"], [self.player.id])
+        self.assertEqual(
+            list(GameParticipation.objects.filter(game_id=self.game_id).values_list(
+                "player_id", "final_balance",
+            )),
+            [(self.owner.id, Decimal("90.00"))],
+        )
+        self.assertEqual(self.leaderboard(), {self.owner.id: Decimal("40")})
+
+    def test_outsiders_and_duplicates_are_rejected(self):
+        outsider = User.objects.create_user("outsider", "outsider@example.com", "senha")
+        for payload in [
+            [{"player_id": outsider.id, "final_balance": "80"}],
+            [
+                {"player_id": self.owner.id, "final_balance": "80"},
+                {"player_id": self.owner.id, "final_balance": "10"},
+            ],
+            [{"player_id": self.owner.id}],
+        ]:
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        self.assertFalse(GameParticipation.objects.filter(game_id=self.game_id).exists())
+        self.assertEqual(self.leaderboard(), {})
+
+    def test_only_game_or_group_creator(self):
+        self.client.force_authenticate(self.player)
+        response = self.post([{"player_id": self.player.id, "final_balance": "80"}])
+        self.assertEqual(response.status_code, 403)
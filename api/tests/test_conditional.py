@@ -0,0 +1,43 @@
+from api.models import GroupRequest, User
+
+from .base import PokerdexTestCase
+
+
+class ConditionalGetTests(PokerdexTestCase):
+    def test_not_modified_with_matching_etag(self):
+        game_id = self.create_game()
+        response = self.client.get(f"/api/games/{game_id}/")
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(f"/api/games/{game_id}/", HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_malformed_pk_is_not_found(self):
+        for path in ["/api/games/abc/", "/api/group-requests/abc/"]:
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
+
+    def test_unknown_pk_is_not_found(self):
+        outsider = User.objects.create_user("outsider", "outsider@example.com", "senha")
+        request = GroupRequest.objects.create(group=self.group, requested_by=outsider)
+        self.assertEqual(self.client.get("/api/games/999999/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/group-requests/{request.pk + 1}/").status_code, 404)
+
+    def test_non_member_never_gets_not_modified(self):
+        game_id = self.create_game()
+        requester = User.objects.create_user("requester", "requester@example.com", "senha")
+        join_request = GroupRequest.objects.create(group=self.group, requested_by=requester)
+        outsider = User.objects.create_user("outsider", "outsider@example.com", "senha")
+
+        for path in [f"/api/games/{game_id}/", f"/api/group-requests/{join_request.pk}/"]:
+            with self.subTest(path=path):
+                member_response = self.client.get(path)
+                self.client.force_authenticate(outsider)
+                for headers in [
+                    {"HTTP_IF_NONE_MATCH": member_response["ETag"]},
+                    {"HTTP_IF_MODIFIED_SINCE": member_response["Last-Modified"]},
+                ]:
+                    response = self.client.get(path, **headers)
+                    self.assertNotEqual(response.status_code, 304)
+                    self.assertNotIn("ETag", response)
+                self.client.force_authenticate(self.owner)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import override_settings
+
+from api import deletion
+from api.models import Game, GameParticipation, Group, Job, PlayerStats, User
+
+from .base import PokerdexTestCase
+
+
+class DeleteGroupTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        self.players = [self.owner, self.player] + [
+            User.objects.create_user(f"extra{n}", f"extra{n}@example.com", "senha")
+            for n in range(3)
+        ]
+        game_id = self.create_game()
+        for player in self.players:
+            GameParticipation.objects.create(game_id=game_id, player=player, final_balance="60")
+
+        # Outra partida do dono fora do grupo mantém as estatísticas dele.
+        self.other = Group.objects.create(name="Outra", created_by=self.owner)
+        other_game = Game.objects.create(
+            title="Fora", buy_in="50", date="2025-02-01", group=self.other, created_by=self.owner,
+        )
+        GameParticipation.objects.create(game=other_game, player=self.owner, final_balance="20")
+        deletion.rebuild_player_stats()
+
+    @override_settings(GROUP_DELETE_BATCH_SIZE=2)
+    def test_player_stats_refreshed_in_batches(self):
+        with mock.patch.object(
+            deletion, "rebuild_player_stats", wraps=deletion.rebuild_player_stats
+        ) as rebuild:
+            with transaction.atomic():
+                deleted = deletion.delete_group(self.group.id)
+
+        self.assertEqual(deleted["api.Group"], 1)
+        self.assertEqual([len(call.args[0]) for call in rebuild.call_args_list], [2, 2, 1])
+        self.assertEqual(list(PlayerStats.objects.values_list("player_id", flat=True)), [self.owner.id])
+        self.assertEqual(PlayerStats.objects.get(player=self.owner).games_played, 1)
+
+    @override_settings(GROUP_DELETE_BATCH_SIZE=2)
+    def test_non_atomic_deletion(self):
+        deletion.delete_group(self.group.id, atomic=False)
+        self.assertFalse(Group.objects.filter(pk=self.group.id).exists())
+        self.assertEqual(PlayerStats.objects.count(), 1)
+
+
+class DeleteGroupViewTests(PokerdexTestCase):
+    def delete(self, **params):
+        query = "?background=1" if params.get("background") else ""
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.delete(f"/api/groups/{self.group.slug}/{query}")
+
+    @override_settings(JOBS_WORKER=False, GROUP_DELETE_BACKGROUND_THRESHOLD=1)
+    def test_without_worker_deletes_in_request(self):
+        self.create_game()
+        response = self.delete(background=True)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Group.objects.filter(pk=self.group.pk).exists())
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_WORKER=True, GROUP_DELETE_BACKGROUND_THRESHOLD=1)
+    def test_with_worker_schedules_large_groups(self):
+        self.create_game()
+        response = self.delete()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertTrue(Group.objects.filter(pk=self.group.pk).exists())
+        self.assertEqual(list(Job.objects.values_list("name", flat=True)), ["delete_group"])
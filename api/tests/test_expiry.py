@@ -0,0 +1,69 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import Group, GroupInvite, PasswordResetToken, RevokedToken, User
+
+
+class ExpiryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", "owner@example.com", "senha")
+        self.group = Group.objects.create(name="Mesa", created_by=self.user)
+        self.past = timezone.now() - timezone.timedelta(minutes=1)
+
+    def invite(self, token, **fields):
+        return GroupInvite.objects.create(
+            group=self.group, invited_by=self.user, token=token, **fields
+        )
+
+    def test_defaults_and_sql_validity(self):
+        token = PasswordResetToken.objects.create(user=self.user, token="fresh")
+        self.assertAlmostEqual(
+            token.expires_at, token.created_at + PasswordResetToken.LIFETIME,
+            delta=timezone.timedelta(seconds=5),
+        )
+        PasswordResetToken.objects.create(user=self.user, token="old", expires_at=self.past)
+        self.assertEqual(
+            list(PasswordResetToken.objects.valid().values_list("token", flat=True)), ["fresh"],
+        )
+
+        self.invite("open")
+        self.invite("accepted", accepted_at=timezone.now())
+        self.invite("revoked", revoked_at=timezone.now())
+        self.invite("late", expires_at=self.past)
+        self.assertEqual(list(GroupInvite.objects.valid().values_list("token", flat=True)), ["open"])
+
+    def test_expired_reset_token_is_rejected(self):
+        PasswordResetToken.objects.create(user=self.user, token="old", expires_at=self.past)
+        response = self.client.post(
+            "/api/password_reset/confirm/", {"token": "old", "password": "nova"}, format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+        PasswordResetToken.objects.create(user=self.user, token="fresh")
+        response = self.client.post(
+            "/api/password_reset/confirm/", {"token": "fresh", "password": "nova"}, format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("nova"))
+
+    def test_purge_removes_only_expired_rows(self):
+        for n in range(3):
+            PasswordResetToken.objects.create(user=self.user, token=f"old{n}", expires_at=self.past)
+        PasswordResetToken.objects.create(user=self.user, token="fresh")
+        self.invite("late", expires_at=self.past)
+        self.invite("open")
+        RevokedToken.objects.create(jti="gone", expires_at=self.past)
+        RevokedToken.objects.create(jti="live", expires_at=timezone.now() + timezone.timedelta(hours=1))
+
+        out = StringIO()
+        call_command("purge_expired", batch_size=2, stdout=out)
+
+        self.assertEqual(list(PasswordResetToken.objects.values_list("token", flat=True)), ["fresh"])
+        self.assertEqual(list(GroupInvite.objects.values_list("token", flat=True)), ["open"])
+        self.assertEqual(list(RevokedToken.objects.values_list("jti", flat=True)), ["live"])
+        self.assertIn("password_reset_tokens: 3 removidos.", out.getvalue())
+        self.assertIn("Total: 5 linhas removidas.", out.getvalue())
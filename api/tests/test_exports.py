@@ -0,0 +1,36 @@
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .base import PokerdexTestCase
+
+HEADER = "game_id,date,title,location,buy_in,player_id,player,rebuy,final_balance,net"
+
+
+class ExportTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        game_id = self.create_game(buy_in="50")
+        self.add_participation(game_id, self.owner, final_balance="80", rebuy="10")
+        self.add_participation(game_id, self.player, final_balance="20")
+        self.path = f"/api/groups/{self.group.slug}/export/"
+
+    def test_wsgi_export_streams_sync_iterator(self):
+        response = self.client.get(self.path, {"format": "csv"})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.is_async)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], HEADER)
+        self.assertEqual(lines[1].split(",")[-3:], ["10.00", "80.00", "20.00"])
+
+    async def test_asgi_export_streams_async_iterator(self):
+        token = await sync_to_async(lambda: str(RefreshToken.for_user(self.owner).access_token))()
+        response = await AsyncClient().get(
+            self.path, {"format": "ndjson"}, headers={"Authorization": f"Bearer {token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        # Iterador assíncrono: o handler ASGI envia cada linha sem juntar o corpo.
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 2)
+        self.assertIn(b'"net": "-30.00"', chunks[1])
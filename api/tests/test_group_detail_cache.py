@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from api.models import Group, GroupMembership, User
+
+
+class GroupDetailCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user("owner", "owner@example.com", "senha")
+        self.outsider = User.objects.create_user("outsider", "outsider@example.com", "senha")
+        self.group = Group.objects.create(name="Mesa", description="Sextas", created_by=self.owner)
+        GroupMembership.objects.create(
+            user=self.owner, group=self.group, role=GroupMembership.Role.OWNER
+        )
+        self.path = f"/api/groups/{self.group.slug}/"
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_shared_payload_is_reused_across_viewers(self):
+        owner_view = self.client_for(self.owner).get(self.path).json()
+
+        with CaptureQueriesContext(connection) as queries:
+            outsider_view = self.client_for(self.outsider).get(self.path).json()
+
+        sql = " ".join(query["sql"] for query in queries)
+        self.assertNotIn("api_gamepost", sql)
+        self.assertNotIn('"api_game"', sql)
+        self.assertEqual(outsider_view["memberships"], owner_view["memberships"])
+        self.assertTrue(owner_view["is_member"])
+        self.assertFalse(outsider_view["is_member"])
+        self.assertFalse(outsider_view["is_admin"])
+
+    def test_writes_invalidate_the_cached_payload(self):
+        owner = self.client_for(self.owner)
+        outsider = self.client_for(self.outsider)
+        self.assertEqual(owner.get(self.path).json()["join_requests"], [])
+
+        self.assertEqual(outsider.post(f"{self.path}join_request/").status_code, 200)
+        self.assertTrue(outsider.get(self.path).json()["already_requested"])
+        requests = owner.get(self.path).json()["join_requests"]
+        self.assertEqual([r["requested_by"]["id"] for r in requests], [self.outsider.id])
+        # Só admins veem os pedidos.
+        self.assertEqual(outsider.get(self.path).json()["join_requests"], [])
+
+        response = owner.patch(self.path, {"description": "Sábados"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(outsider.get(self.path).json()["description"], "Sábados")
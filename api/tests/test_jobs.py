@@ -0,0 +1,42 @@
+from django.test import TestCase, override_settings
+
+from api import jobs
+from api.models import Job
+
+
+class EnqueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        jobs.TASKS["test_record"] = lambda **payload: self.calls.append(payload)
+        self.addCleanup(jobs.TASKS.pop, "test_record")
+
+    @override_settings(JOBS_WORKER=False)
+    def test_without_worker_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue("test_record", dedup_key="record", value=1)
+            self.assertEqual(self.calls, [])
+
+        self.assertEqual(self.calls, [{"value": 1}])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_WORKER=False)
+    def test_without_worker_failures_do_not_propagate(self):
+        def fail():
+            raise RuntimeError("falhou")
+
+        jobs.TASKS["test_record"] = fail
+        with self.assertLogs("django", "ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                jobs.enqueue("test_record")
+
+    @override_settings(JOBS_WORKER=True)
+    def test_with_worker_queues_and_dedups(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.enqueue("test_record", dedup_key="record", value=1)
+            jobs.enqueue("test_record", dedup_key="record", value=2)
+
+        self.assertEqual(Job.objects.filter(status=Job.Status.QUEUED).count(), 1)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(jobs.work(burst=True), 1)
+        self.assertEqual(self.calls, [{"value": 1}])
+        self.assertEqual(Job.objects.get().status, Job.Status.DONE)
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from api.memberships import MembershipResolver
+from api.models import Group, GroupMembership, User
+
+ROLES_QUERY = 'FROM "api_groupmembership" WHERE "api_groupmembership"."user_id" ='
+
+
+def role_queries(queries):
+    return [query["sql"] for query in queries if ROLES_QUERY in query["sql"]]
+
+
+class MembershipResolverTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.owner = User.objects.create_user("owner", "owner@example.com", "senha")
+        self.player = User.objects.create_user("player", "player@example.com", "senha")
+        self.group = Group.objects.create(name="Mesa", created_by=self.owner)
+        GroupMembership.objects.create(
+            user=self.owner, group=self.group, role=GroupMembership.Role.OWNER
+        )
+        GroupMembership.objects.create(user=self.player, group=self.group)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_roles_load_once(self):
+        resolver = MembershipResolver(self.player)
+        with self.assertNumQueries(1):
+            self.assertTrue(resolver.is_member(self.group.id))
+            self.assertFalse(resolver.has_role(self.group.id, GroupMembership.Role.ADMIN))
+            self.assertEqual(resolver.role(self.group.id), GroupMembership.Role.MEMBER)
+            self.assertFalse(resolver.is_member(self.group.id + 1))
+
+    def test_group_detail_reads_roles_once(self):
+        client = self.client_for(self.player)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f"/api/groups/{self.group.slug}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["is_member"])
+        self.assertEqual(len(role_queries(queries)), 1)
+
+    @override_settings(MEMBERSHIP_CACHE_TIMEOUT=60)
+    def test_cached_roles_are_invalidated_on_promote(self):
+        client = self.client_for(self.player)
+        self.assertFalse(client.get(f"/api/groups/{self.group.slug}/").json()["is_admin"])
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get(f"/api/groups/{self.group.slug}/")
+        self.assertEqual(role_queries(queries), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(self.owner).post(
+                f"/api/groups/{self.group.slug}/promote/{self.player.id}/"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(client.get(f"/api/groups/{self.group.slug}/").json()["is_admin"])
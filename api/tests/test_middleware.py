@@ -0,0 +1,62 @@
+from itertools import count
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from api import middleware
+from api.middleware import SerializeTimer, registry, timed_serialization
+
+from .base import PokerdexTestCase
+
+
+class TimedSerializationTests(SimpleTestCase):
+    def test_only_outermost_serializer_is_timed(self):
+        class Serializer:
+            @timed_serialization
+            def to_representation(self, instance):
+                return [self.to_representation(child) for child in instance] if instance else "x"
+
+        timer = SerializeTimer()
+        token = middleware._serialize_timer.set(timer)
+        try:
+            with mock.patch.object(middleware, "perf_counter", side_effect=count()):
+                Serializer().to_representation([None, None])
+        finally:
+            middleware._serialize_timer.reset(token)
+
+        # Um par de leituras do relógio: os filhos não somam de novo.
+        self.assertEqual(timer.elapsed, 1)
+
+    def test_noop_outside_instrumented_request(self):
+        class Serializer:
+            @timed_serialization
+            def to_representation(self, instance):
+                return instance
+
+        with mock.patch.object(middleware, "perf_counter") as clock:
+            self.assertEqual(Serializer().to_representation(1), 1)
+        clock.assert_not_called()
+
+
+@override_settings(MIDDLEWARE=["api.middleware.RequestStatsMiddleware", *settings.MIDDLEWARE])
+class RequestStatsTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def test_serialize_metric_is_reported(self):
+        game_id = self.create_game()
+        self.add_participation(game_id, self.player, final_balance="50")
+
+        response = self.client.get("/api/games/")
+
+        self.assertEqual(response.status_code, 200)
+        timings = {
+            name: float(duration.removeprefix("dur="))
+            for name, duration, *_ in (entry.split(";") for entry in response["Server-Timing"].split(", "))
+        }
+        self.assertEqual(set(timings), {"db", "serialize", "render", "total"})
+        self.assertGreater(timings["serialize"], 0)
+        self.assertIn("serialize", registry.summary()["games-list"])
@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+
+from api.models import Game
+
+from .base import PokerdexTestCase
+
+
+class GameCursorPaginationTests(PokerdexTestCase):
+    def pages(self, path):
+        ids = []
+        while path:
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            ids += [game["id"] for game in body["results"]]
+            path = body["next"]
+        return ids
+
+    def test_pages_through_games_with_same_date_and_created_at(self):
+        ids = [self.create_game(date="2025-01-01") for _ in range(5)]
+        created_at = datetime(2025, 1, 1, 20, 0, 0, 123456, tzinfo=timezone.utc)
+        Game.objects.filter(pk__in=ids).update(created_at=created_at)
+
+        self.assertEqual(self.pages("/api/games/?page_size=2"), sorted(ids, reverse=True))
+
+    def test_cursor_keeps_microseconds(self):
+        first = self.create_game()
+        second = self.create_game()
+        Game.objects.filter(pk=first).update(
+            created_at=datetime(2025, 1, 1, 20, 0, 0, 123400, tzinfo=timezone.utc)
+        )
+        Game.objects.filter(pk=second).update(
+            created_at=datetime(2025, 1, 1, 20, 0, 0, 123900, tzinfo=timezone.utc)
+        )
+
+        self.assertEqual(self.pages("/api/games/?page_size=1"), [second, first])
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(self.client.get("/api/games/?cursor=nope").status_code, 404)
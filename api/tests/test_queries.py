@@ -0,0 +1,51 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import GroupMembership, User
+
+from .base import PokerdexTestCase
+
+
+class GameQueryCountTests(PokerdexTestCase):
+    """Lista e detalhe de partidas custam o mesmo número de queries com mais dados."""
+
+    def setUp(self):
+        super().setUp()
+        self.players = [self.owner, self.player]
+        for n in range(4):
+            user = User.objects.create_user(f"extra{n}", f"extra{n}@example.com", "senha")
+            GroupMembership.objects.create(user=user, group=self.group)
+            self.players.append(user)
+
+    def populate(self, games, participants):
+        ids = []
+        for _ in range(games):
+            game_id = self.create_game()
+            for player in self.players[:participants]:
+                self.add_participation(game_id, player, final_balance="50")
+            ids.append(game_id)
+        return ids
+
+    def count_queries(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_query_count_is_constant(self):
+        self.populate(games=2, participants=2)
+        expected = self.count_queries("/api/games/")
+
+        self.populate(games=6, participants=6)
+        with self.assertNumQueries(expected):
+            response = self.client.get("/api/games/")
+        self.assertEqual(len(response.json()["results"]), 8)
+
+    def test_retrieve_query_count_is_constant(self):
+        [small] = self.populate(games=1, participants=2)
+        [large] = self.populate(games=1, participants=6)
+        expected = self.count_queries(f"/api/games/{small}/")
+
+        with self.assertNumQueries(expected):
+            response = self.client.get(f"/api/games/{large}/")
+        self.assertEqual(len(response.json()["participations"]), 6)
@@ -0,0 +1,103 @@
+import datetime
+import io
+import json
+import unittest
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser, MessagePackParser
+from api.renderers import FastJSONRenderer, MessagePackRenderer, msgpack, orjson
+from api.serializers import DecimalField
+
+from .base import PokerdexTestCase
+
+PAYLOAD = {
+    "id": 7,
+    "title": "Noite\u2029 de sexta \u2028 com ç",
+    "buy_in": Decimal("50.00"),
+    "date": datetime.date(2025, 1, 1),
+    "created_at": datetime.datetime(2025, 1, 1, 20, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+    "label": gettext_lazy("Jogo"),
+    "players": [{"id": 1, "net": Decimal("-12.50")}, None, True],
+    3: "chave numérica",
+}
+
+
+class FastJSONTests(SimpleTestCase):
+    @unittest.skipIf(orjson is None, "orjson não instalado")
+    def test_same_bytes_as_drf(self):
+        self.assertEqual(FastJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_indent_falls_back_to_drf(self):
+        media_type = "application/json; indent=2"
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD, media_type),
+            JSONRenderer().render(PAYLOAD, media_type),
+        )
+
+    def test_parser_matches_drf(self):
+        body = JSONRenderer().render(PAYLOAD)
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)),
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b"{nope"))
+
+
+@unittest.skipIf(msgpack is None, "msgpack não instalado")
+class MessagePackTests(SimpleTestCase):
+    def test_round_trip_matches_json_content(self):
+        # Chaves inteiras seguem inteiras no msgpack; no JSON viram texto.
+        payload = {key: value for key, value in PAYLOAD.items() if key != 3}
+        body = MessagePackRenderer().render(payload)
+        self.assertEqual(
+            MessagePackParser().parse(io.BytesIO(body)),
+            json.loads(JSONRenderer().render(payload)),
+        )
+
+    def test_invalid_body(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+
+class DecimalFieldTests(SimpleTestCase):
+    def test_matches_drf_output(self):
+        for options in [
+            {"max_digits": 12, "decimal_places": 2},
+            {"max_digits": 12, "decimal_places": 0},
+            {"max_digits": 12, "decimal_places": 2, "coerce_to_string": False},
+        ]:
+            drf = serializers.DecimalField(**options)
+            fast = DecimalField(**options)
+            for value in ["50.00", "-12.50", "0.00", "1234567890.12", "7", "3.14159", "1E+2", "0"]:
+                with self.subTest(options=options, value=value):
+                    self.assertEqual(
+                        fast.to_representation(Decimal(value)),
+                        drf.to_representation(Decimal(value)),
+                    )
+
+
+@unittest.skipIf(msgpack is None, "msgpack não instalado")
+class NegotiationTests(PokerdexTestCase):
+    def test_msgpack_request_and_response(self):
+        body = MessagePackRenderer().render({
+            "title": "Noite", "buy_in": "50", "group_id": self.group.id, "date": "2025-01-01",
+        })
+        response = self.client.post(
+            "/api/games/", body, content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        game = msgpack.unpackb(response.content)
+        self.assertEqual(game["buy_in"], "50.00")
+
+        as_json = self.client.get(f"/api/games/{game['id']}/").json()
+        as_msgpack = self.client.get(f"/api/games/{game['id']}/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(msgpack.unpackb(as_msgpack.content), as_json)
@@ -0,0 +1,49 @@
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from pokerdex_back import schema
+
+
+class SchemaArtifactTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(OPENAPI_SCHEMA_DIR=directory.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        schema._artifacts.clear()
+        self.addCleanup(schema._artifacts.clear)
+
+    def test_served_from_generated_files_with_etag(self):
+        call_command("generate_schema", stdout=StringIO())
+        content = schema.schema_path("json").read_bytes()
+        self.assertIn("/games/", json.loads(content)["paths"])
+
+        with mock.patch.object(schema, "generate") as generate:
+            response = self.client.get("/docs/swagger.json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, content)
+            etag = response["ETag"]
+
+            response = self.client.get("/docs/swagger.json", HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+            yaml = self.client.get("/docs/swagger.yaml")
+            self.assertEqual(yaml.content, schema.schema_path("yaml").read_bytes())
+            self.assertNotEqual(yaml["ETag"], etag)
+        generate.assert_not_called()
+
+    def test_generated_once_without_files(self):
+        with mock.patch.object(schema, "generate", wraps=schema.generate) as generate:
+            with self.assertLogs("pokerdex_back.schema", "WARNING"):
+                first = self.client.get("/docs/swagger.json")
+            second = self.client.get("/docs/swagger.json")
+
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
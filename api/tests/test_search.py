@@ -0,0 +1,68 @@
+from django.db import connection
+from rest_framework.test import APITestCase
+
+from api.models import Game, Group, User
+from api.search import _fallback_search, backend_for, search
+
+
+def names(queryset):
+    return list(queryset.order_by("-search_rank", "name").values_list("name", flat=True))
+
+
+class SearchIndexTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", "owner@example.com", "senha")
+
+    def group(self, name, description=""):
+        return Group.objects.create(name=name, description=description, created_by=self.user)
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        group = self.group("Torneio da sexta")
+        self.assertEqual(names(search(Group.objects.all(), "torneio")), ["Torneio da sexta"])
+
+        group.name = "Cash game de sábado"
+        group.save()
+        self.assertEqual(names(search(Group.objects.all(), "torneio")), [])
+        self.assertEqual(names(search(Group.objects.all(), "sabado")), ["Cash game de sábado"])
+
+        group.delete()
+        self.assertEqual(names(search(Group.objects.all(), "cash")), [])
+
+    def test_prefix_terms_must_all_match(self):
+        self.group("Torneio da sexta")
+        self.group("Torneio de domingo")
+
+        self.assertEqual(names(search(Group.objects.all(), "torn dom")), ["Torneio de domingo"])
+        self.assertEqual(len(names(search(Group.objects.all(), "torn"))), 2)
+
+    def test_name_ranks_above_description(self):
+        if backend_for(connection) is _fallback_search:
+            self.skipTest("Busca sem índice não ranqueia.")
+        self.group("Mesa do bairro", description="Poker toda sexta")
+        self.group("Poker dos amigos")
+
+        self.assertEqual(
+            names(search(Group.objects.all(), "poker")), ["Poker dos amigos", "Mesa do bairro"],
+        )
+
+    def test_games_are_indexed_by_title_and_location(self):
+        group = self.group("Mesa")
+        Game.objects.create(
+            title="Final", location="Casa do João", buy_in="50", date="2025-01-01",
+            group=group, created_by=self.user,
+        )
+
+        self.assertEqual(search(Game.objects.all(), "joao").count(), 1)
+        self.assertEqual(search(Game.objects.all(), "fin").count(), 1)
+        self.assertEqual(search(Game.objects.all(), "bar").count(), 0)
+
+    def test_group_list_search(self):
+        self.group("Torneio da sexta")
+        self.group("Cash game")
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get("/api/groups/", {"search": "torneio"})
+
+        self.assertEqual(response.status_code, 200)
+        found = [group["name"] for section in response.json().values() for group in section["results"]]
+        self.assertEqual(found, ["Torneio da sexta"])
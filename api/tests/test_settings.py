@@ -0,0 +1,63 @@
+import os
+import runpy
+import tempfile
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import SimpleTestCase
+
+
+def load_settings(**env):
+    """Executa pokerdex_back/settings.py de novo com as variáveis de ambiente dadas."""
+    names = ["DB_ENGINE", "DB_POOL", "DB_CONN_MAX_AGE", "SQLITE_PATH"]
+    clean = {key: value for key, value in os.environ.items() if key not in names}
+    with mock.patch.dict(os.environ, {**clean, **env}, clear=True):
+        return runpy.run_path(str(Path(settings.BASE_DIR) / "pokerdex_back" / "settings.py"))
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    def test_pragmas_and_transaction_mode(self):
+        database = load_settings()["DATABASES"]["default"]
+        self.assertEqual(database["ENGINE"], "django.db.backends.sqlite3")
+        pragmas = database["OPTIONS"]["init_command"].split(";")
+        self.assertIn("PRAGMA journal_mode=WAL", pragmas)
+        self.assertIn("PRAGMA busy_timeout=5000", pragmas)
+        self.assertIn("PRAGMA synchronous=NORMAL", pragmas)
+        self.assertEqual(database["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+
+    @skipUnless(connection.vendor == "sqlite", "perfil SQLite")
+    def test_new_connections_apply_pragmas(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Conexão avulsa com as mesmas OPTIONS, em um arquivo (o banco de
+            # teste do SQLite fica em memória e não usa WAL).
+            wrapper = type(connections["default"])(
+                {**connection.settings_dict, "NAME": str(Path(directory) / "db.sqlite3")}, "pragmas",
+            )
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {
+                        pragma: cursor.execute(f"PRAGMA {pragma}").fetchone()[0]
+                        for pragma in ["journal_mode", "busy_timeout", "synchronous"]
+                    }
+            finally:
+                wrapper.close()
+
+        self.assertEqual(values, {"journal_mode": "wal", "busy_timeout": 5000, "synchronous": 1})
+
+
+class PostgresProfileTests(SimpleTestCase):
+    def test_persistent_connections(self):
+        database = load_settings(DB_ENGINE="postgres")["DATABASES"]["default"]
+        self.assertEqual(database["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual(database["CONN_MAX_AGE"], 60)
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+        self.assertNotIn("pool", database["OPTIONS"])
+
+    def test_pool_disables_persistent_connections(self):
+        database = load_settings(DB_ENGINE="postgres", DB_POOL="1")["DATABASES"]["default"]
+        self.assertEqual(database["CONN_MAX_AGE"], 0)
+        self.assertEqual(
+            database["OPTIONS"]["pool"], {"min_size": 2, "max_size": 10, "timeout": 10},
+        )
@@ -0,0 +1,22 @@
+from decimal import Decimal
+
+from .base import PokerdexTestCase
+
+
+class SettlementTests(PokerdexTestCase):
+    def test_transfers(self):
+        game_id = self.create_game(buy_in="50")
+        self.add_participation(game_id, self.owner, final_balance="80")
+        self.add_participation(game_id, self.player, final_balance="20")
+
+        response = self.client.get(f"/api/games/{game_id}/settlement/")
+        self.assertEqual(response.status_code, 200)
+        [transfer] = response.json()["transfers"]
+        self.assertEqual(transfer["from"]["id"], self.player.id)
+        self.assertEqual(transfer["to"]["id"], self.owner.id)
+        self.assertEqual(Decimal(transfer["amount"]), Decimal("30"))
+
+    def test_unknown_or_malformed_pk_is_not_found(self):
+        for path in ["/api/games/999999/settlement/", "/api/games/abc/settlement/"]:
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).status_code, 404)
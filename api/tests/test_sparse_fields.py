@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .base import PokerdexTestCase
+
+
+class SparseFieldsTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        self.game_id = self.create_game()
+        self.add_participation(self.game_id, self.owner, final_balance="80")
+
+    def get(self, path, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), " ".join(query["sql"] for query in queries)
+
+    def test_game_fields_prune_payload_and_queries(self):
+        body, sql = self.get("/api/games/", fields="id,title")
+        self.assertEqual(body["results"], [{"id": self.game_id, "title": "Noite"}])
+        self.assertNotIn("api_gameparticipation", sql)
+        self.assertNotIn('"api_user"', sql)
+
+        body, sql = self.get(f"/api/games/{self.game_id}/", expand="")
+        self.assertNotIn("participations", body)
+        self.assertIn("created_by", body)
+        self.assertNotIn("api_gameparticipation", sql)
+
+        body, _ = self.get(f"/api/games/{self.game_id}/", fields="id,participations", expand="")
+        self.assertEqual(set(body), {"id", "participations"})
+        self.assertEqual(body["participations"][0]["player"]["id"], self.owner.id)
+
+    def test_full_payload_without_params(self):
+        body, _ = self.get(f"/api/games/{self.game_id}/")
+        self.assertIn("participations", body)
+        self.assertIn("is_group_creator", body)
+
+    def test_group_fields(self):
+        body, _ = self.get(f"/api/groups/{self.group.slug}/", fields="name,is_member")
+        self.assertEqual(body, {"name": "Mesa", "is_member": True})
+
+        body, sql = self.get(f"/api/groups/{self.group.slug}/", expand="memberships")
+        self.assertEqual(len(body["memberships"]), 2)
+        self.assertNotIn("recent_games", body)
+        self.assertNotIn("api_gamepost", sql)
+
+        body, _ = self.get("/api/groups/", fields="id,name")
+        self.assertEqual(body["myGroups"]["results"], [{"id": self.group.id, "name": "Mesa"}])
+
+    def test_unknown_fields_are_rejected(self):
+        self.assertEqual(self.client.get("/api/games/", {"fields": "id,nope"}).status_code, 400)
+        response = self.client.get(f"/api/groups/{self.group.slug}/", {"expand": "name"})
+        self.assertEqual(response.status_code, 400)
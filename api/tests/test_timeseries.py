@@ -0,0 +1,75 @@
+from django.test import SimpleTestCase
+
+from api.models import User
+from api.timeseries import lttb
+
+from .base import PokerdexTestCase
+
+
+class LttbTests(SimpleTestCase):
+    def sample(self, values, threshold):
+        points = list(enumerate(values))
+        return lttb(points, threshold, x=lambda p: p[0], y=lambda p: p[1])
+
+    def test_keeps_endpoints_and_size(self):
+        sampled = self.sample(range(100), 10)
+        self.assertEqual(len(sampled), 10)
+        self.assertEqual((sampled[0], sampled[-1]), ((0, 0), (99, 99)))
+        self.assertEqual(sampled, sorted(sampled))
+
+    def test_keeps_peaks(self):
+        values = [0] * 50
+        values[17], values[33] = 100, -100
+        sampled = [value for _, value in self.sample(values, 6)]
+        self.assertIn(100, sampled)
+        self.assertIn(-100, sampled)
+
+    def test_short_series_is_untouched(self):
+        self.assertEqual(self.sample([1, 2, 3], 5), [(0, 1), (1, 2), (2, 3)])
+        self.assertEqual(self.sample([1, 2, 3], 2), [(0, 1), (2, 3)])
+
+
+class BankrollEndpointTests(PokerdexTestCase):
+    def setUp(self):
+        super().setUp()
+        for day, owner_balance in [(1, "80"), (2, "10"), (3, "100"), (4, "50")]:
+            game_id = self.create_game(buy_in="50", date=f"2025-01-{day:02d}")
+            self.add_participation(game_id, self.owner, final_balance=owner_balance)
+            self.add_participation(game_id, self.player, final_balance="40", rebuy="5")
+        self.path = f"/api/groups/{self.group.slug}/bankroll/"
+
+    def series(self, **params):
+        response = self.client.get(self.path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {entry["player"]["id"]: entry for entry in response.json()["players"]}
+
+    def test_cumulative_balance_per_player(self):
+        series = self.series()
+        owner = series[self.owner.id]
+        self.assertEqual(owner["games"], 4)
+        self.assertEqual(
+            [(p["date"], p["net"], p["cumulative"]) for p in owner["points"]],
+            [
+                ("2025-01-01", "30.00", "30.00"),
+                ("2025-01-02", "-40.00", "-10.00"),
+                ("2025-01-03", "50.00", "40.00"),
+                ("2025-01-04", "0.00", "40.00"),
+            ],
+        )
+        self.assertEqual(series[self.player.id]["points"][-1]["cumulative"], "-60.00")
+
+    def test_downsampling_and_player_filter(self):
+        series = self.series(points=3, player=self.owner.id)
+        self.assertEqual(list(series), [self.owner.id])
+        points = series[self.owner.id]["points"]
+        # O vale da segunda noite é o ponto que mais muda o desenho.
+        self.assertEqual([p["date"] for p in points], ["2025-01-01", "2025-01-02", "2025-01-04"])
+        self.assertEqual(series[self.owner.id]["games"], 4)
+
+    def test_invalid_params_and_non_members(self):
+        self.assertEqual(self.client.get(self.path, {"points": "1"}).status_code, 400)
+        self.assertEqual(self.client.get(self.path, {"player": "x"}).status_code, 400)
+
+        outsider = User.objects.create_user("outsider", "outsider@example.com", "senha")
+        self.client.force_authenticate(outsider)
+        self.assertEqual(self.client.get(self.path).status_code, 403)
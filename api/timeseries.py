@@ -0,0 +1,125 @@
+"""
+Série temporal do saldo acumulado de cada jogador dentro de um grupo.
+
+O acumulado sai do banco via função de janela (SUM ... OVER, particionado
+por jogador e ordenado pela data da partida). A redução para `points`
+pontos por jogador usa Largest-Triangle-Three-Buckets (LTTB), que preserva
+picos e vales do gráfico melhor do que amostrar a cada N partidas.
+"""
+from decimal import Decimal
+
+from django.db.models import F, Sum, Window
+from django.db.models.expressions import RowRange
+
+from .aggregates import net_expression
+from .models import GameParticipation
+
+CENTS = Decimal("0.01")
+
+CHUNK_SIZE = 2000
+
+
+def bankroll_rows(group, player_ids=None):
+    """Uma linha por participação, com o resultado da noite e o acumulado."""
+    participations = GameParticipation.objects.filter(game__group=group)
+    if player_ids:
+        participations = participations.filter(player_id__in=player_ids)
+
+    chronological = [F("game__date").asc(), F("game__created_at").asc(), F("game_id").asc()]
+    return (
+        participations
+        .annotate(
+            net=net_expression(),
+            cumulative=Window(
+                Sum(net_expression()),
+                partition_by=[F("player_id")],
+                order_by=chronological,
+                frame=RowRange(start=None, end=0),
+            ),
+        )
+        .order_by("player_id", *chronological)
+        .values_list("player_id", "player__username", "game_id", "game__date", "net", "cumulative")
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+
+
+def lttb(points, threshold, x, y):
+    """
+    Reduz `points` a `threshold` pontos (Largest-Triangle-Three-Buckets).
+    O primeiro e o último ponto são sempre mantidos.
+    """
+    size = len(points)
+    if threshold >= size:
+        return points
+    if threshold < 3:
+        return [points[0], points[-1]][:threshold]
+
+    sampled = [points[0]]
+    every = (size - 2) / (threshold - 2)
+    anchor = 0
+
+    for bucket in range(threshold - 2):
+        next_start = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, size)
+        following = points[next_start:next_end] or points[-1:]
+        avg_x = sum(x(point) for point in following) / len(following)
+        avg_y = sum(y(point) for point in following) / len(following)
+
+        ax, ay = x(points[anchor]), y(points[anchor])
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+
+        chosen, largest = start, -1.0
+        for index in range(start, end):
+            area = abs(
+                (ax - avg_x) * (y(points[index]) - ay)
+                - (ax - x(points[index])) * (avg_y - ay)
+            )
+            if area > largest:
+                chosen, largest = index, area
+
+        sampled.append(points[chosen])
+        anchor = chosen
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def _x(point):
+    return point["date"].toordinal()
+
+
+def _y(point):
+    return float(point["cumulative"])
+
+
+def bankroll_series(group, player_ids=None, points=None):
+    """
+    Agrupa as linhas por jogador e, se `points` for informado, reduz cada
+    série a no máximo `points` pontos.
+    """
+    series = []
+    current = None
+
+    for player_id, username, game_id, date, net, cumulative in bankroll_rows(group, player_ids):
+        if current is None or current["player"]["id"] != player_id:
+            current = {"player": {"id": player_id, "username": username}, "games": 0, "points": []}
+            series.append(current)
+
+        current["games"] += 1
+        current["points"].append({
+            "game_id": game_id,
+            "date": date,
+            "net": Decimal(net).quantize(CENTS),
+            "cumulative": Decimal(cumulative).quantize(CENTS),
+        })
+
+    for entry in series:
+        if points:
+            entry["points"] = lttb(entry["points"], points, _x, _y)
+        # Mesmo formato dos DecimalFields dos serializers.
+        for point in entry["points"]:
+            point["net"] = str(point["net"])
+            point["cumulative"] = str(point["cumulative"])
+
+    return series
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .auth_views import SignupView, LoginView, LogoutView, MeView
@@ -7,8 +8,10 @@ from .views import (
     GroupRequestViewSet,
     GameViewSet,
     GameParticipationViewSet,
+    PlayerViewSet,
     request_password_reset,
-    confirm_password_reset
+    confirm_password_reset,
+    request_stats,
 )
 
 router = DefaultRouter()
@@ -18,6 +21,7 @@ router.register(r"group-requests", GroupRequestViewSet, basename="group-requests
 
 router.register(r"games", GameViewSet, basename="games")
 router.register(r"participations", GameParticipationViewSet, basename="participations")
+router.register(r"players", PlayerViewSet, basename="players")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -27,4 +31,10 @@ urlpatterns = [
     path("auth/me/", MeView.as_view()),
     path("password_reset/", request_password_reset),
     path("password_reset/confirm/", confirm_password_reset),
+    path("stats/requests/", request_stats),
 ]
+
+if settings.ASYNC_READ_VIEWS:
+    from .async_views import async_urlpatterns
+
+    urlpatterns = async_urlpatterns(router) + urlpatterns
@@ -1,24 +1,70 @@
 import secrets
+from decimal import Decimal
 from .models import PasswordResetToken, User
-from rest_framework import viewsets
-from rest_framework.decorators import action, api_view
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import generics, viewsets
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Max, Q
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.utils.dateparse import parse_date
 
 from .models import (
     Group, GroupMembership, GroupRequest,
-    Game, GamePost, GameParticipation
+    Game, GamePost, GameParticipation,
+    GroupLeaderboardEntry, PlayerStats,
 )
 from .serializers import (
     GroupSerializer, GroupDetailSerializer,
     GroupRequestSerializer,
     GameSerializer,
     GameParticipationSerializer,
+    LeaderboardEntrySerializer,
+    ParticipationBulkSerializer,
+    PlayerStatsSerializer,
+    sparse_fieldset,
 )
+from .aggregates import (
+    participations_changed,
+    adjust_member_count,
+    adjust_game_count,
+    adjust_game_totals,
+    buy_in_changed,
+    recount_games,
+    record_post,
+    stat_rows,
+    touch_group,
+)
+from .conditional import (
+    ConditionalGetMixin,
+    game_detail_marker,
+    game_list_marker,
+    group_detail_marker,
+    group_list_marker,
+    group_request_detail_marker,
+    group_request_list_marker,
+)
+from .deletion import (
+    delete_game,
+    delete_group,
+    schedule_group_deletion,
+    should_delete_in_background,
+)
+from .jobs import enqueue
+from .pagination import GameCursorPagination, GroupSectionPagination
+from .search import search
+from .memberships import memberships, invalidate_memberships
+from .authentication import invalidate_user
+from .renderers import CSVRenderer, NDJSONRenderer
+from .exports import export_stream
+from .timeseries import bankroll_series
+from .settlement import settlement_payload
+from .middleware import registry as request_stats_registry
 from .permissions import (
     IsGroupAdmin, IsGroupCreator,
     IsGameCreatorOrGroupCreator,
@@ -26,6 +72,23 @@ from .permissions import (
     IsGroupMember,
 )
 
+def date_range_filter(params, prefix=""):
+    """Lookups de `?date_from=`/`?date_to=` (AAAA-MM-DD) sobre o campo `date`."""
+    lookups = {}
+    for param, lookup in (("date_from", "date__gte"), ("date_to", "date__lte")):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            date = parse_date(value)
+        except ValueError:
+            date = None
+        if date is None:
+            raise ValidationError({param: "Data inválida, use AAAA-MM-DD."})
+        lookups[prefix + lookup] = date
+    return lookups
+
+
 @api_view(["POST"])
 def request_password_reset(request):
     identifier = request.data.get("email")  # ou email/cpf/etc
@@ -38,6 +101,7 @@ def request_password_reset(request):
 
     token = secrets.token_hex(32)
     PasswordResetToken.objects.create(user=user, token=token)
+    enqueue("purge_expired", dedup_key="purge-expired")
 
     return Response({
         "detail": "Token gerado com sucesso!",
@@ -49,21 +113,34 @@ def confirm_password_reset(request):
     token = request.data.get("token")
     password = request.data.get("password")
 
-    reset = PasswordResetToken.objects.filter(token=token).first()
-    if not reset or not reset.is_valid():
+    reset = PasswordResetToken.objects.valid().select_related("user").filter(token=token).first()
+    if not reset:
         return Response({"detail": "Token inválido ou expirado"}, status=400)
 
     user = reset.user
     user.set_password(password)
     user.save()
     reset.delete()
+    invalidate_user(user.id)
 
     return Response({"detail": "Senha redefinida com sucesso!"})
 
-class GroupViewSet(viewsets.ModelViewSet):
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def request_stats(request):
+    if request.method == "DELETE":
+        request_stats_registry.reset()
+        return Response(status=204)
+    return Response(request_stats_registry.summary())
+
+class GroupViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Group.objects.all().select_related("created_by")
     serializer_class = GroupSerializer
     lookup_field = "slug"
+    conditional_markers = {
+        "list": group_list_marker,
+        "retrieve": group_detail_marker,
+    }
 
     def get_permissions(self):
         if self.action in ["create", "list", "retrieve"]:
@@ -78,57 +155,114 @@ class GroupViewSet(viewsets.ModelViewSet):
         if self.action in ["leave", "join_request"]:
             return [IsAuthenticated()]
 
+        if self.action in ["export", "bankroll", "settlement"]:
+            return [IsAuthenticated(), IsGroupMember()]
+
         return [IsAuthenticated()]
 
+    list_sections = {
+        "myGroups": Q(is_member=True),
+        "requestedGroups": Q(is_member=False, requested=True),
+        "otherGroups": Q(is_member=False, requested=False),
+    }
+
     def list(self, request, *args, **kwargs):
+        base_qs = self.list_queryset(request)
+
+        section = self.requested_section(request)
+        if section is not None:
+            return Response(self.list_section(request, base_qs, section))
+
+        return Response({
+            name: self.list_section(request, base_qs, name)
+            for name in self.list_sections
+        })
+
+    def list_queryset(self, request):
         user = request.user
         search_term = request.query_params.get("search", "").strip()
 
-        base_qs = Group.objects.all().select_related("created_by")
+        # is_member/requested separam as seções; o criador só é carregado
+        # se o campo foi pedido.
+        base_qs = Group.objects.annotate(
+            is_member=Exists(
+                GroupMembership.objects.filter(group_id=OuterRef("pk"), user_id=user.id)
+            ),
+            requested=Exists(
+                GroupRequest.objects.filter(group_id=OuterRef("pk"), requested_by_id=user.id)
+            ),
+        )
+        if "created_by" in GroupSerializer.selected_fields(**sparse_fieldset(request)):
+            base_qs = base_qs.select_related("created_by")
 
         if search_term:
-            base_qs = base_qs.filter(
-                Q(name__icontains=search_term) |
-                Q(description__icontains=search_term)
-            )
-
-        my_groups = (
-            base_qs.filter(memberships__user=user)
-            .annotate(
-                member_count=Count("memberships", distinct=True),
-                post_count=Count("posts", distinct=True),
-                last_post=Max("posts__posted_at"),
-            ).distinct()
+            base_qs = search(base_qs, search_term)
+        return base_qs
+
+    def requested_section(self, request):
+        section = request.query_params.get("section")
+        if section is not None and section not in self.list_sections:
+            raise ValidationError({"section": f"Seções válidas: {', '.join(self.list_sections)}."})
+        return section
+
+    def list_section(self, request, base_qs, section):
+        paginator = GroupSectionPagination()
+        groups = paginator.paginate_queryset(
+            base_qs.filter(self.list_sections[section]), request, view=self
         )
+        return self.section_payload(request, paginator, groups, section)
 
-        requested_groups = base_qs.filter(
-            join_requests__requested_by=user
-        ).distinct()
-
-        other_groups = (
-            base_qs.exclude(memberships__user=user)
-            .exclude(join_requests__requested_by=user)
-            .annotate(
-                member_count=Count("memberships", distinct=True),
-                post_count=Count("posts", distinct=True),
-                last_post=Max("posts__posted_at"),
-            ).distinct()
-        )
+    def section_payload(self, request, paginator, groups, section):
+        next_link = paginator.get_next_link()
+        if next_link:
+            next_link = replace_query_param(next_link, "section", section)
 
-        return Response({
-            "myGroups": GroupSerializer(my_groups, many=True, context={"request": request}).data,
-            "requestedGroups": GroupSerializer(requested_groups, many=True, context={"request": request}).data,
-            "otherGroups": GroupSerializer(other_groups, many=True, context={"request": request}).data,
-        })
+        return {
+            "next": next_link,
+            "results": GroupSerializer(
+                groups, many=True, context={"request": request}, **sparse_fieldset(request)
+            ).data,
+        }
 
     def perform_create(self, serializer):
         with transaction.atomic():
-            group = serializer.save(created_by=self.request.user)
+            group = serializer.save(created_by_id=self.request.user.id, member_count=1)
             GroupMembership.objects.create(
-                user=self.request.user,
+                user_id=self.request.user.id,
                 group=group,
                 role=GroupMembership.Role.OWNER
             )
+            invalidate_memberships([self.request.user.id], request=self.request)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            group = serializer.save()
+            touch_group(group.id)
+
+    def destroy(self, request, *args, **kwargs):
+        group = self.get_object()
+        if self.remove_group(request, group):
+            return Response({"detail": "Remoção do grupo agendada."}, status=202)
+        return Response(status=204)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            delete_group(instance.id, request=self.request)
+
+    def remove_group(self, request, group):
+        """
+        Remove o grupo na própria request ou, para grupos grandes (ou com
+        ?background=1), agenda a remoção. Devolve True se foi agendada.
+        """
+        background = should_delete_in_background(
+            group, requested=request.query_params.get("background") == "1"
+        )
+        if background:
+            schedule_group_deletion(group.id)
+            memberships(request).reset()
+        else:
+            self.perform_destroy(group)
+        return background
 
     @action(
         detail=True,
@@ -138,13 +272,15 @@ class GroupViewSet(viewsets.ModelViewSet):
     def join_request(self, request, slug=None):
         group = self.get_object()
 
-        if GroupMembership.objects.filter(group=group, user=request.user).exists():
+        if memberships(request).is_member(group.id):
             return Response({"detail": "Você já é membro."}, status=400)
 
-        if GroupRequest.objects.filter(group=group, requested_by=request.user).exists():
+        if GroupRequest.objects.filter(group=group, requested_by_id=request.user.id).exists():
             return Response({"detail": "Pedido já enviado."}, status=400)
 
-        GroupRequest.objects.create(group=group, requested_by=request.user)
+        with transaction.atomic():
+            GroupRequest.objects.create(group=group, requested_by_id=request.user.id)
+            touch_group(group.id)
         return Response({"detail": "Pedido enviado."})
 
     @action(detail=True, methods=["post"], url_path="promote/(?P<user_id>[^/.]+)")
@@ -152,11 +288,14 @@ class GroupViewSet(viewsets.ModelViewSet):
         group = self.get_object()
         target_user = get_object_or_404(GroupMembership, group=group, user_id=user_id)
 
-        if target_user.user == group.created_by:
+        if target_user.user_id == group.created_by_id:
             return Response({"detail": "O criador já é admin."}, status=400)
 
-        target_user.role = GroupMembership.Role.ADMIN
-        target_user.save()
+        with transaction.atomic():
+            target_user.role = GroupMembership.Role.ADMIN
+            target_user.save()
+            touch_group(group.id)
+        invalidate_memberships([target_user.user_id], request=request)
 
         return Response({"detail": "Usuário promovido."})
 
@@ -165,11 +304,14 @@ class GroupViewSet(viewsets.ModelViewSet):
         group = self.get_object()
         target_user = get_object_or_404(GroupMembership, group=group, user_id=user_id)
 
-        if target_user.user == group.created_by:
+        if target_user.user_id == group.created_by_id:
             return Response({"detail": "Não pode rebaixar o criador."}, status=400)
 
-        target_user.role = GroupMembership.Role.MEMBER
-        target_user.save()
+        with transaction.atomic():
+            target_user.role = GroupMembership.Role.MEMBER
+            target_user.save()
+            touch_group(group.id)
+        invalidate_memberships([target_user.user_id], request=request)
 
         return Response({"detail": "Usuário rebaixado."})
 
@@ -180,9 +322,12 @@ class GroupViewSet(viewsets.ModelViewSet):
         if int(user_id) == group.created_by_id:
             return Response({"detail": "Não pode remover o criador."}, status=400)
 
-        deleted = GroupMembership.objects.filter(
-            group=group, user_id=user_id
-        ).delete()
+        with transaction.atomic():
+            deleted, _ = GroupMembership.objects.filter(
+                group=group, user_id=user_id
+            ).delete()
+            adjust_member_count(group.id, -deleted)
+            invalidate_memberships([int(user_id)], request=request)
 
         return Response({
             "detail": "Membro removido." if deleted else "Não era membro."
@@ -193,46 +338,117 @@ class GroupViewSet(viewsets.ModelViewSet):
         group = self.get_object()
         user = request.user
 
-        if user == group.created_by:
+        new_owner = None
+        if user.id == group.created_by_id:
+            # Admin mais antigo; na falta, o membro mais antigo. Uma só query.
             new_owner = (
                 GroupMembership.objects
-                .filter(group=group, role=GroupMembership.Role.ADMIN)
-                .exclude(user=user)
-                .order_by("joined_at")
+                .filter(
+                    group=group,
+                    role__in=[GroupMembership.Role.ADMIN, GroupMembership.Role.MEMBER],
+                )
+                .exclude(user_id=user.id)
+                .order_by(
+                    Case(When(role=GroupMembership.Role.ADMIN, then=Value(0)), default=Value(1)),
+                    "joined_at",
+                )
+                .values_list("pk", "user_id")
                 .first()
             )
 
-            if not new_owner:
-                new_owner = (
-                    GroupMembership.objects
-                    .filter(group=group, role=GroupMembership.Role.MEMBER)
-                    .exclude(user=user)
-                    .order_by("joined_at")
-                    .first()
-                )
-
-            if new_owner:
-                group.created_by = new_owner.user
-                group.save()
-                new_owner.role = GroupMembership.Role.ADMIN
-                new_owner.save()
-            else:
-                group.delete()
+            if new_owner is None:
+                if self.remove_group(request, group):
+                    return Response({"detail": "Remoção do grupo agendada."}, status=202)
                 return Response({"detail": "Grupo deletado."})
 
-        GroupMembership.objects.filter(group=group, user=user).delete()
+        with transaction.atomic():
+            if new_owner is not None:
+                membership_id, owner_id = new_owner
+                Group.objects.filter(pk=group.id).update(created_by_id=owner_id)
+                GroupMembership.objects.filter(pk=membership_id).update(
+                    role=GroupMembership.Role.ADMIN
+                )
+                invalidate_memberships([owner_id])
+
+            deleted, _ = GroupMembership.objects.filter(group=group, user_id=user.id).delete()
+            adjust_member_count(group.id, -deleted)
+            invalidate_memberships([user.id], request=request)
         return Response({"detail": "Você saiu do grupo."})
 
 
     def retrieve(self, request, *args, **kwargs):
         group = self.get_object()
-        serializer = GroupDetailSerializer(group, context={"request": request})
+        serializer = GroupDetailSerializer(
+            group, context={"request": request}, **sparse_fieldset(request)
+        )
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def leaderboard(self, request, slug=None):
+        entries = list(
+            GroupLeaderboardEntry.objects
+            .filter(group__slug=slug)
+            .select_related("player")
+            .order_by("-net_result", "player_id")
+        )
+
+        if not entries:
+            get_object_or_404(Group, slug=slug)
+
+        return Response(LeaderboardEntrySerializer(entries, many=True).data)
+
+    @action(detail=True, methods=["get"])
+    def bankroll(self, request, slug=None):
+        group = self.get_object()
+
+        player_ids = request.query_params.getlist("player")
+        if not all(player_id.isdigit() for player_id in player_ids):
+            raise ValidationError({"player": "Informe ids numéricos de jogadores."})
+
+        points = request.query_params.get("points")
+        if points is not None:
+            if not points.isdigit() or int(points) < 2:
+                raise ValidationError({"points": "Informe um inteiro maior ou igual a 2."})
+            points = int(points)
 
-class GroupRequestViewSet(viewsets.ModelViewSet):
+        return Response({
+            "players": bankroll_series(group, player_ids=player_ids, points=points),
+        })
+
+    @action(detail=True, methods=["get"])
+    def settlement(self, request, slug=None):
+        group = self.get_object()
+        games = Game.objects.filter(group=group, **date_range_filter(request.query_params))
+        participations = GameParticipation.objects.filter(
+            game__group=group,
+            **date_range_filter(request.query_params, prefix="game__"),
+        )
+
+        return Response({
+            "games": games.count(),
+            **settlement_payload(participations),
+        })
+
+    @action(detail=True, methods=["get"], renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def export(self, request, slug=None):
+        group = self.get_object()
+        export_format = request.accepted_renderer.format
+        content_type, content = export_stream(
+            group, export_format, asynchronous=isinstance(request._request, ASGIRequest)
+        )
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{group.slug}.{export_format}"'
+        return response
+
+
+class GroupRequestViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = GroupRequest.objects.all().select_related("group", "requested_by")
     serializer_class = GroupRequestSerializer
+    conditional_markers = {
+        "list": group_request_list_marker,
+        "retrieve": group_request_detail_marker,
+    }
 
     def get_permissions(self):
         if self.action in ["list", "create", "retrieve"]:
@@ -248,23 +464,75 @@ class GroupRequestViewSet(viewsets.ModelViewSet):
         join_request = self.get_object()
         group = join_request.group
 
-        GroupMembership.objects.get_or_create(
-            user=join_request.requested_by,
-            group=group,
-            defaults={"role": GroupMembership.Role.MEMBER},
-        )
-        join_request.delete()
+        with transaction.atomic():
+            _, created = GroupMembership.objects.get_or_create(
+                user=join_request.requested_by,
+                group=group,
+                defaults={"role": GroupMembership.Role.MEMBER},
+            )
+            if created:
+                adjust_member_count(group.id, 1)
+                invalidate_memberships([join_request.requested_by_id])
+            join_request.delete()
+            touch_group(group.id)
 
         return Response({"detail": "Pedido aceito."})
 
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            touch_group(instance.group_id)
+
 
 
-class GameViewSet(viewsets.ModelViewSet):
-    queryset = Game.objects.all().select_related("created_by")
+class GameViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Game.objects.all()
     serializer_class = GameSerializer
+    pagination_class = GameCursorPagination
+    conditional_markers = {
+        "list": game_list_marker,
+        "retrieve": game_detail_marker,
+    }
+
+    def get_queryset(self):
+        queryset = GameSerializer.setup_eager_loading(
+            super().get_queryset(), **sparse_fieldset(self.request)
+        )
+
+        if self.action != "list":
+            return queryset
+
+        user = self.request.user
+        params = self.request.query_params
+
+        queryset = queryset.filter(
+            Exists(GroupMembership.objects.filter(group_id=OuterRef("group_id"), user_id=user.id))
+        )
+
+        group_id = params.get("group")
+        if group_id:
+            if not group_id.isdigit():
+                raise ValidationError({"group": "Informe o id numérico do grupo."})
+            queryset = queryset.filter(group_id=group_id)
+
+        queryset = queryset.filter(**date_range_filter(params))
+
+        search_term = params.get("search", "").strip()
+        if search_term:
+            queryset = search(queryset, search_term)
+
+        player_id = params.get("player")
+        if player_id:
+            if not player_id.isdigit():
+                raise ValidationError({"player": "Informe o id numérico do jogador."})
+            queryset = queryset.filter(
+                Exists(GameParticipation.objects.filter(game_id=OuterRef("pk"), player_id=player_id))
+            )
+
+        return queryset
 
     def get_permissions(self):
-        if self.action in ["retrieve"]:
+        if self.action in ["retrieve", "settlement"]:
             return [IsAuthenticated(), IsGroupMember()]
 
         if self.action == "create":
@@ -273,34 +541,81 @@ class GameViewSet(viewsets.ModelViewSet):
         if self.action in ["update", "partial_update", "destroy"]:
             return [IsAuthenticated(), IsGameCreatorOrGroupCreator()]
 
-        if self.action in ["add_participation", "remove_participation"]:
+        if self.action in ["add_participation", "remove_participation", "bulk_participations"]:
             return [IsAuthenticated(), IsGameCreatorOrGroupCreator()]
 
         return [IsAuthenticated()]
 
+    def get_serializer(self, *args, **kwargs):
+        return super().get_serializer(*args, **sparse_fieldset(self.request), **kwargs)
 
     def perform_create(self, serializer):
-        group_id = self.request.data.get("group_id")
+        group_id = serializer.validated_data["group_id"]
 
-        if not GroupMembership.objects.filter(
-            group_id=group_id, user=self.request.user
-        ).exists():
+        if not memberships(self.request).is_member(group_id):
             raise PermissionDenied("Você não é membro desse grupo.")
 
-        game = serializer.save(created_by=self.request.user)
+        with transaction.atomic():
+            game = serializer.save(created_by_id=self.request.user.id)
+            adjust_game_count(game.group_id, 1)
+
+            post, created = GamePost.objects.get_or_create(
+                game=game,
+                group_id=group_id,
+                defaults={"posted_by_id": self.request.user.id}
+            )
+            if created:
+                record_post(post)
 
-        GamePost.objects.get_or_create(
-            game=game,
-            group_id=group_id,
-            defaults={"posted_by": self.request.user}
+    def perform_update(self, serializer):
+        previous = serializer.instance
+        previous_group_id, previous_date, previous_buy_in = (
+            previous.group_id, previous.date, previous.buy_in
         )
 
+        with transaction.atomic():
+            game = serializer.save()
+            moved = previous_group_id != game.group_id
+            if not (moved or previous_date != game.date or previous_buy_in != game.buy_in):
+                # Título, local etc. não entram nos agregados; só a versão muda.
+                touch_group(game.group_id)
+                return
+
+            # Só data e buy-in entram na carreira; a linha anterior de cada
+            # participação é a atual com os valores antigos da partida.
+            added = stat_rows(game.participations.all())
+            removed = [
+                row._replace(game__date=previous_date, game__buy_in=previous_buy_in)
+                for row in added
+            ]
+            player_ids = [row.player_id for row in added]
+            participations_changed(game.group_id, player_ids, removed=removed, added=added)
+            if moved:
+                participations_changed(previous_group_id, player_ids)
+                adjust_game_count(previous_group_id, -1)
+                adjust_game_count(game.group_id, 1)
+            elif previous_date != game.date:
+                adjust_game_count(game.group_id)
+            if previous_buy_in != game.buy_in:
+                buy_in_changed(game.id, previous_buy_in)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            delete_game(instance)
+
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        serializer = GameSerializer(instance, context=self.get_serializer_context())
+        serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def settlement(self, request, pk=None):
+        # Sem o eager loading do get_queryset(): o acerto só agrega participações.
+        game = generics.get_object_or_404(Game.objects.only("id", "group_id"), pk=pk)
+        self.check_object_permissions(request, game)
+        return Response(settlement_payload(game.participations.all()))
+
     @action(detail=True, methods=["post"])
     def add_participation(self, request, pk=None):
         game = self.get_object()
@@ -313,6 +628,8 @@ class GameViewSet(viewsets.ModelViewSet):
         final_balance = request.data.get("final_balance")
 
         with transaction.atomic():
+            removed = stat_rows(GameParticipation.objects.filter(game=game, player_id=player_id))
+            previous_rebuy = removed[0].rebuy if removed else None
             participation, created = GameParticipation.objects.update_or_create(
                 game=game,
                 player_id=player_id,
@@ -321,6 +638,17 @@ class GameViewSet(viewsets.ModelViewSet):
                     "final_balance": final_balance,
                 }
             )
+            adjust_game_totals(
+                game.id,
+                participants=int(created),
+                rebuy=Decimal(str(rebuy or 0)) - (previous_rebuy or 0),
+            )
+            participations_changed(
+                game.group_id,
+                [participation.player_id],
+                removed=removed,
+                added=stat_rows(GameParticipation.objects.filter(pk=participation.pk)),
+            )
 
         return Response({
             "id": participation.id,
@@ -328,16 +656,90 @@ class GameViewSet(viewsets.ModelViewSet):
             "message": "Criado com sucesso." if created else "Atualizado com sucesso."
         })
 
+    @action(detail=True, methods=["post"], url_path="participations/bulk")
+    def bulk_participations(self, request, pk=None):
+        game = self.get_object()
+
+        data = request.data
+        if isinstance(data, list):
+            data = {"participations": data}
+
+        serializer = ParticipationBulkSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["participations"]
+        replace = serializer.validated_data["replace"]
+
+        player_ids = {item["player_id"] for item in items}
+        member_ids = set(
+            GroupMembership.objects
+            .filter(group_id=game.group_id, user_id__in=player_ids)
+            .values_list("user_id", flat=True)
+        )
+        outsiders = sorted(player_ids - member_ids)
+        if outsiders:
+            raise ValidationError({
+                "participations": f"Jogadores fora do grupo: {', '.join(map(str, outsiders))}."
+            })
+
+        with transaction.atomic():
+            before = stat_rows(GameParticipation.objects.filter(game=game))
+            removed_ids = []
+            if replace:
+                stale = GameParticipation.objects.filter(game=game).exclude(player_id__in=player_ids)
+                removed_ids = list(stale.values_list("player_id", flat=True))
+                stale.delete()
+
+            GameParticipation.objects.bulk_create(
+                [
+                    GameParticipation(
+                        game=game,
+                        player_id=item["player_id"],
+                        rebuy=item["rebuy"],
+                        final_balance=item["final_balance"],
+                    )
+                    for item in items
+                ],
+                update_conflicts=True,
+                unique_fields=["game", "player"],
+                update_fields=["rebuy", "final_balance"],
+            )
+            # O upsert em lote não informa o que já existia; um único UPDATE
+            # recalcula os totais da partida.
+            recount_games([game.id])
+            participations_changed(
+                game.group_id,
+                [*player_ids, *removed_ids],
+                removed=before,
+                added=stat_rows(GameParticipation.objects.filter(game=game)),
+            )
+
+        rows = game.participations.select_related("player").order_by("id")
+        return Response({
+            "removed": removed_ids,
+            "participations": GameParticipationSerializer(rows, many=True).data,
+        })
+
     @action(detail=True, methods=["post"])
     def remove_participation(self, request, pk=None):
+        game = self.get_object()
         player_id = request.data.get("player_id")
 
         if not player_id:
             return Response({"detail": "player_id é obrigatório"}, status=400)
 
-        deleted, _ = GameParticipation.objects.filter(
-            game_id=pk, player_id=player_id
-        ).delete()
+        with transaction.atomic():
+            participation = GameParticipation.objects.filter(
+                game=game, player_id=player_id
+            )
+            removed = stat_rows(participation)
+            deleted, _ = participation.delete()
+            if deleted:
+                adjust_game_totals(
+                    game.id,
+                    participants=-len(removed),
+                    rebuy=-sum(row.rebuy or 0 for row in removed),
+                )
+            participations_changed(game.group_id, [player_id], removed=removed)
 
         return Response({
             "removed": deleted > 0,
@@ -348,9 +750,7 @@ class GameViewSet(viewsets.ModelViewSet):
         game = self.get_object()
 
         with transaction.atomic():
-            GamePost.objects.filter(game=game).delete()
-            GameParticipation.objects.filter(game=game).delete()
-            game.delete()
+            delete_game(game)
 
         return Response({"detail": "Jogo deletado."})
 
@@ -369,4 +769,64 @@ class GameParticipationViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated()]
 
     def perform_create(self, serializer):
-        serializer.save()
+        with transaction.atomic():
+            participation = serializer.save()
+            adjust_game_totals(participation.game_id, participants=1, rebuy=participation.rebuy)
+            participations_changed(
+                participation.game.group_id,
+                [participation.player_id],
+                added=stat_rows(GameParticipation.objects.filter(pk=participation.pk)),
+            )
+
+    def perform_update(self, serializer):
+        previous_rebuy = serializer.instance.rebuy or 0
+        rows = GameParticipation.objects.filter(pk=serializer.instance.pk)
+
+        with transaction.atomic():
+            removed = stat_rows(rows)
+            participation = serializer.save()
+            adjust_game_totals(participation.game_id, rebuy=(participation.rebuy or 0) - previous_rebuy)
+            participations_changed(
+                participation.game.group_id,
+                [participation.player_id],
+                removed=removed,
+                added=stat_rows(rows),
+            )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            group_id = instance.game.group_id
+            player_id = instance.player_id
+            removed = stat_rows(GameParticipation.objects.filter(pk=instance.pk))
+            instance.delete()
+            adjust_game_totals(instance.game_id, participants=-1, rebuy=-(instance.rebuy or 0))
+            participations_changed(group_id, [player_id], removed=removed)
+
+
+class PlayerViewSet(viewsets.GenericViewSet):
+    queryset = User.objects.all().select_related("stats")
+    permission_classes = [IsAuthenticated]
+
+    default_months = 24
+    max_months = 120
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        player = self.get_object()
+
+        months = request.query_params.get("months") or str(self.default_months)
+        if not months.isdigit():
+            raise ValidationError({"months": "Informe um número inteiro de meses."})
+        months = min(int(months), self.max_months)
+
+        try:
+            stats = player.stats
+        except PlayerStats.DoesNotExist:
+            stats = PlayerStats(player=player)
+
+        monthly = []
+        if stats.games_played and months:
+            monthly = list(player.monthly_stats.order_by("-month")[:months])[::-1]
+
+        serializer = PlayerStatsSerializer(stats, context={"request": request, "monthly": monthly})
+        return Response(serializer.data)
@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "pokerdex_back.settings")
+os.environ.setdefault("ASYNC_VIEWS", "1")
+
+application = get_asgi_application()
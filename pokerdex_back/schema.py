@@ -0,0 +1,134 @@
+"""
+Schema OpenAPI (drf_yasg) pré-gerado.
+
+Gerar o schema introspecta todos os viewsets e serializers, caro demais
+para repetir a cada acesso à documentação. Ele é gerado uma vez por
+deploy (`manage.py generate_schema`) e gravado em OPENAPI_SCHEMA_DIR como
+swagger.json e swagger.yaml; cada processo lê os arquivos no primeiro
+acesso e passa a servir os bytes da memória, com ETag. Sem os arquivos
+(ex.: desenvolvimento), o schema é gerado uma única vez no processo.
+
+Como é gerado sem request, o schema não fixa `host`/`schemes`: o Swagger
+UI usa o endereço de onde a documentação foi aberta.
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+logger = logging.getLogger(__name__)
+
+INFO = openapi.Info(
+    title="Pokerdex API",
+    default_version="v1",
+    description="API do backend (grupos, jogos, participações, auth, etc.)",
+    terms_of_service="https://www.google.com/policies/terms/",  # opcional
+    contact=openapi.Contact(email="teampokerdex@gmail.com"),    # opcional
+    license=openapi.License(name="MIT License"),                # opcional
+)
+
+CODECS = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+
+
+@dataclass(frozen=True)
+class SchemaArtifact:
+    content: bytes
+    etag: str
+
+    @classmethod
+    def from_content(cls, content):
+        digest = hashlib.md5(content, usedforsecurity=False).hexdigest()
+        return cls(content=content, etag=f'"{digest}"')
+
+
+def schema_path(fmt):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f"swagger.{fmt}"
+
+
+def generate():
+    """Gera o schema completo. Devolve {formato: bytes}."""
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(INFO)
+    schema = generator.get_schema(request=None, public=True)
+    return {fmt: codec([]).encode(schema) for fmt, codec in CODECS.items()}
+
+
+def write():
+    """Gera o schema e grava os arquivos. Devolve os caminhos gravados."""
+    paths = []
+    for fmt, content in generate().items():
+        path = schema_path(fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+def _read():
+    paths = {fmt: schema_path(fmt) for fmt in CODECS}
+    if not all(path.exists() for path in paths.values()):
+        return None
+    return {fmt: path.read_bytes() for fmt, path in paths.items()}
+
+
+_artifacts = {}
+_lock = threading.Lock()
+
+
+def artifacts():
+    """{formato: SchemaArtifact}, lidos (ou gerados) uma vez por processo."""
+    if not _artifacts:
+        with _lock:
+            if not _artifacts:
+                contents = _read()
+                if contents is None:
+                    logger.warning(
+                        "Schema OpenAPI não encontrado em %s; gerando no processo "
+                        "(rode `manage.py generate_schema` no deploy).",
+                        settings.OPENAPI_SCHEMA_DIR,
+                    )
+                    contents = generate()
+                _artifacts.update(
+                    (fmt, SchemaArtifact.from_content(content))
+                    for fmt, content in contents.items()
+                )
+    return _artifacts
+
+
+def schema_response(request, fmt, media_type):
+    artifact = artifacts()[fmt]
+    response = get_conditional_response(request, etag=artifact.etag)
+    if response is None:
+        response = HttpResponse(artifact.content, content_type=f"{media_type}; charset=utf-8")
+    response["ETag"] = artifact.etag
+    # Muda só a cada deploy: o cliente guarda e revalida com o ETag.
+    response["Cache-Control"] = "public, no-cache"
+    return response
+
+
+class SchemaView(get_schema_view(
+    INFO,
+    public=True,
+    permission_classes=(permissions.AllowAny,),
+)):
+    """
+    Pedidos do schema (.json, .yaml, ?format=openapi) saem dos artefatos
+    em memória; as páginas do Swagger UI e do Redoc continuam com o
+    drf_yasg, que não introspecta as views para montar só o HTML.
+    """
+
+    def get(self, request, version="", format=None):
+        codec = getattr(request.accepted_renderer, "codec_class", None)
+        for fmt, codec_class in CODECS.items():
+            if codec is codec_class:
+                return schema_response(request, fmt, request.accepted_renderer.media_type)
+        return super().get(request, version, format)
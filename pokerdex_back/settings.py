@@ -1,3 +1,4 @@
+from importlib.util import find_spec
 from pathlib import Path
 import os
 import datetime
@@ -51,6 +52,16 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
 ]
 
+# Instrumentação por rota (queries, tempo de SQL/serializers/renderer/total).
+# Resumo em GET /api/stats/requests/ (staff).
+if os.getenv("REQUEST_STATS") == "1":
+    MIDDLEWARE.insert(0, "api.middleware.RequestStatsMiddleware")
+
+REQUEST_STATS_WINDOW = int(os.getenv("REQUEST_STATS_WINDOW", "1000"))
+
+# Requests com mais queries que isso são logadas (0 = sem limite).
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+
 ROOT_URLCONF = "pokerdex_back.urls"
 
 TEMPLATES = [
@@ -71,12 +82,65 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "pokerdex_back.wsgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+ASGI_APPLICATION = "pokerdex_back.asgi.application"
+
+# GETs de lista/detalhe de grupos, lista de partidas e placar atendidos por
+# views assíncronas (api/async_views.py). Ligado por padrão no asgi.py; sob
+# WSGI cada view async rodaria num event loop próprio, sem ganho.
+ASYNC_READ_VIEWS = os.getenv("ASYNC_VIEWS") == "1"
+
+# DB_ENGINE=postgres usa PostgreSQL (DB_NAME, DB_USER, DB_PASSWORD, DB_HOST,
+# DB_PORT). Qualquer outro valor mantém o SQLite em SQLITE_PATH.
+DB_ENGINE = os.getenv("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DB_NAME", "pokerdex"),
+            "USER": os.getenv("DB_USER", "pokerdex"),
+            "PASSWORD": os.getenv("DB_PASSWORD", ""),
+            "HOST": os.getenv("DB_HOST", "localhost"),
+            "PORT": os.getenv("DB_PORT", "5432"),
+            # Conexões persistentes por worker, verificadas antes de reusar.
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
+    }
+
+    # Pool do psycopg (Django 5.1+). Substitui as conexões persistentes,
+    # então CONN_MAX_AGE precisa ser 0.
+    if os.getenv("DB_POOL") == "1":
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": int(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
+            "OPTIONS": {
+                # Executado em cada conexão nova. WAL deixa leituras rodarem
+                # durante uma escrita; busy_timeout espera o lock em vez de
+                # falhar com "database is locked". O db.sqlite3 do repositório
+                # já está em WAL, então o pragma não altera o arquivo.
+                "init_command": ";".join([
+                    "PRAGMA journal_mode=WAL",
+                    f"PRAGMA busy_timeout={int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))}",
+                    "PRAGMA synchronous=NORMAL",
+                    f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))}",
+                ]),
+                # Transações pegam o lock de escrita no BEGIN; sem isso uma
+                # transação que lê e depois escreve falha sem respeitar o
+                # busy_timeout quando outra já está escrevendo.
+                "transaction_mode": "IMMEDIATE",
+            },
+        }
     }
-}
 
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'  # PRODUÇÃO
@@ -85,18 +149,84 @@ STATICFILES_DIRS = [
     BASE_DIR / 'templates',  # opcional
 ]
 
+# JWT_STATELESS=1 (padrão): request.user vem só das claims do token, sem
+# query por request; is_staff e username valem até o token expirar.
+# JWT_STATELESS=0 volta a carregar o User do banco a cada request.
+JWT_STATELESS = os.getenv("JWT_STATELESS", "1") == "1"
+
+# JSON via orjson (api/renderers.py, com fallback para o json do DRF) e
+# MessagePack negociado por `Accept: application/msgpack` quando o pacote
+# msgpack está instalado (API_MSGPACK=0 desliga).
+API_MSGPACK = os.getenv("API_MSGPACK", "1") == "1" and find_spec("msgpack") is not None
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.StatelessJWTAuthentication"
+        if JWT_STATELESS
+        else "api.authentication.DatabaseJWTAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        *(["api.renderers.MessagePackRenderer"] if API_MSGPACK else []),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        *(["api.parsers.MessagePackParser"] if API_MSGPACK else []),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# Segundos que o User completo (ex.: /auth/me/) fica no cache no modo
+# stateless (0 = sem cache).
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT", "0"))
+
+# Intervalo de recarga do índice de tokens revogados em cada processo.
+JWT_REVOCATION_REFRESH = int(os.getenv("JWT_REVOCATION_REFRESH", "30"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "pokerdex",
+        "OPTIONS": {
+            # LocMemCache descarta as entradas menos usadas recentemente (LRU).
+            "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "2000")),
+        },
+    }
+}
+
+# Chaves do detalhe de grupo são versionadas, então o timeout só limita a
+# memória ocupada por versões antigas.
+GROUP_DETAIL_CACHE_TIMEOUT = int(os.getenv("GROUP_DETAIL_CACHE_TIMEOUT", "3600"))
+
+# Segundos que o mapa {grupo: papel} de cada usuário fica no cache entre
+# requests (0 = só por request). Exige um cache compartilhado entre workers.
+MEMBERSHIP_CACHE_TIMEOUT = int(os.getenv("MEMBERSHIP_CACHE_TIMEOUT", "0"))
+
+# JOBS_WORKER=1 declara que há um `manage.py run_jobs` rodando ao lado do
+# servidor (como o serviço `worker` do docker-compose). Sem ele, as tarefas
+# de api/tasks.py rodam no próprio processo, logo depois do commit, e a
+# remoção de grupos grandes acontece na request (ver api/jobs.py).
+JOBS_WORKER = os.getenv("JOBS_WORKER", "0") == "1"
+
+# Remoção de grupos (api/deletion.py): linhas por DELETE e, a partir de
+# quantas partidas, a remoção sai da request e roda em segundo plano
+# (só com JOBS_WORKER=1).
+GROUP_DELETE_BATCH_SIZE = int(os.getenv("GROUP_DELETE_BATCH_SIZE", "1000"))
+GROUP_DELETE_BACKGROUND_THRESHOLD = int(os.getenv("GROUP_DELETE_BACKGROUND_THRESHOLD", "2000"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": datetime.timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": datetime.timedelta(days=7),
     "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_USER_CLASS": "api.authentication.ClaimsUser",
 }
 
+# Schema OpenAPI pré-gerado por `manage.py generate_schema` (ver
+# pokerdex_back/schema.py).
+OPENAPI_SCHEMA_DIR = Path(os.getenv("OPENAPI_SCHEMA_DIR", BASE_DIR / "openapi"))
+
 SWAGGER_SETTINGS = {
     "SECURITY_DEFINITIONS": {
         "Bearer": {